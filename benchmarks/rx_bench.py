@@ -0,0 +1,512 @@
+#!/usr/bin/env python
+"""
+Throughput benchmarks for the receive path.
+
+Synthetic traffic (text, nodeinfo, telemetry and position packets) is played through a ReplayInterface
+into on_receive, with the chat UI drawn into headless stand-in windows, and the hot helpers it calls
+are timed on their own. Results are compared against benchmarks/rx_baseline.json.
+
+Run:
+  python benchmarks/rx_bench.py                    # report and compare, exit 1 on a regression
+  python benchmarks/rx_bench.py --update-baseline  # record this machine's numbers as the baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BASELINE_PATH = Path(__file__).resolve().parent / "rx_baseline.json"
+sys.path.append(str(REPO_ROOT / "contact"))
+
+MY_NODE = 0x0A0A0A0A
+NODE_COUNT = 200
+CHANNELS = ("LongFast", "Ops")
+PACKET_MIX = {"text": 35, "nodeinfo": 15, "telemetry": 30, "position": 20}  # relative weights
+DEFAULT_PACKETS = 400
+ALLOCATION_SAMPLE = 100  # packets or calls per tracemalloc pass; tracing is slow
+DEFAULT_TOLERANCE = 0.30  # a regression is this much slower than the baseline
+TERMINAL = (40, 120)  # rows, columns of the simulated terminal
+
+WORDS = (
+    "copy",
+    "anyone",
+    "on",
+    "LongFast",
+    "battery",
+    "at",
+    "trailhead",
+    "relay",
+    "node",
+    "back",
+    "online",
+    "👋",
+    "📡",
+    "日本語",
+    "Привет",
+    "signal",
+    "weak",
+    "heading",
+    "north",
+    "ETA",
+    "20min",
+)
+
+
+class HeadlessWindow:
+    """Stands in for a curses window or pad: tracks size and cursor and counts the cells written."""
+
+    def __init__(self, height: int = 1, width: int = 1, y: int = 0, x: int = 0) -> None:
+        self.height, self.width, self.y, self.x = height, width, y, x
+        self.cursor = (0, 0)
+        self.cells_written = 0
+
+    def getmaxyx(self) -> tuple[int, int]:
+        return self.height, self.width
+
+    def getbegyx(self) -> tuple[int, int]:
+        return self.y, self.x
+
+    def getyx(self) -> tuple[int, int]:
+        return self.cursor
+
+    def resize(self, height: int, width: int) -> None:
+        self.height, self.width = max(1, height), max(1, width)
+
+    def mvwin(self, y: int, x: int) -> None:
+        self.y, self.x = y, x
+
+    def move(self, y: int, x: int) -> None:
+        self.cursor = (y, x)
+
+    def addstr(self, y: int, x: int, text: str = "", *attrs: Any) -> None:
+        if isinstance(x, str):  # addstr(text, attr) form
+            text = x
+        self.cells_written += len(text)
+
+    def addch(self, *args: Any) -> None:
+        self.cells_written += 1
+
+    def erase(self) -> None:
+        self.cursor = (0, 0)
+
+    def _noop(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    clear = refresh = noutrefresh = box = border = attrset = bkgd = chgat = keypad = _noop
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def make_nodes(rng: random.Random, count: int = NODE_COUNT) -> dict[str, dict[str, Any]]:
+    nodes = {}
+    for num in [MY_NODE] + [0x10000000 + i for i in range(count - 1)]:
+        node_id = f"!{num:08x}"
+        user = {
+            "id": node_id,
+            "longName": f"Node {num & 0xFFFF:04x} {rng.choice(WORDS)}",
+            "shortName": f"{num:08x}"[-4:],
+        }
+        if rng.random() < 0.5:  # noqa: PLR2004
+            user["publicKey"] = "a2V5"
+        nodes[node_id] = {
+            "num": num,
+            "user": user,
+            "lastHeard": 1700000000 + rng.randrange(86400),
+            "hopsAway": rng.randrange(4),
+            "isFavorite": rng.random() < 0.05,  # noqa: PLR2004
+        }
+    return nodes
+
+
+def make_packets(count: int, seed: int = 1) -> list[dict[str, Any]]:
+    """A deterministic mix of the packet kinds a busy mesh delivers, shaped like MeshInterface's packet dicts."""
+    from meshtastic.protobuf import mesh_pb2, telemetry_pb2  # noqa: PLC0415
+
+    rng = random.Random(seed)
+    senders = [0x10000000 + i for i in range(NODE_COUNT - 1)]
+    kinds = rng.choices(list(PACKET_MIX), weights=list(PACKET_MIX.values()), k=count)
+    packets = []
+
+    for i, kind in enumerate(kinds):
+        sender = rng.choice(senders)
+        packet: dict[str, Any] = {
+            "from": sender,
+            "to": 0xFFFFFFFF,
+            "id": 0x70000000 + i,
+            "rxTime": 1700100000 + i,
+            "rxSnr": round(rng.uniform(-15, 10), 2),
+            "hopStart": 3,
+            "hopLimit": rng.randrange(4),
+            "channel": 0,
+        }
+        if kind == "text":
+            text = _words(rng, rng.randrange(2, 30))
+            if rng.random() < 0.1:  # noqa: PLR2004
+                packet["to"] = MY_NODE  # direct message
+            else:
+                packet["channel"] = rng.randrange(len(CHANNELS))
+            packet["decoded"] = {"portnum": "TEXT_MESSAGE_APP", "payload": text.encode(), "text": text}
+        elif kind == "nodeinfo":
+            user = mesh_pb2.User(id=f"!{sender:08x}", long_name=f"Node {sender & 0xFFFF:04x}", short_name="N")
+            packet["decoded"] = {
+                "portnum": "NODEINFO_APP",
+                "payload": user.SerializeToString(),
+                "user": {
+                    "id": user.id,
+                    "longName": user.long_name,
+                    "shortName": user.short_name,
+                    "hwModel": "HELTEC_V3",
+                    "role": "CLIENT",
+                },
+            }
+        elif kind == "telemetry":
+            telemetry = telemetry_pb2.Telemetry(time=1700100000 + i)
+            telemetry.device_metrics.battery_level = rng.randrange(101)
+            telemetry.device_metrics.voltage = round(rng.uniform(3.3, 4.2), 2)
+            telemetry.device_metrics.channel_utilization = round(rng.uniform(0, 30), 2)
+            packet["decoded"] = {
+                "portnum": "TELEMETRY_APP",
+                "payload": telemetry.SerializeToString(),
+                "telemetry": {
+                    "time": telemetry.time,
+                    "deviceMetrics": {
+                        "batteryLevel": telemetry.device_metrics.battery_level,
+                        "voltage": telemetry.device_metrics.voltage,
+                        "channelUtilization": telemetry.device_metrics.channel_utilization,
+                    },
+                },
+            }
+        else:
+            position = mesh_pb2.Position(
+                latitude_i=int(rng.uniform(45.4, 45.6) * 1e7),
+                longitude_i=int(rng.uniform(-122.8, -122.5) * 1e7),
+                altitude=rng.randrange(300),
+            )
+            packet["decoded"] = {
+                "portnum": "POSITION_APP",
+                "payload": position.SerializeToString(),
+                "position": {
+                    "latitudeI": position.latitude_i,
+                    "longitudeI": position.longitude_i,
+                    "altitude": position.altitude,
+                },
+            }
+        packets.append(packet)
+    return packets
+
+
+class Harness:
+    """Builds a replay-backed app state with its database in a throwaway directory."""
+
+    def __init__(self, packets: list[dict[str, Any]], workdir: str, seed: int = 1) -> None:
+        from meshtastic.protobuf import channel_pb2  # noqa: PLC0415
+        from pubsub import pub  # noqa: PLC0415
+
+        import contact.ui.default_config as config  # noqa: PLC0415
+        from contact.utilities.capture import CaptureRecorder, ReplayInterface  # noqa: PLC0415
+        from contact.utilities.db_handler import init_nodedb  # noqa: PLC0415
+        from contact.utilities.message_window import MessageWindows  # noqa: PLC0415
+        from contact.utilities.offline_interface import OfflineInterface, OfflineNode  # noqa: PLC0415
+        from contact.utilities.singleton import app_state, interface_state, ui_state  # noqa: PLC0415
+        from contact.utilities.utils import get_channels, get_node_list  # noqa: PLC0415
+
+        config.db_file_path = str(Path(workdir) / "bench.db")
+        config.notification_sound = "False"
+        if app_state.lock is None:
+            app_state.lock = threading.RLock()
+
+        channels = []
+        for index, name in enumerate(CHANNELS):
+            channel = channel_pb2.Channel(index=index)
+            channel.role = channel_pb2.Channel.Role.PRIMARY if index == 0 else channel_pb2.Channel.Role.SECONDARY
+            channel.settings.name = name
+            channels.append(channel)
+        radio = OfflineInterface(MY_NODE, make_nodes(random.Random(seed)), OfflineNode(MY_NODE, channels))
+
+        capture_path = str(Path(workdir) / "bench.capture")
+        recorder = CaptureRecorder(capture_path)
+        recorder.start()
+        for packet in packets:
+            pub.sendMessage("meshtastic.receive", packet=packet, interface=radio)
+        recorder.stop()
+
+        self.interface = ReplayInterface(capture_path, speed=0)
+        interface_state.interface = self.interface
+        interface_state.my_node_num = MY_NODE
+        interface_state.connected = True
+        ui_state.channel_list = []
+        ui_state.all_messages = MessageWindows()
+        ui_state.notifications = []
+        ui_state.packet_buffer = []
+        ui_state.selected_channel = 0
+        ui_state.display_log = True
+        ui_state.single_pane_mode = False
+        get_channels()
+        ui_state.node_list = get_node_list()
+        init_nodedb()
+
+
+@contextmanager
+def headless_curses() -> Iterator[None]:
+    """Lay the chat UI out on stand-in windows; every color is attribute 0. Restores everything after."""
+    import curses  # noqa: PLC0415
+
+    import contact.ui.default_config as config  # noqa: PLC0415
+    from contact.ui import colors, contact_ui  # noqa: PLC0415
+
+    window_names = [name for name in vars(contact_ui) if name.endswith(("_win", "_pad"))]
+    saved_windows = {name: getattr(contact_ui, name) for name in window_names}
+    saved_curses = (curses.newpad, curses.curs_set)
+    saved_colors = dict(colors._color_table)
+
+    rows, columns = TERMINAL
+    channel_width = nodes_width = columns // 4
+    messages_width = columns - channel_width - nodes_width
+    height = rows - 3
+    contact_ui.root_win = HeadlessWindow(rows, columns)
+    contact_ui.channel_win = HeadlessWindow(height, channel_width, 0, 0)
+    contact_ui.messages_win = HeadlessWindow(height, messages_width, 0, channel_width)
+    contact_ui.nodes_win = HeadlessWindow(height, nodes_width, 0, channel_width + messages_width)
+    contact_ui.packetlog_win = HeadlessWindow(rows // 3, messages_width, height - rows // 3, channel_width)
+    contact_ui.entry_win = HeadlessWindow(3, columns, height, 0)
+    contact_ui.channel_pad = HeadlessWindow()
+    contact_ui.messages_pad = HeadlessWindow()
+    contact_ui.nodes_pad = HeadlessWindow()
+    curses.newpad = HeadlessWindow
+    curses.curs_set = lambda visibility: None
+    colors._color_table.clear()
+    colors._color_table.update({category: [0] * 8 for category in config.COLOR_CONFIG})
+    try:
+        yield
+    finally:
+        for name, window in saved_windows.items():
+            setattr(contact_ui, name, window)
+        curses.newpad, curses.curs_set = saved_curses
+        colors._color_table.clear()
+        colors._color_table.update(saved_colors)
+
+
+def _summarize(name: str, latencies: list[float], elapsed: float, allocated: int | None) -> dict[str, Any]:
+    ordered = sorted(latencies)
+    result = {
+        "name": name,
+        "ops": len(ordered),
+        "ops_per_sec": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "p50_us": round(statistics.median(ordered) * 1e6, 1),
+        "p99_us": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e6, 1),
+    }
+    if allocated is not None:
+        result["alloc_bytes_per_op"] = round(allocated / len(ordered))
+    return result
+
+
+def _measure_allocations(run: Callable[[], Any]) -> int:
+    """Peak growth of traced memory while running once under tracemalloc: what a burst costs in RAM."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        run()
+        current, peak = tracemalloc.get_traced_memory()
+        return max(current, peak) - before
+    finally:
+        tracemalloc.stop()
+
+
+def bench_on_receive(packets: list[dict[str, Any]], workdir: str, allocations: bool) -> dict[str, Any]:
+    """Full receive path: replay -> pubsub -> on_receive -> DB writes, then the UI thread's repaint."""
+    from pubsub import pub  # noqa: PLC0415
+
+    from contact.message_handlers.rx_handler import on_receive  # noqa: PLC0415
+    from contact.ui.contact_ui import process_ui_events  # noqa: PLC0415
+
+    latencies: list[float] = []
+
+    def timed_on_receive(packet: dict[str, Any], interface: Any) -> None:
+        started = time.perf_counter()
+        on_receive(packet, interface)
+        process_ui_events()  # Repaint after every packet, as an idle UI would
+        latencies.append(time.perf_counter() - started)
+
+    def run(directory: str, stream: list[dict[str, Any]], measure_allocations: bool = False) -> tuple[Harness, float]:
+        harness = Harness(stream, directory)
+        pub.subscribe(timed_on_receive, "meshtastic.receive")
+        try:
+            if measure_allocations:
+                return harness, _measure_allocations(harness.interface.play)
+            started = time.perf_counter()
+            harness.interface.play()
+            return harness, time.perf_counter() - started
+        finally:
+            pub.unsubscribe(timed_on_receive, "meshtastic.receive")
+
+    allocated = None
+    if allocations:
+        sample = packets[:ALLOCATION_SAMPLE]
+        with tempfile.TemporaryDirectory(dir=workdir) as directory:
+            allocated = run(directory, sample, measure_allocations=True)[1] * len(packets) // len(sample)
+        latencies.clear()
+    with tempfile.TemporaryDirectory(dir=workdir) as directory:
+        harness, elapsed = run(directory, packets)
+        result = _summarize("on_receive", latencies, elapsed, allocated)
+        result["messages"] = sum(len(messages) for messages in _ui_state().all_messages.values())
+        result["nodes"] = len(harness.interface.nodesByNum)
+    return result
+
+
+def _ui_state() -> Any:
+    from contact.utilities.singleton import ui_state  # noqa: PLC0415
+
+    return ui_state
+
+
+def _timed_loop(name: str, count: int, operation: Callable[[int], Any], allocations: bool) -> dict[str, Any]:
+    allocated = None
+    if allocations:
+        sample = min(count, ALLOCATION_SAMPLE)
+
+        def run_sample() -> None:
+            for i in range(sample):
+                operation(i)
+
+        allocated = _measure_allocations(run_sample) * count // sample
+    latencies = []
+    started = time.perf_counter()
+    for i in range(count):
+        op_started = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - op_started)
+    return _summarize(name, latencies, time.perf_counter() - started, allocated)
+
+
+def bench_helpers(packets: list[dict[str, Any]], workdir: str, allocations: bool) -> list[dict[str, Any]]:
+    """The pieces on_receive leans on, each timed in a loop against the state a replay leaves behind."""
+    from contact.ui import contact_ui  # noqa: PLC0415
+    from contact.utilities.db_handler import save_message_to_db  # noqa: PLC0415
+    from contact.utilities.utils import get_node_list  # noqa: PLC0415
+
+    results = []
+    with tempfile.TemporaryDirectory(dir=workdir) as directory:
+        harness = Harness(packets, directory)
+        harness.interface.play()
+        ui_state = _ui_state()
+        texts = [p["decoded"]["text"] for p in packets if p.get("decoded", {}).get("portnum") == "TEXT_MESSAGE_APP"]
+        count = max(50, min(len(texts), 200))
+
+        results.append(
+            _timed_loop(
+                "save_message_to_db",
+                count,
+                lambda i: save_message_to_db(CHANNELS[0], 0x10000000 + i % 50, texts[i % len(texts)]),
+                allocations,
+            )
+        )
+        results.append(_timed_loop("get_node_list", 200, lambda i: get_node_list(), allocations))
+
+        ui_state.selected_channel = 0
+        draws = {
+            "draw_messages_window": lambda i: contact_ui.draw_messages_window(True),
+            "draw_node_list": lambda i: contact_ui.draw_node_list(),
+            "draw_channel_list": lambda i: contact_ui.draw_channel_list(),
+            "draw_packetlog_win": lambda i: contact_ui.draw_packetlog_win(),
+        }
+        for name, draw in draws.items():
+            results.append(_timed_loop(name, 25, draw, allocations))
+    return results
+
+
+def run_benchmarks(
+    packet_count: int = DEFAULT_PACKETS, seed: int = 1, allocations: bool = True
+) -> dict[str, dict[str, Any]]:
+    import contact.ui.default_config as config  # noqa: PLC0415
+
+    packets = make_packets(packet_count, seed)
+    saved_config = (config.db_file_path, config.notification_sound)
+    try:
+        with tempfile.TemporaryDirectory(prefix="contact-bench-") as workdir, headless_curses():
+            results = [bench_on_receive(packets, workdir, allocations)]
+            results += bench_helpers(packets, workdir, allocations)
+    finally:
+        config.db_file_path, config.notification_sound = saved_config
+    return {result.pop("name"): result for result in results}
+
+
+def compare_to_baseline(
+    results: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]], tolerance: float = DEFAULT_TOLERANCE
+) -> list[str]:
+    """Describe every benchmark whose throughput or median latency is worse than the baseline allows."""
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        if result["ops_per_sec"] < expected["ops_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['ops_per_sec']} ops/s vs baseline {expected['ops_per_sec']}")
+        if result["p50_us"] > expected["p50_us"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {result['p50_us']} us vs baseline {expected['p50_us']}")
+    return regressions
+
+
+def format_results(results: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]] | None = None) -> str:
+    lines = [f"{'Benchmark':<22} {'ops/s':>10} {'p50 us':>9} {'p99 us':>9} {'B/op':>8} {'vs base':>8}"]
+    for name, result in results.items():
+        expected = (baseline or {}).get(name)
+        change = f"{result['ops_per_sec'] / expected['ops_per_sec']:.2f}x" if expected else "-"
+        alloc = result.get("alloc_bytes_per_op", "-")
+        lines.append(
+            f"{name:<22} {result['ops_per_sec']:>10} {result['p50_us']:>9} {result['p99_us']:>9} {alloc:>8} {change:>8}"
+        )
+    return "\n".join(lines)
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, dict[str, Any]]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))["results"]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--packets", type=int, default=DEFAULT_PACKETS, help="Packets in the synthetic stream.")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the synthetic stream.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown (0.3 = 30%%).")
+    parser.add_argument("--no-allocations", action="store_true", help="Skip the tracemalloc passes.")
+    parser.add_argument("--json", metavar="FILE", help="Also write the results as JSON.")
+    parser.add_argument("--update-baseline", action="store_true", help="Save these results as the new baseline.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.packets, args.seed, allocations=not args.no_allocations)
+    baseline = load_baseline()
+    print(format_results(results, baseline))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.update_baseline:
+        document = {"packets": args.packets, "seed": args.seed, "python": sys.version.split()[0], "results": results}
+        BASELINE_PATH.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,11 +10,14 @@ No warranty is provided. Use at your own risk.
 """
 
 # Standard library
+import atexit
 import contextlib
 import curses
+import functools
 import io
 import logging
 import os
+import signal
 import subprocess
 import sys
 import threading
@@ -23,23 +26,23 @@ import traceback
 # Third-party
 from pubsub import pub
 
-import contact.ui.default_config as config
-
-# Local application
 # Local application
-from contact.message_handlers.rx_handler import on_receive
-from contact.settings import set_region
+import contact.ui.default_config as config
 from contact.ui.colors import setup_colors
-from contact.ui.contact_ui import main_ui
 from contact.ui.dialog import dialog
 from contact.ui.splash import draw_splash
 from contact.utilities.arg_parser import setup_parser
-from contact.utilities.db_handler import init_nodedb, load_messages_from_db
+from contact.utilities.async_core import async_core
 from contact.utilities.i18n import t
-from contact.utilities.input_handlers import get_list_input
-from contact.utilities.interfaces import initialize_interface
-from contact.utilities.singleton import app_state, interface_state, ui_state
-from contact.utilities.utils import get_channels, get_node_list, get_node_num
+from contact.utilities.log_setup import setup_logging
+from contact.utilities.message_window import MessageWindows
+from contact.utilities.perf import hot_path, startup_profiler
+from contact.utilities.sessions import session_manager
+from contact.utilities.singleton import app_state, interface_state, ui_events, ui_state
+from contact.utilities.supervisor import supervisor
+
+# The chat UI, message handlers and database layer are imported in main() once the
+# splash screen is up, and the settings subsystem only when it is actually needed.
 
 # ------------------------------------------------------------------------------
 # Environment & Logging Setup
@@ -51,11 +54,15 @@ os.environ.setdefault("TERM", "xterm-256color")
 if os.environ.get("COLORTERM") == "gnome-terminal":
     os.environ["TERM"] = "xterm-256color"
 
-logging.basicConfig(
-    filename=config.log_file_path, level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+setup_logging(
+    config.log_file_path,
+    levels=config.log_levels,
+    max_bytes=config.log_max_bytes,
+    backup_count=config.log_backup_count,
 )
 
-app_state.lock = threading.Lock()
+# Reentrant: a packet for another radio's session is handled with that session swapped in under the lock.
+app_state.lock = threading.RLock()
 
 
 # ------------------------------------------------------------------------------
@@ -63,6 +70,10 @@ app_state.lock = threading.Lock()
 # ------------------------------------------------------------------------------
 def prompt_region_if_unset(args: object) -> None:
     """Prompt user to set region if it is unset."""
+    from contact.settings import set_region  # noqa: PLC0415
+    from contact.utilities.input_handlers import get_list_input  # noqa: PLC0415
+    from contact.utilities.interfaces import initialize_interface  # noqa: PLC0415
+
     confirmation = get_list_input("Your region is UNSET. Set it now?", "Yes", ["Yes", "No"])
     if confirmation == "Yes":
         set_region(interface_state.interface)
@@ -72,18 +83,160 @@ def prompt_region_if_unset(args: object) -> None:
 
 def initialize_globals() -> None:
     """Initializes interface and shared globals."""
+    from contact.message_handlers.rx_handler import on_receive  # noqa: PLC0415
+    from contact.utilities.db_handler import init_nodedb, load_messages_from_db  # noqa: PLC0415
+    from contact.utilities.utils import get_channels, get_node_list, get_node_num  # noqa: PLC0415
 
     interface_state.my_node_num = get_node_num()
     ui_state.channel_list = get_channels()
     ui_state.node_list = get_node_list()
     ui_state.single_pane_mode = config.single_pane_mode.lower() == "true"
-    pub.subscribe(on_receive, "meshtastic.receive")
+    pub.subscribe(async_core.receive_listener(session_manager.receive_listener(on_receive)), "meshtastic.receive")
+
+    with startup_profiler.phase("init_nodedb"):
+        init_nodedb()
+    with startup_profiler.phase("load_messages_from_db"):
+        load_messages_from_db()
+
+    # A capture being replayed starts once on_receive is listening.
+    if hasattr(interface_state.interface, "start_playback"):
+        interface_state.interface.start_playback()
 
-    init_nodedb()
-    load_messages_from_db()
 
+def open_sessions(specs: list[str]) -> None:
+    """Connect to each radio given with --interfaces and load its state into a session of its own."""
+    from contact.utilities.interfaces import initialize_interface, parse_interface_spec  # noqa: PLC0415
 
-def main(stdscr: curses.window) -> None:
+    for spec in specs:
+        try:
+            connection = parse_interface_spec(spec)
+            with startup_profiler.phase(f"interface connect {spec}"):
+                interface = initialize_interface(connection)
+        except Exception as e:
+            logging.error("Unable to connect to %s: %s", spec, e)
+            continue
+        if interface is None:
+            logging.error("Unable to connect to %s", spec)
+            continue
+        if interface.localNode.localConfig.lora.region == 0:
+            logging.warning("Region is UNSET on %s; set it from the settings menu.", spec)
+
+        session = session_manager.add(interface, connection)
+        with session_manager.activated(session):
+            initialize_globals()
+            interface_state.connected = True
+        supervise(connection, session)
+        logging.info("Connected to %s as session %s", spec, session.name)
+
+    if not session_manager.sessions:
+        raise RuntimeError(f"Could not connect to any of {', '.join(specs)}")
+
+
+def supervise(args: object, session: object = None) -> None:
+    """Have the supervisor reconnect this radio if its link drops. A replayed capture has no link."""
+    from contact.utilities.interfaces import describe_connection, initialize_interface  # noqa: PLC0415
+
+    if getattr(args, "replay", None):
+        return
+    interface = session.interface_state.interface if session is not None else interface_state.interface
+    connect = functools.partial(initialize_interface, args)
+    supervisor.watch(interface, connect, describe_connection(args), session)
+
+
+def connect_and_reconcile(args: object) -> None:
+    """Connect to the radio behind a warm-started UI, then replace the snapshot state with live data."""
+    from contact.ui import contact_ui  # noqa: PLC0415
+    from contact.utilities.interfaces import initialize_interface  # noqa: PLC0415
+    from contact.utilities.snapshot import save_snapshot  # noqa: PLC0415
+
+    with startup_profiler.phase("interface connect"):
+        interface = supervisor.connect_with_backoff(functools.partial(initialize_interface, args), "the radio")
+    if interface is None:
+        return
+
+    if interface.localNode.localConfig.lora.region == 0:
+        logging.warning("Region is UNSET; set it from the settings menu.")
+
+    with app_state.lock:
+        selected_id = ui_state.channel_list[ui_state.selected_channel] if ui_state.channel_list else None
+        interface_state.interface = interface
+        ui_state.channel_list = []  # Rebuilt from the radio and the database; snapshot-only channels go
+        ui_state.all_messages = MessageWindows()
+        ui_state.notifications = []
+        initialize_globals()
+        if selected_id in ui_state.channel_list:
+            ui_state.selected_channel = ui_state.channel_list.index(selected_id)
+        else:
+            ui_state.selected_channel = 0
+        interface_state.connected = True
+        supervise(args)
+        logging.info("Connected; warm-start state reconciled with the radio")
+
+        if contact_ui.root_win is not None:
+            ui_events.post(contact_ui.handle_resize, contact_ui.root_win, False)
+
+    save_snapshot()
+
+
+def attach_to_daemon(socket_path: str) -> None:
+    """Use a running headless daemon as the interface; its state replaces the local DB load."""
+    from contact.message_handlers.rx_handler import on_receive  # noqa: PLC0415
+    from contact.utilities.remote_interface import RemoteInterface  # noqa: PLC0415
+    from contact.utilities.snapshot import apply_snapshot  # noqa: PLC0415
+    from contact.utilities.utils import get_node_list  # noqa: PLC0415
+
+    interface = RemoteInterface(socket_path)
+    apply_snapshot(interface.state, interface)
+    ui_state.node_list = get_node_list()
+    ui_state.single_pane_mode = config.single_pane_mode.lower() == "true"
+    pub.subscribe(async_core.receive_listener(on_receive), "meshtastic.receive")
+    interface_state.connected = True
+
+
+def run_headless(args: object) -> int:
+    """Entry point for --daemon: the rx/tx/db pipeline without curses, served on the control socket."""
+    from contact.utilities.headless import HeadlessDaemon  # noqa: PLC0415
+    from contact.utilities.interfaces import initialize_interface  # noqa: PLC0415
+    from contact.utilities.snapshot import save_snapshot  # noqa: PLC0415
+
+    socket_path = args.socket or config.control_socket_path
+    interface_state.interface = initialize_interface(args)
+    if interface_state.interface is None:
+        print("Could not connect to the radio.")
+        return 1
+    if interface_state.interface.localNode.localConfig.lora.region == 0:
+        logging.warning("Region is UNSET; set it with --settings.")
+
+    with app_state.lock:
+        initialize_globals()
+        interface_state.connected = True
+    supervise(args)
+
+    try:
+        daemon = HeadlessDaemon(socket_path)
+    except OSError as e:
+        print(f"Could not open the control socket: {e}")
+        supervisor.stop()
+        interface_state.interface.close()
+        return 1
+    daemon.start()
+    print(f"Contact daemon running, control socket: {socket_path}", flush=True)
+
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+    try:
+        stopping.wait()
+    except KeyboardInterrupt:
+        logging.info("Daemon stopped with Ctrl+C")
+    finally:
+        supervisor.stop()
+        daemon.stop()
+        save_snapshot()
+        interface_state.interface.close()
+    return 0
+
+
+def main(stdscr: curses.window) -> None:  # noqa: PLR0915
     """Main entry point for the curses UI."""
 
     output_capture = io.StringIO()
@@ -93,25 +246,52 @@ def main(stdscr: curses.window) -> None:
         draw_splash(stdscr)
 
         args = setup_parser().parse_args()
+        startup_profiler.enabled = args.profile_startup
+        supervisor.dispatch = ui_events.post  # Reconnects change UI state, so they happen on the UI thread
 
         if getattr(args, "settings", False):
             subprocess.run([sys.executable, "-m", "contact.settings"], check=True)
             return
 
-        logging.info("Initializing interface...")
-        with app_state.lock:
-            interface_state.interface = initialize_interface(args)
-
-            if interface_state.interface.localNode.localConfig.lora.region == 0:
-                prompt_region_if_unset(args)
+        with startup_profiler.phase("imports"):
+            from contact.ui.contact_ui import main_ui  # noqa: PLC0415
+            from contact.utilities.interfaces import initialize_interface  # noqa: PLC0415
+            from contact.utilities.snapshot import apply_snapshot, load_snapshot  # noqa: PLC0415
+            from contact.utilities.utils import get_node_list  # noqa: PLC0415
 
-            initialize_globals()
+        snapshot = None if args.attach or args.interfaces else load_snapshot()
+        with app_state.lock:
+            if args.attach:
+                logging.info("Attaching to the contact daemon...")
+                attach_to_daemon(args.socket or config.control_socket_path)
+            elif args.interfaces:
+                logging.info("Initializing %d interfaces...", len(args.interfaces))
+                open_sessions(args.interfaces)
+            elif snapshot:
+                # Paint the last known state right away and connect in the background.
+                logging.info("Warm start from snapshot; connecting in the background...")
+                apply_snapshot(snapshot)
+                ui_state.node_list = get_node_list()
+                ui_state.single_pane_mode = config.single_pane_mode.lower() == "true"
+                threading.Thread(target=connect_and_reconcile, args=(args,), daemon=True).start()
+            else:
+                logging.info("Initializing interface...")
+                with startup_profiler.phase("interface connect"):
+                    interface_state.interface = initialize_interface(args)
+
+                if interface_state.interface.localNode.localConfig.lora.region == 0:
+                    prompt_region_if_unset(args)
+
+                initialize_globals()
+                interface_state.connected = True
+                supervise(args)
             logging.info("Starting main UI")
 
             stdscr.clear()
             stdscr.refresh()
 
         try:
+            startup_profiler.begin("first paint")
             with contextlib.redirect_stdout(output_capture), contextlib.redirect_stderr(output_capture):
                 main_ui(stdscr)
         except Exception:
@@ -143,6 +323,20 @@ def ensure_min_rows(stdscr: curses.window, min_rows: int = 11) -> None:
         stdscr.refresh()
 
 
+def save_snapshot_on_exit() -> None:
+    """Refresh the warm-start snapshot, but only from live data of a single radio."""
+    if not interface_state.connected or session_manager.sessions:
+        return
+    from contact.utilities.snapshot import save_snapshot  # noqa: PLC0415
+
+    save_snapshot()
+
+
+def close_interfaces() -> None:
+    for interface in session_manager.interfaces() or [interface_state.interface]:
+        interface.close()
+
+
 def start() -> None:
     """Entry point for the application."""
 
@@ -150,12 +344,43 @@ def start() -> None:
         setup_parser().print_help()
         sys.exit(0)
 
+    args = setup_parser().parse_args()
+    if args.fleet_config:
+        from contact.utilities.fleet import run_fleet_from_args  # noqa: PLC0415
+
+        sys.exit(run_fleet_from_args(args))
+    if args.export_tracks:
+        from contact.utilities.position_store import export_tracks_from_args  # noqa: PLC0415
+
+        sys.exit(export_tracks_from_args(args))
+    if args.perf is not None:
+        hot_path.enable()
+        atexit.register(hot_path.dump_json, args.perf or config.perf_file_path)
+    if args.record:
+        from contact.utilities.capture import CaptureRecorder  # noqa: PLC0415
+
+        recorder = CaptureRecorder(args.record)
+        recorder.start()
+        atexit.register(recorder.stop)
+    if args.daemon:
+        sys.exit(run_headless(args))
+    if args.async_core:
+        async_core.start()
+
     try:
         curses.wrapper(main)
-        interface_state.interface.close()
+        async_core.stop()
+        supervisor.stop()
+        save_snapshot_on_exit()
+        close_interfaces()
+        if startup_profiler.enabled:
+            print(startup_profiler.format_report())
     except KeyboardInterrupt:
         logging.info("User exited with Ctrl+C")
-        interface_state.interface.close()
+        async_core.stop()
+        supervisor.stop()
+        save_snapshot_on_exit()
+        close_interfaces()
         sys.exit(0)
     except Exception as e:
         logging.critical("Fatal error", exc_info=True)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 import platform
@@ -8,20 +9,19 @@ import time
 from typing import Any
 
 import contact.ui.default_config as config
-from contact.ui.contact_ui import (
-    add_notification,
-    draw_channel_list,
-    draw_messages_window,
-    draw_node_list,
-    draw_packetlog_win,
-)
+from contact.ui.contact_ui import add_notification
+from contact.ui.ui_events import CHANNELS, NEW_MESSAGE, NODES, PACKET_LOG
+from contact.utilities.async_core import async_core
 from contact.utilities.db_handler import (
     get_name_from_database,
     maybe_store_nodeinfo_in_db,
     save_message_to_db,
     update_node_info_in_db,
 )
-from contact.utilities.singleton import app_state, interface_state, menu_state, ui_state
+from contact.utilities.perf import hot_path
+from contact.utilities.position_store import record_position
+from contact.utilities.singleton import app_state, interface_state, menu_state, ui_events, ui_state
+from contact.utilities.telemetry_store import record_telemetry
 from contact.utilities.utils import (
     add_new_message,
     refresh_node_list,
@@ -32,6 +32,9 @@ _SOUND_DEBOUNCE_SECONDS = 0.8
 _sound_timer: threading.Timer | None = None
 _sound_timer_lock = threading.Lock()
 _last_sound_request = 0.0
+_sound_handle: asyncio.TimerHandle | None = None  # the same debounce on the asyncio core
+
+hot_path.gauge("rx.packet_log", lambda: len(ui_state.packet_buffer))
 
 
 def schedule_notification_sound(delay: float = _SOUND_DEBOUNCE_SECONDS) -> None:
@@ -40,7 +43,13 @@ def schedule_notification_sound(delay: float = _SOUND_DEBOUNCE_SECONDS) -> None:
     If more messages arrive before the delay elapses, the timer is reset.
     This prevents playing a sound for each message when a backlog flushes.
     """
-    global _sound_timer, _last_sound_request  # noqa: PLW0603
+    global _sound_timer, _last_sound_request, _sound_handle  # noqa: PLW0603
+
+    if async_core.running:
+        if _sound_handle is not None:
+            _sound_handle.cancel()
+        _sound_handle = async_core.loop.call_later(delay, async_core.run_blocking, play_sound)
+        return
 
     now = time.monotonic()
     with _sound_timer_lock:
@@ -101,11 +110,12 @@ def play_sound():
             return
 
     except subprocess.CalledProcessError as e:
-        logging.error(f"Sound playback failed: {e}")
+        logging.error("Sound playback failed: %s", e)
     except Exception as e:
-        logging.error(f"Unexpected error: {e}")
+        logging.error("Unexpected error: %s", e)
 
 
+@hot_path.timed("rx.on_receive")
 def on_receive(packet: dict[str, Any], interface: Any) -> None:  # noqa: PLR0915, PLR0912
     """
     Handles an incoming packet from a Meshtastic interface.
@@ -122,7 +132,7 @@ def on_receive(packet: dict[str, Any], interface: Any) -> None:  # noqa: PLR0915
             ui_state.packet_buffer = ui_state.packet_buffer[-20:]  # noqa: PLR2004
 
         if ui_state.display_log:
-            draw_packetlog_win()
+            ui_events.request_redraw(PACKET_LOG)
 
             if ui_state.current_window == 4:  # noqa: PLR2004
                 menu_state.need_redraw = True
@@ -130,14 +140,25 @@ def on_receive(packet: dict[str, Any], interface: Any) -> None:  # noqa: PLR0915
             if "decoded" not in packet:
                 return
 
+            # A UI attached to a headless daemon gets packets the daemon has already stored.
+            persist = getattr(interface, "persists_received", True)
+
             # Assume any incoming packet could update the last seen time for a node
-            changed = refresh_node_list()
+            changed = refresh_node_list(packet.get("from"))
             if changed:
-                draw_node_list()
+                ui_events.request_redraw(NODES)
 
             if packet["decoded"]["portnum"] == "NODEINFO_APP":
-                if "user" in packet["decoded"] and "longName" in packet["decoded"]["user"]:
-                    maybe_store_nodeinfo_in_db(packet)
+                if persist and "user" in packet["decoded"] and "longName" in packet["decoded"]["user"]:
+                    async_core.run_db(maybe_store_nodeinfo_in_db, packet, redraw=(NODES, CHANNELS))
+
+            elif packet["decoded"]["portnum"] == "POSITION_APP":
+                if persist:
+                    async_core.run_db(record_position, packet)
+
+            elif packet["decoded"]["portnum"] == "TELEMETRY_APP":
+                if persist:
+                    async_core.run_db(record_telemetry, packet)
 
             elif packet["decoded"]["portnum"] == "TEXT_MESSAGE_APP":
                 hop_start = packet.get("hopStart", 0)
@@ -166,7 +187,8 @@ def on_receive(packet: dict[str, Any], interface: Any) -> None:  # noqa: PLR0915
                         ui_state.channel_list.append(packet["from"])
                         if packet["from"] not in ui_state.all_messages:
                             ui_state.all_messages[packet["from"]] = []
-                        update_node_info_in_db(packet["from"], chat_archived=False)
+                        if persist:
+                            async_core.run_db(update_node_info_in_db, packet["from"], chat_archived=False)
                         refresh_channels = True
 
                     channel_number = ui_state.channel_list.index(packet["from"])
@@ -186,11 +208,12 @@ def on_receive(packet: dict[str, Any], interface: Any) -> None:  # noqa: PLR0915
                 add_new_message(channel_id, f"{config.message_prefix} [{hops}] {message_from_string} ", message_string)
 
                 if refresh_channels:
-                    draw_channel_list()
+                    ui_events.request_redraw(CHANNELS)
                 if refresh_messages:
-                    draw_messages_window(True)
+                    ui_events.request_redraw(NEW_MESSAGE)
 
-                save_message_to_db(channel_id, message_from_id, message_string)
+                if persist:
+                    async_core.run_db(save_message_to_db, channel_id, message_from_id, message_string)
 
         except KeyError as e:
-            logging.error(f"Error processing packet: {e}")
+            logging.error("Error processing packet: %s", e)
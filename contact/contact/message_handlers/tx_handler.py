@@ -1,3 +1,4 @@
+import logging
 import time
 from typing import Any
 
@@ -6,7 +7,8 @@ from meshtastic import BROADCAST_NUM
 from meshtastic.protobuf import mesh_pb2, portnums_pb2
 
 import contact.ui.default_config as config
-from contact.ui.contact_ui import add_notification, draw_channel_list, draw_messages_window
+from contact.ui.ui_events import CHANNELS, MESSAGES, NEW_MESSAGE
+from contact.utilities.async_core import async_core
 from contact.utilities.db_handler import (
     get_name_from_database,
     is_chat_archived,
@@ -14,49 +16,75 @@ from contact.utilities.db_handler import (
     update_ack_nak,
     update_node_info_in_db,
 )
-from contact.utilities.singleton import interface_state, ui_state
+from contact.utilities.message_window import find_sent_entry
+from contact.utilities.perf import hot_path
+from contact.utilities.sessions import session_manager
+from contact.utilities.singleton import app_state, interface_state, ui_events, ui_state
 from contact.utilities.utils import add_new_message
 
-ack_naks: dict[str, dict[str, Any]] = {}  # requestId -> {channel, messageIndex, timestamp}
+ACK_TIMEOUT_SECONDS = 300  # a message still unconfirmed after this long is shown as not delivered
+OUTBOX_LIMIT = 100  # messages held while the radio reconnects; beyond this the oldest is given up on
 
+ack_naks: dict[str, dict[str, Any]] = {}  # requestId -> {node, channel, entry, timestamp, sent_at}
+outbox: list[dict[str, Any]] = []  # messages typed while reconnecting: {node, message, destination, channelIndex, ...}
 
-# Note "onAckNak" has special meaning to the API, thus the nonstandard naming convention
-# See https://github.com/meshtastic/python/blob/master/meshtastic/mesh_interface.py#L462
+hot_path.gauge("tx.pending_acks", lambda: len(ack_naks))
+hot_path.gauge("tx.outbox", lambda: len(outbox))
+hot_path.gauge("tx.radio_queue", lambda: len(getattr(interface_state.interface, "queue", None) or ()))
+
+
+# ACKs only reach a response handler named "onAckNak" or registered with onResponseAckPermitted,
+# which send_message uses. See https://github.com/meshtastic/python/blob/master/meshtastic/mesh_interface.py#L462
+@hot_path.timed("tx.on_ack_nak")
 def on_ack_nak(packet: dict[str, Any]) -> None:
     """
     Handles incoming ACK/NAK response packets.
     """
 
     request = packet["decoded"]["requestId"]
-    if request not in ack_naks:
-        return
+    with app_state.lock:
+        if request not in ack_naks:
+            return
+
+        acknak = ack_naks.pop(request)
+        if packet["decoded"]["routing"]["errorReason"] == "NONE":
+            if packet["from"] == interface_state.my_node_num:  # Ack "from" ourself means implicit ACK
+                mark_ack_nak(acknak, config.ack_implicit_str, "Implicit")
+            else:
+                mark_ack_nak(acknak, config.ack_str, "Ack")
+        else:
+            mark_ack_nak(acknak, config.nak_str, "Nak")
 
-    acknak = ack_naks.pop(request)
-    message = ui_state.all_messages[acknak["channel"]][acknak["messageIndex"]][1]
 
-    confirm_string = " "
-    ack_type = None
-    if packet["decoded"]["routing"]["errorReason"] == "NONE":
-        if packet["from"] == interface_state.my_node_num:  # Ack "from" ourself means implicit ACK
-            confirm_string = config.ack_implicit_str
-            ack_type = "Implicit"
-        else:
-            confirm_string = config.ack_str
-            ack_type = "Ack"
-    else:
-        confirm_string = config.nak_str
-        ack_type = "Nak"
-
-    ui_state.all_messages[acknak["channel"]][acknak["messageIndex"]] = (
-        time.strftime("[%H:%M:%S] ") + config.sent_message_prefix + confirm_string + ": ",
-        message,
-    )
+def mark_ack_nak(acknak: dict[str, Any], confirm_string: str, ack_type: str) -> None:
+    """Show a sent message's delivery state and store it."""
+    message = acknak["entry"][1]
+    messages = ui_state.all_messages.get(acknak["channel"], [])
+    index = find_sent_entry(messages, acknak["entry"])
+    if index is not None:  # Otherwise it has scrolled out of memory, and is shown from the database when read back
+        messages[index] = (time.strftime("[%H:%M:%S] ") + config.sent_message_prefix + confirm_string + ": ", message)
 
-    update_ack_nak(acknak["channel"], acknak["timestamp"], message, ack_type)
+    async_core.run_db(update_ack_nak, acknak["channel"], acknak["timestamp"], message, ack_type)
 
-    channel_number = ui_state.channel_list.index(acknak["channel"])
-    if ui_state.channel_list[channel_number] == ui_state.channel_list[ui_state.selected_channel]:
-        draw_messages_window()
+    if acknak["channel"] == ui_state.channel_list[ui_state.selected_channel]:
+        ui_events.request_redraw(MESSAGES)
+
+
+def expire_ack_naks(now: float | None = None) -> int:
+    """
+    Give up on messages unconfirmed for ACK_TIMEOUT_SECONDS and mark them as NAKs. Called with app_state.lock held.
+
+    Only the current radio's messages are expired; session_manager.run_each covers the others.
+    """
+    now = time.monotonic() if now is None else now
+    expired = [
+        request
+        for request, acknak in ack_naks.items()
+        if acknak["node"] == interface_state.my_node_num and now - acknak["sent_at"] >= ACK_TIMEOUT_SECONDS
+    ]
+    for request in expired:
+        mark_ack_nak(ack_naks.pop(request), config.nak_str, "Nak")
+    return len(expired)
 
 
 def on_response_traceroute(packet: dict[str, Any]) -> None:
@@ -137,39 +165,42 @@ def on_response_traceroute(packet: dict[str, Any]) -> None:
 
         msg_str += route_str + "\n"  # Print the route back to us
 
-    if packet["from"] not in ui_state.channel_list:
-        ui_state.channel_list.append(packet["from"])
-        refresh_channels = True
+    with app_state.lock:
+        if packet["from"] not in ui_state.channel_list:
+            ui_state.channel_list.append(packet["from"])
+            refresh_channels = True
+
+        if is_chat_archived(packet["from"]):
+            async_core.run_db(update_node_info_in_db, packet["from"], chat_archived=False)
 
-    if is_chat_archived(packet["from"]):
-        update_node_info_in_db(packet["from"], chat_archived=False)
+        channel_number = ui_state.channel_list.index(packet["from"])
+        channel_id = ui_state.channel_list[channel_number]
 
-    channel_number = ui_state.channel_list.index(packet["from"])
-    channel_id = ui_state.channel_list[channel_number]
+        if channel_id == ui_state.channel_list[ui_state.selected_channel]:
+            refresh_messages = True
+        else:
+            from contact.ui.contact_ui import add_notification  # noqa: PLC0415 - contact_ui imports this module
 
-    if channel_id == ui_state.channel_list[ui_state.selected_channel]:
-        refresh_messages = True
-    else:
-        add_notification(channel_number)
-        refresh_channels = True
+            add_notification(channel_number)
+            refresh_channels = True
 
-    message_from_string = get_name_from_database(packet["from"], type="short") + ":\n"
+        message_from_string = get_name_from_database(packet["from"], type="short") + ":\n"
 
-    add_new_message(channel_id, f"{config.message_prefix} {message_from_string}", msg_str)
+        add_new_message(channel_id, f"{config.message_prefix} {message_from_string}", msg_str)
 
-    if refresh_channels:
-        draw_channel_list()
-    if refresh_messages:
-        draw_messages_window(True)
+        if refresh_channels:
+            ui_events.request_redraw(CHANNELS)
+        if refresh_messages:
+            ui_events.request_redraw(NEW_MESSAGE)
 
-    save_message_to_db(channel_id, packet["from"], msg_str)
+        async_core.run_db(save_message_to_db, channel_id, packet["from"], msg_str)
 
 
+@hot_path.timed("tx.send_message")
 def send_message(message: str, destination: int = BROADCAST_NUM, channel: int = 0) -> None:
     """
-    Sends a chat message using the selected channel.
+    Sends a chat message using the selected channel, or holds it in the outbox while the radio reconnects.
     """
-    myid = interface_state.my_node_num
     send_on_channel = 0
     channel_id = ui_state.channel_list[channel]
     if isinstance(channel_id, int):
@@ -178,26 +209,62 @@ def send_message(message: str, destination: int = BROADCAST_NUM, channel: int =
     elif isinstance(channel_id, str):
         send_on_channel = channel
 
-    sent_message_data = interface_state.interface.sendText(
-        text=message,
-        destinationId=destination,
+    entry = add_new_message(channel_id, config.sent_message_prefix + config.ack_unknown_str + ": ", message)
+
+    pending = {
+        "node": interface_state.my_node_num,
+        "message": message,
+        "destination": destination,
+        "channelIndex": send_on_channel,
+        "channel": channel_id,
+        "entry": entry,
+        "timestamp": None,
+    }
+    if interface_state.reconnecting:
+        outbox.append(pending)
+        if len(outbox) > OUTBOX_LIMIT:
+            dropped = outbox.pop(0)
+            logging.warning("Outbox full; gave up on a message to %s", dropped["channel"])
+            mark_ack_nak(dropped, config.nak_str, "Nak")
+        return
+
+    transmit(pending)
+
+
+def transmit(pending: dict[str, Any]) -> None:
+    """Hand a message to the radio, store it and wait for its ACK."""
+    # sendData rather than sendText: only it can ask for plain ACKs to reach on_ack_nak, not just NAKs.
+    sent_message_data = interface_state.interface.sendData(
+        pending["message"].encode("utf-8"),
+        destinationId=pending["destination"],
+        portNum=portnums_pb2.PortNum.TEXT_MESSAGE_APP,
         wantAck=True,
         wantResponse=False,
-        onResponse=on_ack_nak,
-        channelIndex=send_on_channel,
+        onResponse=async_core.threadsafe(session_manager.bind(on_ack_nak)),
+        onResponseAckPermitted=True,
+        channelIndex=pending["channelIndex"],
     )
 
-    add_new_message(channel_id, config.sent_message_prefix + config.ack_unknown_str + ": ", message)
-
-    timestamp = save_message_to_db(channel_id, myid, message)
+    timestamp = save_message_to_db(pending["channel"], pending["node"], pending["message"])
 
     ack_naks[sent_message_data.id] = {
-        "channel": channel_id,
-        "messageIndex": len(ui_state.all_messages[channel_id]) - 1,
+        "node": pending["node"],
+        "channel": pending["channel"],
+        "entry": pending["entry"],
         "timestamp": timestamp,
+        "sent_at": time.monotonic(),
     }
 
 
+def flush_outbox() -> int:
+    """Send the current radio's held messages, oldest first, once it is back. Called with app_state.lock held."""
+    ready = [pending for pending in outbox if pending["node"] == interface_state.my_node_num]
+    for pending in ready:
+        outbox.remove(pending)
+        transmit(pending)
+    return len(ready)
+
+
 def send_traceroute() -> None:
     """
     Sends a RouteDiscovery protobuf to the selected node.
@@ -212,7 +279,7 @@ def send_traceroute() -> None:
         destinationId=channel_id,
         portNum=portnums_pb2.PortNum.TRACEROUTE_APP,
         wantResponse=True,
-        onResponse=on_response_traceroute,
+        onResponse=async_core.threadsafe(session_manager.bind(on_response_traceroute)),
         channelIndex=0,
         hopLimit=3,
     )
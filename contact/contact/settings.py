@@ -14,6 +14,7 @@ from contact.utilities.arg_parser import setup_parser
 from contact.utilities.i18n import t
 from contact.utilities.input_handlers import get_list_input
 from contact.utilities.interfaces import initialize_interface
+from contact.utilities.log_setup import setup_logging
 
 
 def main(stdscr: curses.window) -> None:
@@ -70,10 +71,11 @@ def ensure_min_rows(stdscr: curses.window, min_rows: int = 11) -> None:
         stdscr.refresh()
 
 
-logging.basicConfig(  # Run `tail -f client.log` in another terminal to view live
-    filename=config.log_file_path,
+setup_logging(  # Run `tail -f client.log` in another terminal to view live
+    config.log_file_path,
     level=logging.WARNING,  # DEBUG, INFO, WARNING, ERROR, CRITICAL)
-    format="%(asctime)s - %(levelname)s - %(message)s",
+    max_bytes=config.log_max_bytes,
+    backup_count=config.log_backup_count,
 )
 
 if __name__ == "__main__":
@@ -13,6 +13,10 @@ COLOR_MAP = {
     "white": curses.COLOR_WHITE,
 }
 
+# category -> attributes for each bold/reverse/underline combination, indexed by
+# bold + 2 * reverse + 4 * underline. Rebuilt by setup_colors().
+_color_table: dict[str, list[int]] = {}
+
 
 def setup_colors(reinit: bool = False) -> None:
     """
@@ -28,13 +32,35 @@ def setup_colors(reinit: bool = False) -> None:
         bg = COLOR_MAP.get(bg_name.lower(), curses.COLOR_BLACK)
         curses.init_pair(idx, fg, bg)
         config.COLOR_CONFIG[category] = idx
+    build_color_table()
     print()
 
 
+def build_color_table() -> None:
+    """Precompute the attribute for every category and bold/reverse/underline combination."""
+    table = {}
+    for category, pair in config.COLOR_CONFIG.items():
+        base = curses.color_pair(pair)
+        table[category] = [
+            base
+            | (curses.A_BOLD if flags & 1 else 0)
+            | (curses.A_REVERSE if flags & 2 else 0)
+            | (curses.A_UNDERLINE if flags & 4 else 0)
+            for flags in range(8)
+        ]
+    _color_table.clear()
+    _color_table.update(table)
+
+
 def get_color(category: str, bold: bool = False, reverse: bool = False, underline: bool = False) -> int:
     """
     Retrieve a curses color pair with optional attributes.
     """
+    try:
+        return _color_table[category][bool(bold) + 2 * bool(reverse) + 4 * bool(underline)]
+    except KeyError:
+        pass  # setup_colors() hasn't run yet
+
     color = curses.color_pair(config.COLOR_CONFIG[category])
     if bold:
         color |= curses.A_BOLD
@@ -1,22 +1,54 @@
 import curses
 import logging
+import sys
 import time
 import traceback
 
 import contact.ui.default_config as config
 import contact.ui.dialog
-from contact.message_handlers.tx_handler import send_message, send_traceroute
-from contact.settings import settings_menu
+from contact.message_handlers.tx_handler import expire_ack_naks, send_message, send_traceroute
 from contact.ui.colors import get_color
 from contact.ui.nav_utils import draw_main_arrows, get_msg_window_lines, move_main_highlight, wrap_text
-from contact.utilities.db_handler import get_name_from_database, is_chat_archived, update_node_info_in_db
+from contact.ui.ui_events import CHANNELS, MESSAGES, NEW_MESSAGE, NODES, PACKET_LOG, STATUS
+from contact.utilities.async_core import async_core
+from contact.utilities.db_handler import (
+    get_name_from_database,
+    is_chat_archived,
+    reload_channel_messages,
+    update_node_info_in_db,
+)
 from contact.utilities.i18n import t
 from contact.utilities.input_handlers import get_list_input
-from contact.utilities.singleton import interface_state, menu_state, ui_state
-from contact.utilities.utils import get_channels, get_readable_duration, get_time_ago, parse_protobuf, refresh_node_list
+from contact.utilities.message_window import MessageWindows
+from contact.utilities.node_query import parse_node_query
+from contact.utilities.perf import hot_path, startup_profiler
+from contact.utilities.search_index import NameSearch, search_index
+from contact.utilities.sessions import session_manager
+from contact.utilities.singleton import app_state, interface_state, menu_state, ui_events, ui_state
+from contact.utilities.telemetry_store import hourly_series
+from contact.utilities.utils import (
+    get_channels,
+    get_readable_duration,
+    get_time_ago,
+    parse_protobuf,
+    refresh_node_list,
+    sparkline,
+)
 
 MIN_COL = 1  # "effectively zero" without breaking curses
+INPUT_TIMEOUT_MS = 200  # longest a keypress wait holds up background work
+TICK_SECONDS = 1.0  # how often periodic work runs while the UI is idle
+SPARKLINE_HOURS = 24  # one character per hour in the node details charts
+# Stored telemetry charted in the node details: metric, label and unit.
+SPARKLINE_METRICS = (
+    ("device.batteryLevel", "Battery", "%"),
+    ("device.voltage", "Voltage", "V"),
+    ("link.snr", "SNR", "dB"),
+    ("device.channelUtilization", "Channel util.", "%"),
+    ("device.airUtilTx", "Air util. TX", "%"),
+)
 root_win = None
+_next_tick = 0.0
 
 # Window IDs
 WINDOW_CHANNELS = 0
@@ -101,6 +133,7 @@ def handle_resize(stdscr: curses.window, firstrun: bool) -> None:  # noqa: PLR09
 
     if firstrun:
         entry_win = curses.newwin(entry_height, width, height - entry_height, 0)
+        entry_win.timeout(INPUT_TIMEOUT_MS)
 
         channel_win = curses.newwin(content_h, channel_width, 0, 0)
         messages_win = curses.newwin(content_h, messages_width, 0, channel_width)
@@ -164,7 +197,7 @@ def handle_resize(stdscr: curses.window, firstrun: bool) -> None:  # noqa: PLR09
         pass
 
 
-def main_ui(stdscr: curses.window) -> None:  # noqa: PLR0915, PLR0912
+def main_ui(stdscr: curses.window) -> None:
     """Main UI loop for the curses interface."""
     global input_text, root_win  # noqa: PLW0603
 
@@ -173,84 +206,222 @@ def main_ui(stdscr: curses.window) -> None:  # noqa: PLR0915, PLR0912
     stdscr.keypad(True)
     get_channels()
     handle_resize(stdscr, True)
+    startup_profiler.end("first paint")
+    startup_profiler.ready()
+    startup_profiler.log_report()
+
+    if async_core.running:
+        run_async_ui(stdscr)
+        return
 
     while True:
-        draw_text_field(entry_win, f"Message: {(input_text or '')[-(stdscr.getmaxyx()[1] - 10) :]}", get_color("input"))  # noqa: PLR2004
+        draw_input_field(stdscr)
 
         # Get user input from entry window
-        char = entry_win.get_wch()
+        if not handle_key(stdscr, read_key()):
+            break
 
-        # draw_debug(f"Keypress: {char}")
 
-        if char == curses.KEY_UP:
-            handle_up()
+def draw_input_field(stdscr: curses.window) -> None:
+    radio = f"[{session_label()}] " if session_manager.multiple else ""
+    if interface_state.reconnecting:
+        radio += f"({t('ui.label.reconnecting', default='reconnecting')}) "
+    text = (input_text or "")[-(stdscr.getmaxyx()[1] - 10 - len(radio)) :]  # noqa: PLR2004
+    draw_text_field(entry_win, f"{radio}Message: {text}", get_color("input"))
 
-        elif char == curses.KEY_DOWN:
-            handle_down()
 
-        elif char == curses.KEY_HOME:
-            handle_home()
+def session_label() -> str:
+    if session_manager.merged_active:
+        return t("ui.label.all_radios", default="All radios")
+    return session_manager.active.name
 
-        elif char == curses.KEY_END:
-            handle_end()
 
-        elif char == curses.KEY_PPAGE:
-            handle_pageup()
+def handle_key(stdscr: curses.window, char: int | str) -> bool:  # noqa: PLR0915, PLR0912
+    """Dispatch one keypress. Returns False when the user asked to quit."""
+    global input_text  # noqa: PLW0603
 
-        elif char == curses.KEY_NPAGE:
-            handle_pagedown()
+    # draw_debug(f"Keypress: {char}")
 
-        elif char in (curses.KEY_LEFT, curses.KEY_RIGHT):
-            handle_leftright(char)
+    if char == curses.KEY_UP:
+        handle_up()
 
-        elif char in (curses.KEY_F1, curses.KEY_F2, curses.KEY_F3):
-            handle_function_keys(char)
+    elif char == curses.KEY_DOWN:
+        handle_down()
 
-        elif char in (chr(curses.KEY_ENTER), chr(10), chr(13)):
-            input_text = handle_enter(input_text)
+    elif char == curses.KEY_HOME:
+        handle_home()
 
-        elif char in (curses.KEY_F4, chr(20)):  # Ctrl + t and F4 for Traceroute
-            handle_ctrl_t(stdscr)
+    elif char == curses.KEY_END:
+        handle_end()
 
-        elif char == curses.KEY_F5:
-            handle_f5_key(stdscr)
+    elif char == curses.KEY_PPAGE:
+        handle_pageup()
 
-        elif char in (curses.KEY_BACKSPACE, chr(127)):
-            input_text = handle_backspace(entry_win, input_text)
+    elif char == curses.KEY_NPAGE:
+        handle_pagedown()
 
-        elif char in (curses.KEY_F12, "`"):  # ` Launch the settings interface
-            handle_backtick(stdscr)
+    elif char in (curses.KEY_LEFT, curses.KEY_RIGHT):
+        handle_leftright(char)
 
-        elif char == chr(16):  # Ctrl + P for Packet Log
-            handle_ctrl_p()
+    elif char in (curses.KEY_F1, curses.KEY_F2, curses.KEY_F3):
+        handle_function_keys(char)
 
-        elif char == curses.KEY_RESIZE:
-            input_text = ""
-            handle_resize(stdscr, False)
+    elif char in (chr(curses.KEY_ENTER), chr(10), chr(13)):
+        input_text = handle_enter(input_text)
 
-        elif char == chr(4):  # Ctrl + D to delete current channel or node
-            handle_ctrl_d()
+    elif char in (curses.KEY_F4, chr(20)):  # Ctrl + t and F4 for Traceroute
+        handle_ctrl_t(stdscr)
 
-        elif char == chr(31):  # Ctrl + / to search
-            handle_ctrl_fslash()
+    elif char == curses.KEY_F5:
+        handle_f5_key(stdscr)
 
-        elif char == chr(11):  # Ctrl + K for Help
-            handle_ctrl_k(stdscr)
+    elif char in (curses.KEY_BACKSPACE, chr(127)):
+        input_text = handle_backspace(entry_win, input_text)
 
-        elif char == chr(6):  # Ctrl + F to toggle favorite
-            handle_ctrl_f(stdscr)
+    elif char in (curses.KEY_F12, "`"):  # ` Launch the settings interface
+        handle_backtick(stdscr)
 
-        elif char == chr(7):  # Ctrl + G to toggle ignored
-            handle_ctlr_g(stdscr)
+    elif char == chr(16):  # Ctrl + P for Packet Log
+        handle_ctrl_p()
 
-        elif char == chr(27):  # Escape to exit
-            break
+    elif char == curses.KEY_F6:  # F6 for the performance panel
+        handle_f6_key()
+
+    elif char == curses.KEY_F7:  # F7 for the next radio
+        handle_f7_key(stdscr)
+
+    elif char == curses.KEY_F8:  # F8 for all radios at once
+        handle_f8_key(stdscr)
+
+    elif char == curses.KEY_RESIZE:
+        input_text = ""
+        handle_resize(stdscr, False)
+
+    elif char == chr(4):  # Ctrl + D to delete current channel or node
+        handle_ctrl_d()
+
+    elif char == chr(31):  # Ctrl + / to search
+        handle_ctrl_fslash()
+
+    elif char == chr(14):  # Ctrl + N to filter and sort the node list
+        handle_ctrl_n()
+
+    elif char == chr(11):  # Ctrl + K for Help
+        handle_ctrl_k(stdscr)
+
+    elif char == chr(6):  # Ctrl + F to toggle favorite
+        handle_ctrl_f(stdscr)
+
+    elif char == chr(7):  # Ctrl + G to toggle ignored
+        handle_ctlr_g(stdscr)
+
+    elif char == chr(27):  # Escape to exit
+        return False
+
+    # Append typed character to input text
+    elif isinstance(char, str):
+        input_text += char
+    else:
+        input_text += chr(char)
+
+    return True
+
+
+def run_async_ui(stdscr: curses.window) -> None:
+    """The main loop on the asyncio core: keypresses, packets and repaints are all loop callbacks."""
+    loop = async_core.loop
+    quit_requested = loop.create_future()
+    poll_handle = None
+
+    def read_keys() -> None:
+        entry_win.timeout(0)
+        try:
+            while not quit_requested.done():
+                try:
+                    char = entry_win.get_wch()
+                except curses.error:  # Nothing more to read
+                    return
+                entry_win.timeout(INPUT_TIMEOUT_MS)  # Handlers such as search wait for keys themselves
+                if not handle_key(stdscr, char):
+                    quit_requested.set_result(None)
+                    return
+                draw_input_field(stdscr)
+                entry_win.timeout(0)
+        except Exception as e:
+            quit_requested.set_exception(e)  # Surfaces in main() like an error in the threaded loop
+        finally:
+            entry_win.timeout(INPUT_TIMEOUT_MS)
+
+    def poll() -> None:
+        # KEY_RESIZE arrives without anything on stdin, so keys are also polled with the periodic work.
+        nonlocal poll_handle
+        read_keys()
+        run_background_work()
+        poll_handle = loop.call_later(INPUT_TIMEOUT_MS / 1000, poll)
+
+    async_core.on_repaint = process_ui_events
+    draw_input_field(stdscr)
+    loop.add_reader(sys.stdin.fileno(), read_keys)
+    poll_handle = loop.call_soon(poll)
+    try:
+        loop.run_until_complete(quit_requested)
+    finally:
+        poll_handle.cancel()
+        loop.remove_reader(sys.stdin.fileno())
+        async_core.on_repaint = None
+
+
+def read_key() -> int | str:
+    """Wait for a keypress in the entry window, doing the UI thread's background work meanwhile."""
+    while True:
+        try:
+            return entry_win.get_wch()
+        except curses.error:  # No key within INPUT_TIMEOUT_MS
+            run_background_work()
 
-        # Append typed character to input text
-        elif isinstance(char, str):
-            input_text += char
-        else:
-            input_text += chr(char)
+
+def run_background_work() -> None:
+    global _next_tick  # noqa: PLW0603
+
+    now = time.monotonic()
+    if now >= _next_tick:
+        _next_tick = now + TICK_SECONDS
+        with app_state.lock:
+            session_manager.run_each(expire_ack_naks)
+        if ui_state.display_perf:
+            ui_events.request_redraw(PACKET_LOG)
+    process_ui_events()
+
+
+def process_ui_events() -> None:
+    """Run callables posted by other threads, then repaint each part they marked dirty once."""
+    calls, dirty = ui_events.take()
+    if not calls and not dirty:
+        return
+
+    with app_state.lock:
+        for func, args in calls:
+            try:
+                func(*args)
+            except Exception as e:
+                logging.error("Error in posted UI work %s: %s", getattr(func, "__name__", func), e)
+
+        try:
+            if CHANNELS in dirty:
+                draw_channel_list()
+            if NEW_MESSAGE in dirty:
+                draw_messages_window(True)
+            elif MESSAGES in dirty:
+                draw_messages_window()
+            elif PACKET_LOG in dirty:
+                draw_packetlog_win()  # Otherwise drawn along with the messages
+            if NODES in dirty:
+                draw_node_list()
+            if STATUS in dirty:
+                draw_input_field(root_win)
+        except curses.error as e:
+            # Usually a resize racing the repaint; KEY_RESIZE redraws everything next.
+            logging.warning("Repaint failed: %s", e)
 
 
 def handle_up() -> None:
@@ -407,8 +578,36 @@ def handle_function_keys(char: int) -> None:
     draw_window_arrows(ui_state.current_window)
 
 
+def require_connection() -> bool:
+    """Return True if the radio is connected; otherwise tell the user and return False."""
+    if interface_state.connected and not session_manager.merged_active:
+        return True
+    curses.curs_set(0)
+    if session_manager.merged_active:
+        contact.ui.dialog.dialog(
+            t("ui.dialog.merged_view_title", default="All Radios"),
+            t(
+                "ui.dialog.merged_view_body",
+                default="This view is read-only. Press Enter on a channel to open it on its radio, or F7 to pick one.",
+            ),
+        )
+    else:
+        contact.ui.dialog.dialog(
+            t("ui.dialog.not_connected_title", default="Not Connected"),
+            t("ui.dialog.not_connected_body", default="Still connecting to the radio. Try again in a moment."),
+        )
+    curses.curs_set(1)
+    handle_resize(root_win, False)
+    return False
+
+
 def handle_enter(input_text: str) -> str:
     """Handle Enter key events to send messages or select channels."""
+    if session_manager.merged_active:
+        session_manager.open_merged_channel(ui_state.selected_channel)
+        handle_resize(root_win, False)
+        return input_text
+
     if ui_state.current_window == WINDOW_NODES:
         node_list = ui_state.node_list
         if node_list[ui_state.selected_node] not in ui_state.channel_list:
@@ -432,6 +631,8 @@ def handle_enter(input_text: str) -> str:
         return input_text
 
     elif len(input_text) > 0:
+        if not interface_state.reconnecting and not require_connection():  # Held in the outbox while reconnecting
+            return input_text
         # TODO: This is a hack to prevent sending messages too quickly. Let's get errors from the node.
         now = time.monotonic()
         if now - ui_state.last_sent_time < 2.5:  # noqa: PLR2004
@@ -527,6 +728,11 @@ def handle_f5_key(stdscr: curses.window) -> None:  # noqa: PLR0915, PLR0912
                 air_emoji = "🔴" if air_util > 80 else "🟡" if air_util > 50 else "🟢"  # noqa: PLR2004
                 message_parts.append(f"• Air utilization TX: {air_emoji} {air_util:.2f}%")
 
+        history = telemetry_history_lines(node["num"])
+        if history:
+            message_parts.append(f"\n**📈 Last {SPARKLINE_HOURS} hours:**")
+            message_parts.extend(history)
+
         message = "\n".join(message_parts)
 
         contact.ui.dialog.dialog(
@@ -544,8 +750,23 @@ def handle_f5_key(stdscr: curses.window) -> None:  # noqa: PLR0915, PLR0912
         return
 
 
+def telemetry_history_lines(node_num: int) -> list[str]:
+    """A sparkline of hourly means for each charted metric the node has history for, with its range."""
+    lines = []
+    for metric, label, unit in SPARKLINE_METRICS:
+        values = hourly_series(node_num, metric, SPARKLINE_HOURS)
+        present = [value for value in values if value is not None]
+        if present:
+            low, high = min(present), max(present)
+            span = f"{low:.3g}{unit}" if low == high else f"{low:.3g}–{high:.3g}{unit}"
+            lines.append(f"• {label + ':':<14} {sparkline(values)} {span}")
+    return lines
+
+
 def handle_ctrl_t(stdscr: curses.window) -> None:
     """Handle Ctrl + T key events to send a traceroute."""
+    if not require_connection():
+        return
     now = time.monotonic()
     cooldown = 30.0
     remaining = cooldown - (now - ui_state.last_traceroute_time)
@@ -593,6 +814,23 @@ def handle_backspace(entry_win: curses.window, input_text: str) -> str:
 
 def handle_backtick(stdscr: curses.window) -> None:
     """Handle backtick key events to open the settings menu."""
+    # The settings subsystem (protobuf menus, YAML config I/O) is only loaded on first use.
+    from contact.settings import settings_menu  # noqa: PLC0415
+
+    if not require_connection():
+        return
+    if not getattr(interface_state.interface, "supports_settings", True):
+        curses.curs_set(0)
+        contact.ui.dialog.dialog(
+            t("ui.dialog.settings_unavailable_title", default="Settings Unavailable"),
+            t(
+                "ui.dialog.settings_unavailable_body",
+                default="Settings need a direct connection to the radio. Stop the daemon and start contact without --attach.",
+            ),
+        )
+        curses.curs_set(1)
+        handle_resize(stdscr, False)
+        return
     curses.curs_set(0)
     previous_window = ui_state.current_window
     ui_state.current_window = WINDOW_LOG
@@ -611,10 +849,40 @@ def handle_ctrl_p() -> None:
         draw_messages_window(True)
     else:
         ui_state.display_log = False
+        ui_state.display_perf = False
         packetlog_win.erase()
         draw_messages_window(True)
 
 
+def handle_f6_key() -> None:
+    """Handle F6 to toggle the performance panel, shown in place of the packet log."""
+    if ui_state.display_perf:
+        ui_state.display_perf = False
+        ui_state.display_log = False
+        packetlog_win.erase()
+    else:
+        hot_path.enable()
+        ui_state.display_perf = True
+        ui_state.display_log = True
+    draw_messages_window(True)
+
+
+def handle_f7_key(stdscr: curses.window) -> None:
+    """Handle F7 to switch to the next radio when several are connected."""
+    if not session_manager.multiple:
+        return
+    session_manager.cycle()
+    handle_resize(stdscr, False)
+
+
+def handle_f8_key(stdscr: curses.window) -> None:
+    """Handle F8 to toggle the merged view of every radio's channels."""
+    if not session_manager.multiple:
+        return
+    session_manager.toggle_merged()
+    handle_resize(stdscr, False)
+
+
 # --- Ctrl+K handler for Help ---
 def handle_ctrl_k(stdscr: curses.window) -> None:
     """Handle Ctrl + K to show a help window with shortcut keys."""
@@ -628,12 +896,16 @@ def handle_ctrl_k(stdscr: curses.window) -> None:
         t("ui.help.settings", default="` or F12 = Settings"),
         t("ui.help.quit", default="ESC = Quit"),
         t("ui.help.packet_log", default="Ctrl+P = Toggle Packet Log"),
+        t("ui.help.perf_panel", default="F6 = Toggle Performance Panel"),
+        t("ui.help.next_radio", default="F7 = Next radio"),
+        t("ui.help.all_radios", default="F8 = Toggle all radios view"),
         t("ui.help.traceroute", default="Ctrl+T or F4 = Traceroute"),
         t("ui.help.node_info", default="F5 = Full node info"),
         t("ui.help.archive_chat", default="Ctrl+D = Archive chat / remove node"),
         t("ui.help.favorite", default="Ctrl+F = Favorite"),
         t("ui.help.ignore", default="Ctrl+G = Ignore"),
         t("ui.help.search", default="Ctrl+/ = Search"),
+        t("ui.help.filter_nodes", default="Ctrl+N = Filter/sort nodes"),
         t("ui.help.help", default="Ctrl+K = Help"),
     ]
 
@@ -659,7 +931,7 @@ def handle_ctrl_d() -> None:
             draw_channel_list()
             draw_messages_window()
 
-    if ui_state.current_window == WINDOW_NODES:
+    if ui_state.current_window == WINDOW_NODES and require_connection():
         curses.curs_set(0)
         confirmation = get_list_input(
             t(
@@ -695,9 +967,16 @@ def handle_ctrl_fslash() -> None:
         search(ui_state.current_window)
 
 
+def handle_ctrl_n() -> None:
+    """Handle Ctrl + N key events to filter and sort the node list."""
+    ui_state.current_window = WINDOW_NODES
+    handle_resize(root_win, False)
+    filter_nodes()
+
+
 def handle_ctrl_f(stdscr: curses.window) -> None:
     """Handle Ctrl + F key events to toggle favorite status of the selected node."""
-    if ui_state.current_window == WINDOW_NODES:
+    if ui_state.current_window == WINDOW_NODES and require_connection():
         selected_node = interface_state.interface.nodesByNum[ui_state.node_list[ui_state.selected_node]]
 
         curses.curs_set(0)  # noqa: PLR2004
@@ -741,7 +1020,7 @@ def handle_ctrl_f(stdscr: curses.window) -> None:
 
 def handle_ctlr_g(stdscr: curses.window) -> None:
     """Handle Ctrl + G key events to toggle ignored status of the selected node."""
-    if ui_state.current_window == WINDOW_NODES:
+    if ui_state.current_window == WINDOW_NODES and require_connection():
         selected_node = interface_state.interface.nodesByNum[ui_state.node_list[ui_state.selected_node]]
 
         curses.curs_set(0)  # noqa: PLR2004
@@ -759,6 +1038,7 @@ def handle_ctlr_g(stdscr: curses.window) -> None:
             if confirmation == "Yes":
                 interface_state.interface.localNode.setIgnored(ui_state.node_list[ui_state.selected_node])
                 interface_state.interface.nodesByNum[ui_state.node_list[ui_state.selected_node]]["isIgnored"] = True
+                refresh_node_list(ui_state.node_list[ui_state.selected_node])
         else:
             confirmation = get_list_input(
                 t(
@@ -772,13 +1052,17 @@ def handle_ctlr_g(stdscr: curses.window) -> None:
             if confirmation == "Yes":
                 interface_state.interface.localNode.removeIgnored(ui_state.node_list[ui_state.selected_node])
                 interface_state.interface.nodesByNum[ui_state.node_list[ui_state.selected_node]]["isIgnored"] = False
+                refresh_node_list(ui_state.node_list[ui_state.selected_node])
 
         handle_resize(stdscr, False)
 
 
+@hot_path.timed("ui.draw_channels")
 def draw_channel_list() -> None:
     """Update the channel list window and pad based on the current state."""
 
+    if root_win is None:  # Headless, or the UI isn't up yet
+        return
     if ui_state.current_window != 0 and ui_state.single_pane_mode:
         return
 
@@ -825,15 +1109,28 @@ def draw_channel_list() -> None:
     channel_win.refresh()
 
 
+def keep_channel_loaded(channel: str | int) -> None:
+    """Mark a shown channel as used, reading its messages back if they were dropped to save memory."""
+    if not isinstance(ui_state.all_messages, MessageWindows):
+        return  # The merged view borrows each radio's lists
+    if ui_state.all_messages.start_reload(channel):  # Redrawn once read back
+        async_core.run_db(reload_channel_messages, channel, ui_state.all_messages, redraw=(MESSAGES,))
+    ui_state.all_messages.touch(channel)
+
+
+@hot_path.timed("ui.draw_messages")
 def draw_messages_window(scroll_to_bottom: bool = False) -> None:
     """Update the messages window based on the selected channel and scroll position."""
 
+    if root_win is None:
+        return
     if ui_state.current_window != 1 and ui_state.single_pane_mode:
         return
 
     messages_pad.erase()
 
     channel = ui_state.channel_list[ui_state.selected_channel]
+    keep_channel_loaded(channel)
 
     if channel in ui_state.all_messages:
         messages = ui_state.all_messages[channel]
@@ -877,10 +1174,13 @@ def draw_messages_window(scroll_to_bottom: bool = False) -> None:
         menu_state.need_redraw = True
 
 
+@hot_path.timed("ui.draw_nodes")
 def draw_node_list() -> None:
     """Update the nodes list window and pad based on the current state."""
     global nodes_pad  # noqa: PLW0603
 
+    if root_win is None:
+        return
     if ui_state.current_window != 2 and ui_state.single_pane_mode:  # noqa: PLR2004
         return
 
@@ -894,7 +1194,7 @@ def draw_node_list() -> None:
         box_width = nodes_win.getmaxyx()[1]
         nodes_pad.resize(len(ui_state.node_list) + 1, box_width)
     except Exception as e:
-        logging.error(f"Error Drawing Nodes List: {e}")
+        logging.error("Error Drawing Nodes List: %s", e)
         logging.error("Traceback: %s", traceback.format_exc())
 
     for i, node_num in enumerate(ui_state.node_list):
@@ -919,6 +1219,8 @@ def draw_node_list() -> None:
         )
 
     paint_frame(nodes_win, selected=(ui_state.current_window == 2))  # noqa: PLR2004
+    if ui_state.node_filter and box_width > 6:  # noqa: PLR2004
+        nodes_win.addstr(0, 2, f" {ui_state.node_filter} "[: box_width - 4], get_color("window_frame_selected"))
     nodes_win.refresh()
     refresh_pad(2)  # noqa: PLR2004
     draw_window_arrows(2)  # noqa: PLR2004
@@ -1021,15 +1323,27 @@ def scroll_nodes(direction: int) -> None:
     select_node(new_selected_node)
 
 
+@hot_path.timed("ui.draw_packet_log")
 def draw_packetlog_win() -> None:
     """Draw the packet log window with the latest packets."""
     columns = [10, 10, 15, 30]
     span = 0
 
+    if root_win is None:
+        return
     if ui_state.current_window != 1 and ui_state.single_pane_mode:
         return
 
-    if ui_state.display_log:
+    if ui_state.display_perf:
+        packetlog_win.erase()
+        height, width = packetlog_win.getmaxyx()
+        for i, line in enumerate(hot_path.format_lines(width - 2)[: height - 2]):
+            packetlog_win.addstr(
+                i + 1, 1, line, get_color("log_header", underline=True) if i == 0 else get_color("log")
+            )
+        paint_frame(packetlog_win, selected=False)
+
+    elif ui_state.display_log:
         packetlog_win.erase()
         height, width = packetlog_win.getmaxyx()
 
@@ -1076,54 +1390,89 @@ def draw_packetlog_win() -> None:
 
 
 def search(win: int) -> None:
-    """Search for a node or channel based on user input."""
-    start_idx = ui_state.selected_node
-    select_func = select_node
-
-    if win == 0:
-        start_idx = ui_state.selected_channel
-        select_func = select_channel
+    """Search for a node or channel based on user input. Tab moves to the next match."""
+    items = ui_state.node_list if win == WINDOW_NODES else ui_state.channel_list
+    start_idx = ui_state.selected_node if win == WINDOW_NODES else ui_state.selected_channel
+    select_func = select_node if win == WINDOW_NODES else select_channel
+    name_search = NameSearch(search_index, list(items), start_idx) if items else None
 
     search_text = ""
+    match_idx = 0
     entry_win.erase()
 
     while True:
         draw_centered_text_field(entry_win, f"Search: {search_text}", 0, get_color("input"))
-        char = entry_win.get_wch()
+        char = read_key()
 
         if char in (chr(27), chr(curses.KEY_ENTER), chr(10), chr(13)):  # noqa: PLR2004
             break
         elif char == "\t":
-            start_idx = ui_state.selected_node + 1 if win == WINDOW_NODES else ui_state.selected_channel + 1
+            match_idx += 1
         elif char in (curses.KEY_BACKSPACE, chr(127)):
             if search_text:
                 search_text = search_text[:-1]
-                y, x = entry_win.getyx()
-                entry_win.move(y, x - 1)
-                entry_win.addch(" ")
-                entry_win.move(y, x - 1)
+                match_idx = 0
                 entry_win.erase()
                 entry_win.refresh()
         elif isinstance(char, str):
             search_text += char
-
-        search_text_caseless = search_text.casefold()
-
-        node_list_to_search = ui_state.node_list if win == 2 else ui_state.channel_list  # noqa: PLR2004
-        for i, n in enumerate(node_list_to_search[start_idx:] + node_list_to_search[:start_idx]):
-            if (
-                isinstance(n, int)
-                and search_text_caseless in get_name_from_database(n, "long").casefold()
-                or isinstance(n, int)
-                and search_text_caseless in get_name_from_database(n, "short").casefold()
-                or search_text_caseless in str(n).casefold()
-            ):
-                select_func((i + start_idx) % len(node_list_to_search))
+            match_idx = 0
+
+        if name_search is None:
+            continue
+        matches = name_search.matches(search_text)
+        items = ui_state.node_list if win == WINDOW_NODES else ui_state.channel_list  # May have changed meanwhile
+        for match in matches[match_idx % len(matches) :] if matches else ():
+            if match in items:
+                select_func(items.index(match))
                 break
 
     entry_win.erase()
 
 
+def filter_nodes() -> None:
+    """Edit the node filter, narrowing the node list as it is typed. ESC restores the previous filter."""
+    previous = ui_state.node_filter
+    filter_text = previous
+    entry_win.erase()
+
+    while True:
+        try:
+            parse_node_query(filter_text)
+            error = ""
+        except ValueError as e:
+            error = f"  ({e})"
+        with app_state.lock:
+            if not error and filter_text != ui_state.node_filter:
+                ui_state.node_filter = filter_text
+                refresh_node_list()
+                ui_state.selected_node = 0
+                draw_node_list()
+
+        entry_win.erase()
+        draw_centered_text_field(
+            entry_win, t("ui.prompt.filter_nodes", default="Filter: ") + filter_text + error, 0, get_color("input")
+        )
+        char = read_key()
+
+        if char in (chr(curses.KEY_ENTER), chr(10), chr(13)):  # noqa: PLR2004
+            break
+        elif char == chr(27):  # noqa: PLR2004
+            filter_text = previous
+            with app_state.lock:
+                ui_state.node_filter = previous
+                refresh_node_list()
+                ui_state.selected_node = 0
+                draw_node_list()
+            break
+        elif char in (curses.KEY_BACKSPACE, chr(127)):
+            filter_text = filter_text[:-1]
+        elif isinstance(char, str) and char.isprintable():
+            filter_text += char
+
+    entry_win.erase()
+
+
 def refresh_pad(window: int) -> None:
     # If in single-pane mode and this isn't the focused window, skip refreshing its (collapsed) pad
     if ui_state.single_pane_mode and window != ui_state.current_window:
@@ -1208,8 +1557,8 @@ def draw_text_field(win: curses.window, text: str, color: int) -> None:
     win.border()
 
     # Put a small hint in the border of the message entry field.
-    # We key off the "Message:" prompt to avoid affecting other bordered fields.
-    if isinstance(text, str) and text.startswith("Message:"):
+    # We key off the "Message:" prompt (after any radio and connection tags) to avoid affecting other bordered fields.
+    if isinstance(text, str) and "Message:" in text:
         hint = " Ctrl+K Help "
         h, w = win.getmaxyx()
         x = max(2, w - len(hint) - 2)
@@ -6,14 +6,19 @@ import os
 
 import contact.ui.default_config as config
 from contact.ui.colors import get_color
-from contact.ui.dialog import dialog
+from contact.ui.dialog import ProgressDialog, dialog
 from contact.ui.menus import generate_menu_from_protobuf
 from contact.ui.nav_utils import draw_arrows, move_highlight, update_help_window
 from contact.ui.user_config import json_editor
-from contact.utilities.config_io import config_export, config_import
+from contact.utilities.config_io import (
+    apply_config_plan,
+    config_export,
+    is_repeated_field,
+    load_config_file,
+    plan_config_import,
+)
 from contact.utilities.control_utils import transform_menu_path
-from contact.utilities.i18n import t
-from contact.utilities.ini_utils import parse_ini_file
+from contact.utilities.i18n import load_language_catalog, on_language_change, set_language, t
 from contact.utilities.input_handlers import (
     get_admin_key_input,
     get_fixed32_input,
@@ -52,13 +57,20 @@ translation_file = config.get_localisation_file(config.language)
 config_folder = os.path.abspath(config.node_configs_file_path)
 
 # Load translations
-field_mapping, help_text = parse_ini_file(translation_file)
+field_mapping, help_text = load_language_catalog(config.language)
 
 
-def reload_translations() -> None:
+def _bind_translations(language: str) -> None:
     global translation_file, field_mapping, help_text  # noqa: PLW0603
-    translation_file = config.get_localisation_file(config.language)
-    field_mapping, help_text = parse_ini_file(translation_file)
+    translation_file = config.get_localisation_file(language)
+    field_mapping, help_text = load_language_catalog(language)
+
+
+on_language_change(_bind_translations)
+
+
+def reload_translations() -> None:
+    set_language(config.language)
 
 
 def get_translated_header(menu_path: list[str]) -> str:
@@ -402,17 +414,55 @@ def settings_menu(stdscr: object, interface: object) -> None:  # noqa: PLR0912,
                 )
                 if filename:
                     file_path = os.path.join(config_folder, filename)
-                    overwrite = get_list_input(
-                        t(
-                            "ui.confirm.load_config_file",
-                            default="Are you sure you want to load {filename}?",
-                            filename=filename,
-                        ),
-                        None,
-                        ["Yes", "No"],
-                    )
-                    if overwrite == "Yes":
-                        config_import(interface, file_path)
+                    node = interface.getNode("^local", False)
+                    try:
+                        plan = plan_config_import(interface, node, load_config_file(file_path))
+                    except Exception as e:
+                        logging.error(f"Unable to read config file {file_path}: {e}")
+                        plan = None
+
+                    if plan is None:
+                        dialog(t("ui.dialog.invalid_input", default="Invalid Input"), filename)
+                    elif plan.is_empty:
+                        dialog(
+                            t("ui.dialog.config_no_changes_title", default="Nothing to Change"),
+                            t(
+                                "ui.dialog.config_no_changes_body",
+                                default="{filename} already matches the device.",
+                                filename=filename,
+                            ),
+                        )
+                    else:
+                        dialog(
+                            t("ui.dialog.config_changes_title", default="Changes in {filename}", filename=filename),
+                            "\n".join(str(change) for change in plan.changes),
+                        )
+                        overwrite = get_list_input(
+                            t(
+                                "ui.confirm.apply_config_changes",
+                                default="Apply {count} changes from {filename}?",
+                                count=len(plan.changes),
+                                filename=filename,
+                            ),
+                            None,
+                            ["Yes", "No"],
+                        )
+                        if overwrite == "Yes":
+                            progress = ProgressDialog(t("ui.dialog.config_loading_title", default="Loading Config"))
+                            try:
+                                failed = apply_config_plan(interface, node, plan, progress.update)
+                            finally:
+                                progress.close()
+                            if failed:
+                                dialog(
+                                    t("ui.dialog.config_load_incomplete_title", default="Config Not Fully Applied"),
+                                    t(
+                                        "ui.dialog.config_load_incomplete_body",
+                                        default="The radio did not confirm: {sections}",
+                                        sections=", ".join(failed),
+                                    ),
+                                )
+                        menu_state.need_redraw = True
                 menu_state.start_index.pop()
                 continue
 
@@ -556,7 +606,7 @@ def settings_menu(stdscr: object, interface: object) -> None:  # noqa: PLR0912,
                         new_value = new_value == "True" or new_value is True
                     menu_state.start_index.pop()
 
-                elif field.label == field.LABEL_REPEATED:  # Handle repeated field - Not currently used
+                elif is_repeated_field(field):  # Handle repeated field - Not currently used
                     new_value = get_repeated_input(current_value)
                     new_value = current_value if new_value is None else new_value.split(", ")
                     menu_state.start_index.pop()
@@ -4,6 +4,7 @@ import os
 import tempfile
 
 from contact.ui.colors import setup_colors
+from contact.utilities.log_setup import SUBSYSTEMS
 
 # Get the parent directory of the script
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -63,6 +64,10 @@ config_root = _get_config_root(parent_dir)
 json_file_path = os.path.join(config_root, "config.json")
 log_file_path = os.path.join(config_root, "client.log")
 db_file_path = os.path.join(config_root, "client.db")
+snapshot_file_path = os.path.join(config_root, "client.snapshot.json")
+control_socket_path = os.path.join(config_root, "contact.sock")
+perf_file_path = os.path.join(config_root, "perf.json")
+translations_cache_dir = os.path.join(config_root, "cache")
 node_configs_file_path = os.path.join(config_root, "node-configs/")
 localisations_dir = os.path.join(parent_dir, "localisations")
 
@@ -225,6 +230,9 @@ def initialize_config() -> dict[str, object]:
         "single_pane_mode": "False",
         "db_file_path": db_file_path,
         "log_file_path": log_file_path,
+        "log_levels": {subsystem: "INFO" for subsystem in [*SUBSYSTEMS, "app"]},
+        "log_max_bytes": "5242880",
+        "log_backup_count": "3",
         "node_configs_file_path": node_configs_file_path,
         "language": default_language,
         "message_prefix": ">>",
@@ -272,12 +280,16 @@ def assign_config_variables(loaded_config: dict[str, object]) -> None:
     global node_list_16ths, channel_list_16ths, single_pane_mode  # noqa: PLW0603
     global theme, COLOR_CONFIG, language  # noqa: PLW0603
     global node_sort, notification_sound  # noqa: PLW0603
+    global log_levels, log_max_bytes, log_backup_count  # noqa: PLW0603
 
     channel_list_16ths = loaded_config["channel_list_16ths"]
     node_list_16ths = loaded_config["node_list_16ths"]
     single_pane_mode = loaded_config["single_pane_mode"]
     db_file_path = loaded_config["db_file_path"]
     log_file_path = loaded_config["log_file_path"]
+    log_levels = loaded_config["log_levels"]
+    log_max_bytes = loaded_config["log_max_bytes"]
+    log_backup_count = loaded_config["log_backup_count"]
     node_configs_file_path = loaded_config.get("node_configs_file_path")
     language = loaded_config["language"]
     message_prefix = loaded_config["message_prefix"]
@@ -166,3 +166,37 @@ def dialog(title: str, message: str) -> None:  # noqa: PLR0912, PLR0915
             elif char == curses.KEY_NPAGE:  # Page down
                 ui_state.start_index[4] = min(max_start, start + viewport_h)
                 draw_window()
+
+
+class ProgressDialog:
+    """A non-interactive dialog showing a progress bar, redrawn on every update() call."""
+
+    def __init__(self, title: str) -> None:
+        self.title = t_text(title)
+        curses.update_lines_cols()
+        self.width = min(max(len(self.title) + 4, 40), max(10, curses.COLS - 2))
+        self.height = 5
+        y = max(0, (curses.LINES - self.height) // 2)
+        x = max(0, (curses.COLS - self.width) // 2)
+        self.win = curses.newwin(self.height, self.width, y, x)
+
+    def update(self, completed: int, total: int, label: str = "") -> None:
+        bar_width = max(1, self.width - 4)
+        filled = bar_width * completed // total if total else bar_width
+
+        self.win.erase()
+        self.win.bkgd(get_color("background"))
+        self.win.attrset(get_color("window_frame"))
+        self.win.border(0)
+        try:
+            self.win.addstr(0, 2, self.title[: self.width - 4], get_color("settings_default"))
+            self.win.addstr(1, 2, f"{completed}/{total} {label}"[:bar_width], get_color("settings_default"))
+            self.win.addstr(3, 2, "█" * filled + "░" * (bar_width - filled), get_color("settings_default"))
+        except curses.error:
+            pass
+        self.win.refresh()
+
+    def close(self) -> None:
+        self.win.erase()
+        self.win.refresh()
+        menu_state.need_redraw = True
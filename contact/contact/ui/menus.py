@@ -1,8 +1,10 @@
 import base64
 import logging
 from collections import OrderedDict
+from functools import cache
 from typing import Any
 
+from google.protobuf.descriptor import Descriptor, FieldDescriptor
 from google.protobuf.message import Message
 from meshtastic.protobuf import channel_pb2, config_pb2, module_config_pb2
 
@@ -14,6 +16,100 @@ def encode_if_bytes(value: Any) -> str:
     return value
 
 
+# Fields never shown in the settings menu, matched against FieldDescriptor.full_name
+SKIP_FIELDS = (
+    "sessionkey",
+    "ChannelSettings.channel_num",
+    "ChannelSettings.id",
+    "LoRaConfig.ignore_incoming",
+    "DeviceUIConfig.version",
+)
+
+
+# Kinds of menu entries in a skeleton
+LEAF = 0
+SUBMENU = 1
+REPEATED_MESSAGE = 2  # shown as an empty submenu
+
+
+def _entry_kind(field: FieldDescriptor) -> int:
+    if field.message_type is None:
+        return LEAF
+    repeated = field.is_repeated if hasattr(field, "is_repeated") else field.label == field.LABEL_REPEATED
+    return REPEATED_MESSAGE if repeated else SUBMENU
+
+
+@cache
+def menu_skeleton(descriptor: Descriptor) -> tuple[tuple[str, FieldDescriptor, int], ...]:
+    """
+    The (name, field, kind) entries of a message's menu, derived from its descriptor alone.
+
+    Descriptors are unique per loaded schema, so this is computed once per message type and
+    protobuf version; values are bound separately by LazyMenu.
+    """
+    return tuple(
+        (field.name, field, _entry_kind(field))
+        for field in descriptor.fields
+        if not any(skip_field in field.full_name for skip_field in SKIP_FIELDS)
+    )
+
+
+class _Unbound:
+    """Placeholder for a nested submenu whose values haven't been read yet."""
+
+    __slots__ = ("descriptor", "config")
+
+    def __init__(self, descriptor: Descriptor, config: Message | None) -> None:
+        self.descriptor = descriptor
+        self.config = config
+
+
+class LazyMenu(dict):
+    """
+    A settings submenu built from a cached skeleton.
+
+    Leaf values of this level are bound when it is created; nested submenus are bound the first
+    time they are looked up, so only the parts of the tree the user opens are ever read.
+    """
+
+    def __init__(self, descriptor: Descriptor, current_config: Message | None = None) -> None:
+        super().__init__()
+        for name, field, kind in menu_skeleton(descriptor):
+            if kind == SUBMENU:
+                nested_config = getattr(current_config, name, None) if current_config else None
+                super().__setitem__(name, _Unbound(field.message_type, nested_config))
+            elif kind == REPEATED_MESSAGE:
+                super().__setitem__(name, {})
+            else:
+                super().__setitem__(name, (field, _field_value(field, current_config)))
+
+    def __getitem__(self, key: str) -> Any:
+        value = super().__getitem__(key)
+        if isinstance(value, _Unbound):
+            value = LazyMenu(value.descriptor, value.config)
+            super().__setitem__(key, value)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def values(self) -> list[Any]:
+        return [self[key] for key in self]
+
+    def items(self) -> list[tuple[str, Any]]:
+        return [(key, self[key]) for key in self]
+
+
+def _field_value(field: FieldDescriptor, current_config: Message | None) -> Any:
+    current_value = getattr(current_config, field.name, "Not Set") if current_config else "Not Set"
+    if field.enum_type and isinstance(current_value, int):  # If the value is a number, map it to its name
+        enum_value = field.enum_type.values_by_number.get(current_value)
+        return enum_value.name if enum_value else f"Unknown ({current_value})"
+    if field.enum_type:
+        return current_value  # Non-integer values
+    return encode_if_bytes(current_value)
+
+
 def extract_fields(message_instance: Message, current_config: Message | dict[str, Any] | None = None) -> dict[str, Any]:
     if isinstance(current_config, dict):  # Handle dictionaries
         return {key: (None, encode_if_bytes(current_config.get(key, "Not Set"))) for key in current_config}
@@ -21,38 +117,7 @@ def extract_fields(message_instance: Message, current_config: Message | dict[str
     if not hasattr(message_instance, "DESCRIPTOR"):
         return {}
 
-    menu = {}
-    fields = message_instance.DESCRIPTOR.fields
-    for field in fields:
-        skip_fields = [
-            "sessionkey",
-            "ChannelSettings.channel_num",
-            "ChannelSettings.id",
-            "LoRaConfig.ignore_incoming",
-            "DeviceUIConfig.version",
-        ]
-        if any(skip_field in field.full_name for skip_field in skip_fields):
-            continue
-
-        if field.message_type:  # Nested message
-            nested_instance = getattr(message_instance, field.name)
-            nested_config = getattr(current_config, field.name, None) if current_config else None
-            menu[field.name] = extract_fields(nested_instance, nested_config)
-        elif field.enum_type:  # Handle enum fields
-            current_value = getattr(current_config, field.name, "Not Set") if current_config else "Not Set"
-            if isinstance(current_value, int):  # If the value is a number, map it to its name
-                enum_value = field.enum_type.values_by_number.get(current_value)
-                if enum_value:  # Check if the enum value exists
-                    current_value_name = f"{enum_value.name}"
-                else:
-                    current_value_name = f"Unknown ({current_value})"
-                menu[field.name] = (field, current_value_name)
-            else:
-                menu[field.name] = (field, current_value)  # Non-integer values
-        else:  # Handle other field types
-            current_value = getattr(current_config, field.name, "Not Set") if current_config else "Not Set"
-            menu[field.name] = (field, encode_if_bytes(current_value))
-    return menu
+    return LazyMenu(message_instance.DESCRIPTOR, current_config)
 
 
 def generate_menu_from_protobuf(interface: object) -> dict[str, Any]:
@@ -80,19 +145,17 @@ def generate_menu_from_protobuf(interface: object) -> dict[str, Any]:
         menu_structure["Main Menu"]["User Settings"] = "Node Info not available"
 
     # Add Channels
-    channel = channel_pb2.ChannelSettings()
     menu_structure["Main Menu"]["Channels"] = {}
     if interface:
         for i in range(8):
             current_channel = interface.localNode.getChannelByChannelIndex(i)
             if current_channel:
-                channel_config = extract_fields(channel, current_channel.settings)
+                channel_config = LazyMenu(channel_pb2.ChannelSettings.DESCRIPTOR, current_channel.settings)
                 menu_structure["Main Menu"]["Channels"][f"Channel {i + 1}"] = channel_config
 
     # Add Radio Settings
-    radio = config_pb2.Config()
     current_radio_config = interface.localNode.localConfig if interface else None
-    menu_structure["Main Menu"]["Radio Settings"] = extract_fields(radio, current_radio_config)
+    menu_structure["Main Menu"]["Radio Settings"] = LazyMenu(config_pb2.Config.DESCRIPTOR, current_radio_config)
 
     # Add Lat/Lon/Alt
     position_data = {
@@ -114,9 +177,10 @@ def generate_menu_from_protobuf(interface: object) -> dict[str, Any]:
     menu_structure["Main Menu"]["Radio Settings"]["position"] = ordered_position_menu
 
     # Add Module Settings
-    module = module_config_pb2.ModuleConfig()
     current_module_config = interface.localNode.moduleConfig if interface else None
-    menu_structure["Main Menu"]["Module Settings"] = extract_fields(module, current_module_config)
+    menu_structure["Main Menu"]["Module Settings"] = LazyMenu(
+        module_config_pb2.ModuleConfig.DESCRIPTOR, current_module_config
+    )
 
     # Add App Settings
     menu_structure["Main Menu"]["App Settings"] = {"Open": "app_settings"}
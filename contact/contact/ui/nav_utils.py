@@ -1,12 +1,11 @@
 import curses
-import re
 from typing import Any
-from unicodedata import east_asian_width
 
 from contact.ui.colors import get_color
 from contact.utilities.control_utils import transform_menu_path
 from contact.utilities.i18n import t
 from contact.utilities.singleton import interface_state, ui_state
+from contact.utilities.text_wrap import text_width, wrap_help_text, wrap_text  # noqa: F401 - re-exported
 
 
 def get_node_color(node_index: int, reverse: bool = False):
@@ -241,80 +240,7 @@ def get_wrapped_help_text(
 
     wrap_width = max(width - 6, 10)  # Ensure a valid wrapping width
 
-    # Color replacements
-    color_mappings = {
-        r"\[warning\](.*?)\[/warning\]": ("settings_warning", True, False),  # Red for warnings
-        r"\[note\](.*?)\[/note\]": ("settings_note", True, False),  # Green for notes
-        r"\[underline\](.*?)\[/underline\]": ("settings_default", False, True),  # Underline
-        r"\\033\[31m(.*?)\\033\[0m": ("settings_warning", True, False),  # Red text
-        r"\\033\[32m(.*?)\\033\[0m": ("settings_note", True, False),  # Green text
-        r"\\033\[4m(.*?)\\033\[0m": ("settings_default", False, True),  # Underline
-    }
-
-    def extract_ansi_segments(text: str) -> list[Segment]:
-        """Extracts and replaces ANSI color codes, ensuring spaces are preserved."""
-        matches = []
-        last_pos = 0
-        pattern_matches = []
-
-        # Find all matches and store their positions
-        for pattern, (color, bold, underline) in color_mappings.items():
-            for match in re.finditer(pattern, text):
-                pattern_matches.append((match.start(), match.end(), match.group(1), color, bold, underline))
-
-        # Sort matches by start position to process sequentially
-        pattern_matches.sort(key=lambda x: x[0])
-
-        for start, end, content, color, bold, underline in pattern_matches:
-            # Preserve non-matching text including spaces
-            if last_pos < start:
-                segment = text[last_pos:start]
-                matches.append((segment, "settings_default", False, False))
-
-            # Append the colored segment
-            matches.append((content, color, bold, underline))
-            last_pos = end
-
-        # Preserve any trailing text
-        if last_pos < len(text):
-            matches.append((text[last_pos:], "settings_default", False, False))
-
-        return matches
-
-    def wrap_ansi_text(segments: list[Segment], wrap_width: int) -> list[WrappedLine]:
-        """Wraps text while preserving ANSI formatting and spaces."""
-        wrapped_lines = []
-        line_buffer = []
-        line_length = 0
-
-        for text, color, bold, underline in segments:
-            words = re.findall(r"\S+|\s+", text)  # Capture words and spaces separately
-
-            for word in words:
-                word_length = len(word)
-
-                if line_length + word_length > wrap_width and word.strip():
-                    # If the word (ignoring spaces) exceeds width, wrap the line
-                    wrapped_lines.append(line_buffer)
-                    line_buffer = []
-                    line_length = 0
-
-                line_buffer.append((word, color, bold, underline))
-                line_length += word_length
-
-        if line_buffer:
-            wrapped_lines.append(line_buffer)
-
-        return wrapped_lines
-
-    raw_lines = help_content.split("\\n")  # Preserve new lines
-    wrapped_help = []
-
-    for raw_line in raw_lines:
-        color_segments = extract_ansi_segments(raw_line)
-        wrapped_segments = wrap_ansi_text(color_segments, wrap_width)
-        wrapped_help.extend(wrapped_segments)
-        pass
+    wrapped_help = [list(line) for line in wrap_help_text(help_content, wrap_width)]
 
     # Trim and add ellipsis if needed
     if len(wrapped_help) > max_lines:
@@ -324,50 +250,6 @@ def get_wrapped_help_text(
     return wrapped_help
 
 
-def text_width(text: str) -> int:
-    return sum(2 if east_asian_width(c) in "FW" else 1 for c in text)
-
-
-def wrap_text(text: str, wrap_width: int) -> list[str]:
-    """Wraps text while preserving spaces and breaking long words."""
-
-    whitespace = "\t\n\x0b\x0c\r "
-    whitespace_trans = dict.fromkeys(map(ord, whitespace), ord(" "))
-    text = text.translate(whitespace_trans)
-
-    words = re.findall(r"\S+|\s+", text)  # Capture words and spaces separately
-    wrapped_lines = []
-    line_buffer = ""
-    line_length = 0
-    margin = 2  # Left and right margin
-    wrap_width -= margin
-
-    for word in words:
-        word_length = text_width(word)
-
-        if word_length > wrap_width:  # Break long words
-            if line_buffer:
-                wrapped_lines.append(line_buffer.strip())
-                line_buffer = ""
-                line_length = 0
-            for i in range(0, word_length, wrap_width):
-                wrapped_lines.append(word[i : i + wrap_width])
-            continue
-
-        if line_length + word_length > wrap_width and word.strip():
-            wrapped_lines.append(line_buffer.strip())
-            line_buffer = ""
-            line_length = 0
-
-        line_buffer += word
-        line_length += word_length
-
-    if line_buffer:
-        wrapped_lines.append(line_buffer.strip())
-
-    return wrapped_lines
-
-
 def move_main_highlight(  # noqa: PLR0913
     old_idx: int, new_idx, options: list[str], menu_win: curses.window, menu_pad: curses.window, ui_state: object
 ) -> None:
@@ -0,0 +1,46 @@
+import queue
+import threading
+from collections.abc import Callable
+from typing import Any
+
+# Parts of the chat screen another thread can mark for repainting.
+CHANNELS = "channels"
+MESSAGES = "messages"
+NEW_MESSAGE = "new_message"  # like MESSAGES, but scrolled to the newest message
+NODES = "nodes"
+PACKET_LOG = "packet_log"
+STATUS = "status"  # the input line, which shows the radio and its connection state
+
+
+class UIEvents:
+    """
+    Work for the UI thread, handed over by the rx, tx and connection threads.
+
+    Only the UI thread touches curses. Other threads mark parts of the screen dirty or post a
+    callable; the main loop picks both up between keypresses and repaints each dirty part once,
+    however many packets asked for it.
+    """
+
+    def __init__(self) -> None:
+        self._calls: queue.SimpleQueue[tuple[Callable[..., Any], tuple[Any, ...]]] = queue.SimpleQueue()
+        self._dirty: set[str] = set()
+        self._lock = threading.Lock()
+
+    def request_redraw(self, *parts: str) -> None:
+        with self._lock:
+            self._dirty.update(parts)
+
+    def post(self, func: Callable[..., Any], *args: Any) -> None:
+        self._calls.put((func, args))
+
+    def take(self) -> tuple[list[tuple[Callable[..., Any], tuple[Any, ...]]], set[str]]:
+        """Everything posted so far, in order, and the parts to repaint."""
+        calls = []
+        while True:
+            try:
+                calls.append(self._calls.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        return calls, dirty
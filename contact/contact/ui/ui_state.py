@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from typing import Any
 
+from contact.utilities.message_window import MessageWindows
+
 
 @dataclass
 class MenuState:
@@ -16,11 +18,13 @@ class MenuState:
 @dataclass
 class ChatUIState:
     display_log: bool = False
+    display_perf: bool = False
     channel_list: list[str] = field(default_factory=list)
-    all_messages: dict[str, list[str]] = field(default_factory=dict)
+    all_messages: dict[str, list[str]] = field(default_factory=MessageWindows)  # bounded, see message_window.py
     notifications: list[str] = field(default_factory=list)
     packet_buffer: list[str] = field(default_factory=list)
     node_list: list[str] = field(default_factory=list)
+    node_filter: str = ""  # the node pane's filter and sort, see utilities/node_query.py
     selected_channel: int = 0
     selected_message: int = 0
     selected_node: int = 0
@@ -39,6 +43,8 @@ class ChatUIState:
 class InterfaceState:
     interface: Any = None
     my_node_num: int = 0
+    connected: bool = False
+    reconnecting: bool = False  # the link dropped and the supervisor is bringing it back
 
 
 @dataclass
@@ -6,8 +6,7 @@ from typing import Any
 import contact.ui.default_config as config
 from contact.ui.colors import COLOR_MAP, get_color, setup_colors
 from contact.ui.nav_utils import draw_arrows, move_highlight, update_help_window
-from contact.utilities.i18n import t
-from contact.utilities.ini_utils import parse_ini_file
+from contact.utilities.i18n import load_language_catalog, on_language_change, set_language, t
 from contact.utilities.input_handlers import get_list_input
 from contact.utilities.singleton import menu_state
 
@@ -15,16 +14,22 @@ MAX_MENU_WIDTH = 80  # desired max; will shrink on small terminals
 max_help_lines = 6
 save_option = "Save Changes"
 translation_file = config.get_localisation_file(config.language)
-field_mapping, help_text = parse_ini_file(translation_file)
+field_mapping, help_text = load_language_catalog(config.language)
 translation_language = config.language
 
 
-def reload_translations(language: str | None = None) -> None:
+def _bind_translations(language: str) -> None:
     global translation_file, field_mapping, help_text, translation_language  # noqa: PLW0603
-    target_language = language or config.language
-    translation_file = config.get_localisation_file(target_language)
-    field_mapping, help_text = parse_ini_file(translation_file)
-    translation_language = target_language
+    translation_file = config.get_localisation_file(language)
+    field_mapping, help_text = load_language_catalog(language)
+    translation_language = language
+
+
+on_language_change(_bind_translations)
+
+
+def reload_translations(language: str | None = None) -> None:
+    set_language(language or config.language)
 
 
 def get_app_settings_key(menu_path: list[str], selected_key: str) -> str:
@@ -178,6 +183,10 @@ def edit_value(key: str, display_label: str, current_value: str) -> str:  # noqa
         sound_options = ["True", "False"]
         return get_list_input(display_label, current_value, sound_options)
 
+    elif len(menu_state.menu_path) >= 2 and menu_state.menu_path[-2] == "log_levels":  # noqa: PLR2004
+        level_options = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+        return get_list_input(display_label, current_value, level_options)
+
     # Standard Input Mode (Scrollable)
     edit_win.addstr(7, 2, t("ui.label.new_value", default="New Value: "), get_color("settings_default"))  # noqa: PLR2004
     curses.curs_set(1)
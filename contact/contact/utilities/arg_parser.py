@@ -32,8 +32,94 @@ def setup_parser() -> ArgumentParser:
     conn.add_argument(
         "--ble", "-b", help="The BLE device MAC address or name to connect to.", nargs="?", default=None, const="any"
     )
+    conn.add_argument(
+        "--interfaces",
+        nargs="+",
+        metavar="SPEC",
+        help="Connect to several radios at once, e.g. serial:/dev/ttyUSB0 tcp:host[:port] ble:name (or replay:FILE). "
+        "F7 switches between them and F8 shows all their channels together.",
+    )
     parser.add_argument(
         "--settings", "--set", "--control", "-c", help="Launch directly into the settings", action="store_true"
     )
+    parser.add_argument(
+        "--profile-startup",
+        help="Report how long each startup phase took (imports, connect, node DB, messages, first paint).",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--async",
+        dest="async_core",
+        action="store_true",
+        help="Handle packets, timers and the chat UI on one asyncio event loop, with database writes on a "
+        "worker thread (experimental; not used with --daemon).",
+    )
+    parser.add_argument(
+        "--perf",
+        nargs="?",
+        const="",
+        metavar="FILE",
+        help="Time the receive, send, database and drawing paths (F6 shows them live) and write the "
+        "figures as JSON on exit (default perf.json next to the log).",
+    )
+
+    capture = parser.add_argument_group("Capture", "Record received packets, or play a recording instead of a radio.")
+    capture.add_argument("--record", metavar="FILE", help="Append every received packet to a capture file.")
+    capture.add_argument("--replay", metavar="FILE", help="Use a capture file as the radio.")
+    capture.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="Playback speed for --replay: 1 keeps the recorded timing, 0 plays as fast as possible (default 1).",
+    )
+
+    daemon = parser.add_argument_group(
+        "Daemon", "Run without the UI and serve messages, nodes and sending over a local control socket."
+    )
+    daemon_mode = daemon.add_mutually_exclusive_group()
+    daemon_mode.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run headless: keep the radio, database and message history going and serve them on the socket.",
+    )
+    daemon_mode.add_argument(
+        "--attach", action="store_true", help="Start the UI as a client of a running --daemon instead of a radio."
+    )
+    daemon.add_argument(
+        "--socket", metavar="PATH", help="Control socket path (default: contact.sock in the config dir)."
+    )
+
+    tracks = parser.add_argument_group("Tracks", "Export the node positions stored in client.db, without the UI.")
+    tracks.add_argument(
+        "--export-tracks", metavar="FILE", help="Write every node's track to FILE: GPX for .gpx, GeoJSON otherwise."
+    )
+    tracks.add_argument("--export-nodes", nargs="+", metavar="NODE", help="Only these nodes, e.g. !a1b2c3d4.")
+    tracks.add_argument("--export-since", type=float, metavar="HOURS", help="Only fixes from the last HOURS hours.")
+
+    fleet = parser.add_argument_group(
+        "Fleet", "Apply a config file to many nodes without the UI, then print a per-node report."
+    )
+    fleet.add_argument("--fleet-config", help="YAML config file (as exported from the settings menu) to apply.")
+    fleet.add_argument(
+        "--fleet-nodes",
+        nargs="+",
+        metavar="NODE",
+        help="Remote nodes to configure over the mesh via the connected radio, e.g. !a1b2c3d4.",
+    )
+    fleet.add_argument(
+        "--fleet-interfaces",
+        nargs="+",
+        metavar="SPEC",
+        help="Separately attached radios to configure: serial:/dev/ttyUSB0, tcp:host[:port] or ble:name.",
+    )
+    fleet.add_argument("--fleet-workers", type=int, default=4, help="Nodes configured at once (default 4).")
+    fleet.add_argument(
+        "--fleet-mesh-concurrency",
+        type=int,
+        default=2,
+        help="Remote nodes configured at once over the mesh; keep low to spare airtime (default 2).",
+    )
+    fleet.add_argument("--fleet-retries", type=int, default=2, help="Retries per node after a failure (default 2).")
+    fleet.add_argument("--fleet-report", metavar="FILE", help="Also write the per-node results as JSON.")
 
     return parser
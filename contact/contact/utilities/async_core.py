@@ -0,0 +1,126 @@
+import asyncio
+import functools
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from contact.utilities.singleton import db_owner, interface_state, ui_events
+
+
+class AsyncCore:
+    """
+    The optional asyncio core (--async).
+
+    One event loop, run by the UI thread, handles keypresses, received packets, ACK and traceroute
+    responses, timers and repaints. meshtastic's reader threads only hand work over to the loop,
+    database writes go to a single worker thread (so they stay in order) and sounds play on the
+    loop's default executor. UI state is then only changed from the loop thread.
+
+    Not started, every helper falls back to the threaded behaviour: calls run where they are made.
+    """
+
+    def __init__(self) -> None:
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.db_executor: ThreadPoolExecutor | None = None
+        self.on_repaint: Callable[[], None] | None = None
+        self._listeners: dict[Callable[..., None], Callable[..., None]] = {}  # pubsub only holds weak references
+        self._repaint_scheduled = False
+
+    @property
+    def running(self) -> bool:
+        return self.loop is not None
+
+    def start(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="contact-db")
+        logging.info("Asyncio core started")
+
+    def stop(self) -> None:
+        """Finish queued database writes and close the loop."""
+        if self.loop is None:
+            return
+        self.db_executor.shutdown(wait=True)
+        self.loop.run_until_complete(self.loop.shutdown_default_executor())
+        self.loop.close()
+        self.loop = None
+        self.db_executor = None
+        self._listeners.clear()
+
+    def threadsafe(self, func: Callable[..., Any]) -> Callable[..., None]:
+        """Wrap a callback that other threads call so it runs on the loop, followed by a repaint."""
+        if not self.running:
+            return func
+
+        @functools.wraps(func)
+        def handoff(*args: Any) -> None:
+            self.loop.call_soon_threadsafe(self._run, func, args)
+
+        return handoff
+
+    def receive_listener(self, handler: Callable[[dict[str, Any], Any], None]) -> Callable[[dict[str, Any], Any], None]:
+        """A "meshtastic.receive" listener that hands packets to handler on the loop; one per handler."""
+        if not self.running:
+            return handler
+        if handler in self._listeners:
+            return self._listeners[handler]
+
+        def listener(packet: dict[str, Any], interface: Any) -> None:
+            self.loop.call_soon_threadsafe(self._run, handler, (packet, interface))
+
+        self._listeners[handler] = listener
+        return listener
+
+    def run_db(self, func: Callable[..., Any], *args: Any, redraw: tuple[str, ...] = (), **kwargs: Any) -> None:
+        """
+        Run a database write off the loop thread, in submission order; inline when not running.
+
+        redraw names the parts of the screen that show what was written, repainted once it is stored.
+        The write goes to the tables of the node that is current now, whichever radio is active by then.
+        """
+        if not self.running:
+            func(*args, **kwargs)
+            return
+        future = self.db_executor.submit(_run_as_owner, db_owner.get(interface_state.my_node_num), func, args, kwargs)
+        future.add_done_callback(functools.partial(self._db_done, redraw))
+
+    def run_blocking(self, func: Callable[..., Any], *args: Any) -> None:
+        """Run a slow call (e.g. playing a sound) on the loop's default executor."""
+        self.loop.run_in_executor(None, func, *args)
+
+    def schedule_repaint(self) -> None:
+        """Repaint once after everything already queued on the loop has run."""
+        if not self._repaint_scheduled and self.on_repaint is not None:
+            self._repaint_scheduled = True
+            self.loop.call_soon(self._repaint)
+
+    def _run(self, func: Callable[..., Any], args: tuple[Any, ...]) -> None:
+        try:
+            func(*args)
+        except Exception:
+            logging.exception("Error in %s", getattr(func, "__name__", func))
+        self.schedule_repaint()
+
+    def _repaint(self) -> None:
+        self._repaint_scheduled = False
+        self.on_repaint()
+
+    def _db_done(self, redraw: tuple[str, ...], future: Future) -> None:
+        if future.exception() is not None:
+            logging.error("Database write failed: %s", future.exception())
+        elif redraw:
+            ui_events.request_redraw(*redraw)
+            if self.loop is not None and not self.loop.is_closed():
+                self.loop.call_soon_threadsafe(self.schedule_repaint)
+
+
+def _run_as_owner(owner: int, func: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+    token = db_owner.set(owner)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        db_owner.reset(token)
+
+
+async_core = AsyncCore()
@@ -0,0 +1,184 @@
+import itertools
+import json
+import logging
+import threading
+import time
+from typing import Any
+
+from google.protobuf.json_format import MessageToDict
+from meshtastic.protobuf import mesh_pb2
+from pubsub import pub
+
+from contact.utilities.control_socket import decode_value, encode_value
+from contact.utilities.offline_interface import OfflineInterface
+
+CAPTURE_VERSION = 1
+
+# A capture is JSON lines, appended to as packets arrive:
+#   {"capture": 1, "started_at": ..., "my_node_num": ..., "channels": [...], "lora": {...}, "nodes": {...}}
+#   {"t": 0.512, "packet": {...}}   # seconds since the header; payload bytes as {"$bytes": base64}
+# Recording into an existing file adds another header; replay plays the sessions back to back.
+
+
+def _capture_header(interface: Any) -> dict[str, Any]:
+    local_node = interface.localNode
+    return {
+        "capture": CAPTURE_VERSION,
+        "started_at": time.time(),
+        "my_node_num": local_node.nodeNum,
+        "channels": [MessageToDict(channel) for channel in local_node.channels or []],
+        "lora": MessageToDict(local_node.localConfig.lora),
+        "nodes": encode_value(dict(interface.nodes or {})),
+    }
+
+
+class CaptureRecorder:
+    """Appends every packet published on "meshtastic.receive" to a capture file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._started = 0.0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        self._file = open(self.path, "a", encoding="utf-8")  # noqa: SIM115 - closed in stop()
+        pub.subscribe(self.on_packet, "meshtastic.receive")
+        logging.info("Recording packets to %s", self.path)
+
+    def stop(self) -> None:
+        pub.unsubscribe(self.on_packet, "meshtastic.receive")
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+        logging.info("Recorded %s packets to %s", self.count, self.path)
+
+    def on_packet(self, packet: dict[str, Any], interface: Any) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                if not self._started:
+                    # Written with the first packet, once the interface has its node DB and channels.
+                    self._write(_capture_header(interface))
+                    self._started = time.monotonic()
+                self._write({"t": round(time.monotonic() - self._started, 3), "packet": encode_value(packet)})
+                self.count += 1
+            except Exception as e:
+                logging.error("Unable to record packet: %s", e)
+
+    def _write(self, record: dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+
+def load_capture(path: str) -> tuple[dict[str, Any], list[tuple[float, dict[str, Any]]]]:
+    """Return the first session's header and every packet with its time offset from the start of the capture."""
+    header: dict[str, Any] | None = None
+    packets: list[tuple[float, dict[str, Any]]] = []
+    session_offset = 0.0  # later sessions start where the previous one ended
+
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logging.warning("Skipping unreadable line %s in capture %s", line_number, path)
+                continue
+            if "capture" in record:
+                if record["capture"] != CAPTURE_VERSION:
+                    raise ValueError(f"Unsupported capture version {record['capture']} in {path}")
+                if header is None:
+                    header = record
+                session_offset = packets[-1][0] if packets else 0.0
+            elif header is not None:
+                packets.append((session_offset + record["t"], decode_value(record["packet"])))
+
+    if header is None:
+        raise ValueError(f"{path} is not a packet capture")
+    return header, packets
+
+
+class ReplayInterface(OfflineInterface):
+    """
+    Plays a capture back through "meshtastic.receive" as if it came from a radio.
+
+    speed 1.0 keeps the recorded timing, 2.0 plays twice as fast and 0 plays as fast as possible.
+    Transmissions are accepted and kept in `sent` instead of going anywhere.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0) -> None:
+        from contact.utilities.snapshot import snapshot_node  # noqa: PLC0415
+
+        header, self.packets = load_capture(path)
+        super().__init__(header["my_node_num"], decode_value(header["nodes"]), snapshot_node(header))
+        self.speed = speed
+        self.sent: list[dict[str, Any]] = []
+        self.finished = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._ids = itertools.count(1)
+
+    def start_playback(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.play, name="replay", daemon=True)
+            self._thread.start()
+
+    def play(self) -> int:
+        """Publish every packet in order, waiting between them according to speed. Returns the count played."""
+        started = time.monotonic()
+        played = 0
+        for offset, packet in self.packets:
+            if self.speed > 0:
+                delay = offset / self.speed - (time.monotonic() - started)
+                if delay > 0 and self._stopping.wait(delay):
+                    break
+            elif self._stopping.is_set():
+                break
+            self._update_node(packet)
+            pub.sendMessage("meshtastic.receive", packet=packet, interface=self)
+            played += 1
+        self.finished.set()
+        return played
+
+    def _update_node(self, packet: dict[str, Any]) -> None:
+        """Keep the node DB current the way MeshInterface does for the fields the UI shows."""
+        node_num = packet.get("from")
+        if node_num is None:
+            return
+        node = self.nodesByNum.get(node_num)
+        if node is None:
+            node = {"num": node_num, "user": {"id": f"!{node_num:08x}"}}
+            self.nodesByNum[node_num] = node
+            self.nodes[f"!{node_num:08x}"] = node
+
+        if "rxTime" in packet:
+            node["lastHeard"] = packet["rxTime"]
+        if "rxSnr" in packet:
+            node["snr"] = packet["rxSnr"]
+        if "hopStart" in packet and "hopLimit" in packet:
+            node["hopsAway"] = packet["hopStart"] - packet["hopLimit"]
+
+        decoded = packet.get("decoded", {})
+        if "user" in decoded:
+            node["user"] = decoded["user"]
+        if "position" in decoded:
+            node["position"] = decoded["position"]
+        if "deviceMetrics" in decoded.get("telemetry", {}):
+            node["deviceMetrics"] = decoded["telemetry"]["deviceMetrics"]
+
+    def sendText(self, text: str, *args: Any, **kwargs: Any) -> mesh_pb2.MeshPacket:  # noqa: N802
+        return self.sendData(text.encode("utf-8"), *args, **kwargs)
+
+    def sendData(self, data: Any, *args: Any, **kwargs: Any) -> mesh_pb2.MeshPacket:  # noqa: N802
+        packet = mesh_pb2.MeshPacket()
+        packet.id = next(self._ids)
+        self.sent.append({"id": packet.id, "data": data, "args": args, **kwargs})
+        return packet
+
+    def close(self) -> None:
+        self._stopping.set()
@@ -1,11 +1,18 @@
+import base64
 import json
 import logging
-import time
+import threading
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
 
 import yaml
 from google.protobuf.json_format import MessageToDict
 from meshtastic import mt_config
+from meshtastic.protobuf import admin_pb2, localonly_pb2
 from meshtastic.util import camel_to_snake, fromStr, snake_to_camel
+from pubsub import pub
 
 # defs are from meshtastic/python/main
 
@@ -23,6 +30,13 @@ def traverse_config(config_root, config, interface_config) -> bool:
     return True
 
 
+def is_repeated_field(descriptor) -> bool:
+    """FieldDescriptor.label is gone in protobuf 7; is_repeated replaces it."""
+    if hasattr(descriptor, "is_repeated"):
+        return descriptor.is_repeated
+    return descriptor.label == descriptor.LABEL_REPEATED
+
+
 def split_compound_name(comp_name: str) -> list[str]:
     """Split compound (dot separated) preference name into parts"""
     name: list[str] = comp_name.split(".")
@@ -90,7 +104,7 @@ def set_pref(config, comp_name, raw_val) -> bool:  # noqa: PLR0915, PLR0912
             return False
 
     # repeating fields need to be handled with append, not setattr
-    if pref.label != pref.LABEL_REPEATED:
+    if not is_repeated_field(pref):
         try:
             if config_type.message_type is not None:
                 config_values = getattr(config_part, config_type.name)
@@ -124,76 +138,325 @@ def set_pref(config, comp_name, raw_val) -> bool:  # noqa: PLR0915, PLR0912
     return True
 
 
-def config_import(interface, filename):  # noqa: PLR0915, PLR0912
+ADMIN_ACK_TIMEOUT = 10.0  # seconds to wait for the radio to ACK a single admin write
+ADMIN_WRITE_WINDOW = 4  # admin writes allowed in flight before waiting on the oldest ACK
+
+ProgressCallback = Callable[[int, int, str], None]  # (completed, total, label)
+
+
+class AdminWriter:
+    """
+    Writes a batch of settings to one node inside a single settings transaction.
+
+    Each write's routing ACK is awaited (up to ADMIN_ACK_TIMEOUT) instead of sleeping a fixed
+    amount, with at most ADMIN_WRITE_WINDOW writes outstanding. Writes whose packet the
+    meshtastic API doesn't hand back (setURL) are not tracked individually; the radio handles
+    admin messages in order, so the next tracked ACK, at the latest the commit, covers them.
+    """
+
+    def __init__(
+        self,
+        interface,
+        node,
+        progress: ProgressCallback | None = None,
+        timeout: float = ADMIN_ACK_TIMEOUT,
+        window: int = ADMIN_WRITE_WINDOW,
+    ) -> None:
+        self.interface = interface
+        self.node = node
+        self.progress = progress
+        self.timeout = timeout
+        self.window = max(1, window)
+        self.steps: list[tuple[str, Callable[[], Any]]] = []
+        self._acks: dict[int, str] = {}
+        self._condition = threading.Condition()
+
+    def add(self, label: str, send: Callable[[], Any]) -> None:
+        """Queue a write. `send` transmits it and returns the sent packet, if the API provides one."""
+        self.steps.append((label, send))
+
+    def add_section(self, section: str) -> None:
+        """Queue a write of one localConfig/moduleConfig section as it currently stands on the node."""
+        self.add(section, lambda: self.node._sendAdmin(build_section_write(self.node, section)))
+
+    def run(self) -> list[str]:
+        """Send everything queued and wait for the radio. Returns the labels of writes that failed."""
+        failed: list[str] = []
+        total = len(self.steps) + 2  # begin + steps + commit
+        completed = 0
+        pending: deque[tuple[str, Any]] = deque()
+
+        def settle(label: str, packet: Any) -> None:
+            nonlocal completed
+            if not self._wait_for_ack(label, packet):
+                failed.append(label)
+            completed += 1
+            self._report(completed, total, label)
+
+        pub.subscribe(self._on_routing, "meshtastic.receive.routing")
+        try:
+            settle("begin transaction", self.node.beginSettingsTransaction())
+
+            for label, send in self.steps:
+                try:
+                    pending.append((label, send()))
+                except (Exception, SystemExit) as e:  # setURL and friends exit on bad input; still commit
+                    logging.error(f"Failed to send {label}: {e}")
+                    failed.append(label)
+                    completed += 1
+                    self._report(completed, total, label)
+                    continue
+                while len(pending) >= self.window:
+                    settle(*pending.popleft())
+
+            while pending:
+                settle(*pending.popleft())
+
+            settle("commit transaction", self.node.commitSettingsTransaction())
+        finally:
+            pub.unsubscribe(self._on_routing, "meshtastic.receive.routing")
+
+        if failed:
+            logging.warning(f"Config writes not confirmed by the radio: {', '.join(failed)}")
+        return failed
+
+    def _report(self, completed: int, total: int, label: str) -> None:
+        if self.progress:
+            self.progress(completed, total, label)
+
+    def _on_routing(self, packet, interface) -> None:
+        if interface is not self.interface:
+            return
+        decoded = packet.get("decoded", {})
+        request_id = decoded.get("requestId")
+        if request_id is None:
+            return
+        # errorReason is left out of the dict when it is NONE
+        with self._condition:
+            self._acks[request_id] = decoded.get("routing", {}).get("errorReason", "NONE")
+            self._condition.notify_all()
+
+    def _wait_for_ack(self, label: str, packet: Any) -> bool:
+        if packet is None:
+            return True
+
+        with self._condition:
+            self._condition.wait_for(lambda: packet.id in self._acks, self.timeout)
+            reason = self._acks.pop(packet.id, None)
+
+        if reason is None:
+            logging.warning(f"No ACK for {label} after {self.timeout:.0f}s")
+            return False
+        if reason != "NONE":
+            logging.error(f"Radio rejected {label}: {reason}")
+            return False
+        return True
+
+
+def build_section_write(node, section: str) -> admin_pb2.AdminMessage:
+    """Build the set_config/set_module_config admin message for a single config section."""
+    message = admin_pb2.AdminMessage()
+    if section in node.localConfig.DESCRIPTOR.fields_by_name:
+        getattr(message.set_config, section).CopyFrom(getattr(node.localConfig, section))
+    elif section in node.moduleConfig.DESCRIPTOR.fields_by_name:
+        getattr(message.set_module_config, section).CopyFrom(getattr(node.moduleConfig, section))
+    else:
+        raise ValueError(f"Unknown config section: {section}")
+    return message
+
+
+@dataclass
+class ConfigChange:
+    """One field that differs between a config file and the node."""
+
+    path: str
+    old: Any
+    new: Any
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.old} -> {self.new}"
+
+
+@dataclass
+class ConfigImportPlan:
+    """What a config file would change on a node, down to the field."""
+
+    owner: str | None = None
+    owner_short: str | None = None
+    channel_url: str | None = None
+    location: tuple[float, float, int] | None = None
+    local_config: localonly_pb2.LocalConfig = field(default_factory=localonly_pb2.LocalConfig)
+    module_config: localonly_pb2.LocalModuleConfig = field(default_factory=localonly_pb2.LocalModuleConfig)
+    config_sections: list[str] = field(default_factory=list)
+    module_sections: list[str] = field(default_factory=list)
+    changes: list[ConfigChange] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)  # In the file but not comparable with the node, so not written
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.changes
+
+
+def _flatten_message(message, prefix: str) -> dict[str, Any]:
+    """Map every leaf field of a protobuf message to a printable value, keyed by dotted path."""
+    values: dict[str, Any] = {}
+    for descriptor in message.DESCRIPTOR.fields:
+        value = getattr(message, descriptor.name)
+        path = f"{prefix}.{descriptor.name}"
+        if is_repeated_field(descriptor):
+            values[path] = [_printable(descriptor, v) for v in value]
+        elif descriptor.message_type is not None:
+            values.update(_flatten_message(value, path))
+        else:
+            values[path] = _printable(descriptor, value)
+    return values
+
+
+def _printable(descriptor, value) -> Any:
+    if descriptor.enum_type is not None:
+        enum_value = descriptor.enum_type.values_by_number.get(value)
+        return enum_value.name if enum_value else value
+    if isinstance(value, bytes):
+        return "base64:" + base64.b64encode(value).decode("ascii")
+    if hasattr(value, "DESCRIPTOR"):
+        return MessageToDict(value)
+    return value
+
+
+def _diff_section(prefix: str, current, proposed) -> list[ConfigChange]:
+    old_values = _flatten_message(current, prefix)
+    new_values = _flatten_message(proposed, prefix)
+    return [ConfigChange(path, old_values[path], new) for path, new in new_values.items() if old_values[path] != new]
+
+
+def _node_user(interface, node) -> dict[str, Any]:
+    return (interface.nodesByNum or {}).get(node.nodeNum, {}).get("user", {})
+
+
+def _node_position(interface, node) -> dict[str, Any]:
+    return (interface.nodesByNum or {}).get(node.nodeNum, {}).get("position", {})
+
+
+def plan_config_import(interface, node, configuration: dict[str, Any]) -> ConfigImportPlan:  # noqa: PLR0912
+    """Diff a parsed config file against a node's current settings without touching the node."""
+    plan = ConfigImportPlan()
+    user = _node_user(interface, node)
+
+    owner = configuration.get("owner")
+    if owner is not None and owner != user.get("longName"):
+        plan.owner = owner
+        plan.changes.append(ConfigChange("owner", user.get("longName"), owner))
+
+    owner_short = configuration.get("owner_short", configuration.get("ownerShort"))
+    if owner_short is not None and owner_short != user.get("shortName"):
+        plan.owner_short = owner_short
+        plan.changes.append(ConfigChange("owner_short", user.get("shortName"), owner_short))
+
+    channel_url = configuration.get("channel_url", configuration.get("channelUrl"))
+    if channel_url is not None:
+        if not node.channels:
+            # A remote node's channels are only known if they were requested. Rewriting every channel
+            # blind would go against writing only what differs, so the URL is left alone.
+            logging.warning("Channels of node %s are unknown; not writing the channel URL", node.nodeNum)
+            plan.skipped.append("channel_url")
+        elif channel_url != node.getURL():
+            plan.channel_url = channel_url
+            plan.changes.append(ConfigChange("channel_url", node.getURL(), channel_url))
+
+    if "location" in configuration:
+        location = configuration["location"] or {}
+        lat = float(location.get("lat") or 0)
+        lon = float(location.get("lon") or 0)
+        alt = int(location.get("alt") or 0)
+        position = _node_position(interface, node)
+        current = (
+            round(float(position.get("latitude") or 0), 7),
+            round(float(position.get("longitude") or 0), 7),
+            int(position.get("altitude") or 0),
+        )
+        if (round(lat, 7), round(lon, 7), alt) != current:
+            plan.location = (lat, lon, alt)
+            plan.changes.append(ConfigChange("location", current, plan.location))
+
+    plan.local_config.CopyFrom(node.localConfig)
+    for section in configuration.get("config") or {}:
+        name = camel_to_snake(section)
+        traverse_config(section, configuration["config"][section], plan.local_config)
+        if name not in plan.local_config.DESCRIPTOR.fields_by_name:
+            continue
+        changes = _diff_section(f"config.{name}", getattr(node.localConfig, name), getattr(plan.local_config, name))
+        if changes:
+            plan.config_sections.append(name)
+            plan.changes.extend(changes)
+
+    plan.module_config.CopyFrom(node.moduleConfig)
+    for section in configuration.get("module_config") or {}:
+        name = camel_to_snake(section)
+        traverse_config(section, configuration["module_config"][section], plan.module_config)
+        if name not in plan.module_config.DESCRIPTOR.fields_by_name:
+            continue
+        changes = _diff_section(
+            f"module_config.{name}", getattr(node.moduleConfig, name), getattr(plan.module_config, name)
+        )
+        if changes:
+            plan.module_sections.append(name)
+            plan.changes.extend(changes)
+
+    return plan
+
+
+def apply_config_plan(
+    interface,
+    node,
+    plan: ConfigImportPlan,
+    progress: ProgressCallback | None = None,
+    timeout: float = ADMIN_ACK_TIMEOUT,
+) -> list[str]:
+    """Write only what the plan found changed. Returns the labels of writes that failed."""
+    if plan.is_empty:
+        logging.info("Config already matches the device; nothing to write")
+        return []
+
+    writer = AdminWriter(interface, node, progress, timeout=timeout)
+
+    if plan.owner is not None:
+        logging.info(f"Setting device owner to {plan.owner}")
+        writer.add("owner", lambda: node.setOwner(plan.owner))
+
+    if plan.owner_short is not None:
+        logging.info(f"Setting device owner short to {plan.owner_short}")
+        writer.add("owner_short", lambda: node.setOwner(long_name=None, short_name=plan.owner_short))
+
+    if plan.channel_url is not None:
+        logging.info(f"Setting channel url to {plan.channel_url}")
+        writer.add("channel_url", lambda: node.setURL(plan.channel_url))
+
+    if plan.location is not None:
+        logging.info(f"Setting device position to {plan.location}")
+        writer.add("location", lambda: node.setFixedPosition(*plan.location))
+
+    for section in plan.config_sections:
+        getattr(node.localConfig, section).CopyFrom(getattr(plan.local_config, section))
+        writer.add_section(section)
+
+    for section in plan.module_sections:
+        getattr(node.moduleConfig, section).CopyFrom(getattr(plan.module_config, section))
+        writer.add_section(section)
+
+    logging.info(f"Writing {len(plan.changes)} changed settings to device")
+    return writer.run()
+
+
+def load_config_file(filename: str) -> dict[str, Any]:
     with open(filename, encoding="utf8") as file:
-        configuration = yaml.safe_load(file)
-        close_now = True  # noqa: F841
-
-        interface.getNode("^local", False).beginSettingsTransaction()
-
-        if "owner" in configuration:
-            logging.info(f"Setting device owner to {configuration['owner']}")
-            interface.getNode("^local", False).setOwner(configuration["owner"])
-            time.sleep(0.5)
-
-        if "owner_short" in configuration:
-            logging.info(f"Setting device owner short to {configuration['owner_short']}")
-            interface.getNode("^local", False).setOwner(long_name=None, short_name=configuration["owner_short"])
-            time.sleep(0.5)
-
-        if "ownerShort" in configuration:
-            logging.info(f"Setting device owner short to {configuration['ownerShort']}")
-            interface.getNode("^local", False).setOwner(long_name=None, short_name=configuration["ownerShort"])
-            time.sleep(0.5)
-
-        if "channel_url" in configuration:
-            logging.info(f"Setting channel url to {configuration['channel_url']}")
-            interface.getNode("^local").setURL(configuration["channel_url"])
-            time.sleep(0.5)
-
-        if "channelUrl" in configuration:
-            logging.info(f"Setting channel url to {configuration['channelUrl']}")
-            interface.getNode("^local").setURL(configuration["channelUrl"])
-            time.sleep(0.5)
-
-        if "location" in configuration:
-            alt = 0
-            lat = 0.0
-            lon = 0.0
-
-            if "alt" in configuration["location"]:
-                alt = int(configuration["location"]["alt"] or 0)
-                logging.info(f"Fixing altitude at {alt} meters")
-            if "lat" in configuration["location"]:
-                lat = float(configuration["location"]["lat"] or 0)
-                logging.info(f"Fixing latitude at {lat} degrees")
-            if "lon" in configuration["location"]:
-                lon = float(configuration["location"]["lon"] or 0)
-                logging.info(f"Fixing longitude at {lon} degrees")
-            logging.info("Setting device position")
-            interface.localNode.setFixedPosition(lat, lon, alt)
-            time.sleep(0.5)
-
-        if "config" in configuration:
-            local_config = interface.getNode("^local").localConfig
-            for section in configuration["config"]:
-                traverse_config(section, configuration["config"][section], local_config)
-                interface.getNode("^local").writeConfig(camel_to_snake(section))
-                time.sleep(0.5)
-
-        if "module_config" in configuration:
-            module_config = interface.getNode("^local").moduleConfig
-            for section in configuration["module_config"]:
-                traverse_config(
-                    section,
-                    configuration["module_config"][section],
-                    module_config,
-                )
-                interface.getNode("^local").writeConfig(camel_to_snake(section))
-                time.sleep(0.5)
-
-        interface.getNode("^local", False).commitSettingsTransaction()
-        logging.info("Writing modified configuration to device")
+        return yaml.safe_load(file) or {}
+
+
+def config_import(interface, filename, progress: ProgressCallback | None = None) -> list[str]:
+    """Apply a YAML config file to the local node, writing only what differs."""
+    node = interface.getNode("^local", False)
+    plan = plan_config_import(interface, node, load_config_file(filename))
+    return apply_config_plan(interface, node, plan, progress)
 
 
 def config_export(interface) -> str:  # noqa: PLR0915, PLR0912
@@ -271,47 +534,11 @@ def config_export(interface) -> str:  # noqa: PLR0915, PLR0912
     return config_txt
 
 
-def save_config(interface):  # noqa: PLR0915, PLR0912
+def save_config(interface, progress: ProgressCallback | None = None) -> list[str]:
     """used in --save-config"""
     with open("config.json") as f:
         configuration = json.load(f)
-        close_now = False  # noqa: F841
-        wait_for_ack_nak = False
-        if "owner" in configuration:
-            logging.info(f"Setting device owner to {configuration['owner']}")
-            wait_for_ack_nak = True
-            interface.getNode("^local", False).setOwner(long_name=configuration["owner"])
-            time.sleep(0.5)
-
-        if "ownerShort" in configuration:
-            logging.info(f"Setting device owner short to {configuration['ownerShort']}")
-            wait_for_ack_nak = True
-            interface.getNode("^local", False).setOwner(long_name=None, short_name=configuration["ownerShort"])
-            time.sleep(0.5)
-
-        if "channel_url" in configuration:
-            logging.info(f"Setting channel URL to {configuration['channel_url']}")
-            wait_for_ack_nak = True
-            interface.setURL(configuration["channel_url"])
-            time.sleep(0.5)
-
-        if "config" in configuration:
-            local_config = interface.getNode("^local").localConfig
-            for section in configuration["config"]:
-                traverse_config(section, configuration["config"][section], local_config)
-                interface.getNode("^local").writeConfig(camel_to_snake(section))
-                time.sleep(0.5)
-
-        if "module_config" in configuration:
-            module_config = interface.getNode("^local").moduleConfig
-            for section in configuration["module_config"]:
-                traverse_config(
-                    section,
-                    configuration["module_config"][section],
-                    module_config,
-                )
-                interface.getNode("^local").writeConfig(camel_to_snake(section))
-                time.sleep(0.5)
-
-        if wait_for_ack_nak:
-            logging.info("Writing modified configuration to device")
+
+    node = interface.getNode("^local", False)
+    plan = plan_config_import(interface, node, configuration)
+    return apply_config_plan(interface, node, plan, progress)
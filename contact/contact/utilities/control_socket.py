@@ -0,0 +1,297 @@
+import base64
+import errno
+import itertools
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import threading
+from collections.abc import Callable
+from typing import Any
+
+CONTROL_TIMEOUT = 10.0  # seconds a client waits for a reply
+CLIENT_QUEUE_LIMIT = 1000  # lines waiting for a client to read before it is dropped as stuck
+
+# Requests and replies are one JSON object per line:
+#   -> {"id": 1, "cmd": "history", "channel": "LongFast", "limit": 20}
+#   <- {"id": 1, "ok": true, "result": [...]}
+# A connection that sends {"cmd": "subscribe"} also receives {"event": "...", ...} lines as things happen.
+
+CommandHandler = Callable[[dict[str, Any]], Any]
+EventCallback = Callable[[str, dict[str, Any]], None]
+
+
+class ControlError(RuntimeError):
+    """The daemon rejected a request, or didn't answer in time."""
+
+
+def encode_value(value: Any) -> Any:
+    """Make packets JSON-safe: bytes become {"$bytes": base64}, raw protobufs and other objects are dropped."""
+    if isinstance(value, bytes):
+        return {"$bytes": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, dict):
+        return {str(k): encode_value(v) for k, v in value.items() if k != "raw" and _is_encodable(v)}
+    if isinstance(value, list | tuple):
+        return [encode_value(v) for v in value if _is_encodable(v)]
+    return value
+
+
+def decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1 and "$bytes" in value:
+            return base64.b64decode(value["$bytes"])
+        return {k: decode_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode_value(v) for v in value]
+    return value
+
+
+def _is_encodable(value: Any) -> bool:
+    return value is None or isinstance(value, str | int | float | bool | bytes | dict | list | tuple)
+
+
+def _dump_line(message: dict[str, Any]) -> bytes:
+    return (json.dumps(encode_value(message), ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class _Connection:
+    """
+    One client socket. Replies and events are queued and written by the connection's own thread, so a
+    client that stops reading only fills its own queue; past CLIENT_QUEUE_LIMIT lines it is disconnected.
+    """
+
+    def __init__(self, sock: socket.socket, wfile: Any) -> None:
+        self.sock = sock
+        self.wfile = wfile
+        self.closed = False
+        self._queue: queue.Queue[bytes | None] = queue.Queue(CLIENT_QUEUE_LIMIT)
+        self._writer = threading.Thread(target=self._write_loop, name="control-writer", daemon=True)
+        self._writer.start()
+
+    def send(self, message: dict[str, Any]) -> bool:
+        return self.send_line(_dump_line(message))
+
+    def send_line(self, data: bytes) -> bool:
+        """Queue an encoded line without blocking. False if the client is gone or was too slow and is dropped."""
+        if self.closed:
+            return False
+        try:
+            self._queue.put_nowait(data)
+        except queue.Full:
+            logging.warning("Control client stopped reading; disconnecting it")
+            self.close()
+            return False
+        return True
+
+    def finish(self) -> None:
+        """Write what is queued, then stop the writer; used once the client has stopped sending."""
+        if not self.closed:
+            try:
+                self._queue.put(None, timeout=CONTROL_TIMEOUT)
+            except queue.Full:
+                pass
+            self._writer.join(CONTROL_TIMEOUT)
+        self.close()
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)  # Wakes the request reader and a writer stuck on a full socket
+        except OSError:
+            pass
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass  # The writer fails on the shut socket instead
+
+    def _write_loop(self) -> None:
+        try:
+            while (data := self._queue.get()) is not None:
+                self.wfile.write(data)
+                self.wfile.flush()
+        except (OSError, ValueError) as e:
+            logging.info("Control client disconnected: %s", e)
+        finally:
+            self.closed = True
+
+
+class _ControlRequestHandler(socketserver.StreamRequestHandler):
+    server: "ControlServer"
+
+    def handle(self) -> None:
+        connection = _Connection(self.connection, self.wfile)
+        try:
+            for line in self.rfile:
+                if line.strip():
+                    connection.send(self.server.dispatch(line, connection))
+        except (OSError, ValueError) as e:
+            logging.info("Control client disconnected: %s", e)
+        finally:
+            self.server.unsubscribe(connection)
+            connection.finish()
+
+
+class ControlServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Local JSON-lines API over a Unix socket, served from a background thread."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, handlers: dict[str, CommandHandler]) -> None:
+        if os.path.exists(path):
+            _remove_stale_socket(path)
+        # Same user only, from the moment it exists: the socket can transmit on the mesh
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, _ControlRequestHandler)
+        finally:
+            os.umask(umask)
+        self.path = path
+        self.handlers = handlers
+        self._subscribers: set[_Connection] = set()
+        self._subscribers_lock = threading.Lock()
+        self._requests = threading.local()  # Each client's requests are handled on its own thread
+        self._thread: threading.Thread | None = None
+
+    def dispatch(self, line: bytes, connection: _Connection) -> dict[str, Any]:
+        request_id = None
+        try:
+            request = decode_value(json.loads(line))
+            request_id = request.pop("id", None)
+            command = request.pop("cmd", None)
+            if command == "subscribe":
+                with self._subscribers_lock:
+                    self._subscribers.add(connection)
+                return {"id": request_id, "ok": True, "result": None}
+            handler = self.handlers.get(command)
+            if handler is None:
+                raise ValueError(f"Unknown command '{command}'")
+            self._requests.connection = connection
+            return {"id": request_id, "ok": True, "result": handler(request)}
+        except Exception as e:
+            logging.error("Control request failed: %s", e)
+            return {"id": request_id, "ok": False, "error": str(e)}
+
+    def requester(self) -> _Connection:
+        """The connection whose request is being handled; only valid inside a command handler."""
+        return self._requests.connection
+
+    def broadcast(self, event: str, **data: Any) -> None:
+        """Queue an event for every subscribed client, dropping the ones that have gone away. Never blocks."""
+        line = _dump_line({"event": event, **data})
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for connection in subscribers:
+            if not connection.send_line(line):
+                self.unsubscribe(connection)
+
+    def unsubscribe(self, connection: _Connection) -> None:
+        with self._subscribers_lock:
+            self._subscribers.discard(connection)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self.serve_forever, name="control-socket", daemon=True)
+        self._thread.start()
+        logging.info("Control socket listening on %s", self.path)
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove a socket file left by a daemon that didn't shut down cleanly; refuse if one still answers on it."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, "Another daemon is listening on the control socket", path)
+
+
+class ControlClient:
+    """
+    Talks to a ControlServer. Replies are matched to requests by id on a reader thread, which also
+    delivers events; event callbacks run on that thread and must not wait on request().
+    """
+
+    def __init__(self, path: str, on_event: EventCallback | None = None, timeout: float = CONTROL_TIMEOUT) -> None:
+        self.path = path
+        self.on_event = on_event
+        self.timeout = timeout
+        self.connected = True
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(path)
+        self._send_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: dict[int, dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_loop, name="control-client", daemon=True)
+        self._reader.start()
+
+    def request(self, cmd: str, **params: Any) -> Any:
+        request_id = next(self._ids)
+        slot: dict[str, Any] = {"done": threading.Event()}
+        with self._pending_lock:
+            self._pending[request_id] = slot
+        try:
+            with self._send_lock:
+                self._sock.sendall(_dump_line({"id": request_id, "cmd": cmd, **params}))
+            if not slot["done"].wait(self.timeout):
+                raise ControlError(f"No reply to '{cmd}' from {self.path}")
+        except OSError as e:
+            raise ControlError(f"Lost connection to {self.path}: {e}") from e
+        finally:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+
+        reply = slot.get("reply")
+        if reply is None:
+            raise ControlError(f"Lost connection to {self.path}")
+        if not reply.get("ok"):
+            raise ControlError(reply.get("error", "Request failed"))
+        return reply.get("result")
+
+    def subscribe(self) -> None:
+        self.request("subscribe")
+
+    def _read_loop(self) -> None:
+        try:
+            for line in self._sock.makefile("rb"):
+                message = decode_value(json.loads(line))
+                if "event" in message:
+                    if self.on_event:
+                        try:
+                            self.on_event(message.pop("event"), message)
+                        except Exception as e:
+                            logging.error("Error handling control event: %s", e)
+                    continue
+                with self._pending_lock:
+                    slot = self._pending.get(message.get("id"))
+                if slot is not None:
+                    slot["reply"] = message
+                    slot["done"].set()
+        except (OSError, ValueError) as e:
+            logging.error("Control connection to %s closed: %s", self.path, e)
+        finally:
+            self.connected = False
+            with self._pending_lock:
+                for slot in self._pending.values():
+                    slot["done"].set()
+            if self.on_event:
+                self.on_event("disconnected", {})
+
+    def close(self) -> None:
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
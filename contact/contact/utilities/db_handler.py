@@ -1,20 +1,36 @@
 import logging
 import sqlite3
+import threading
 import time
 from datetime import datetime
+from typing import Any
 
 import contact.ui.default_config as config
-from contact.utilities.singleton import interface_state, ui_state
+from contact.utilities.message_window import MESSAGE_WINDOW, MessageWindows
+from contact.utilities.perf import hot_path
+from contact.utilities.search_index import search_index
+from contact.utilities.singleton import app_state, db_owner, interface_state, ui_state
 from contact.utilities.utils import decimal_to_hex
 
+# Node numbers with an archived chat, per radio, loaded by archived_chats() and updated by update_node_info_in_db()
+_archived_chats: dict[int, set[int]] = {}
+_archived_lock = threading.Lock()
+
+
+def owner_node_num() -> int:
+    """The node whose tables are read and written: the connected one unless pinned with db_owner."""
+    owner = db_owner.get()
+    return interface_state.my_node_num if owner is None else owner
+
 
 def get_table_name(channel: str) -> str:
     # Construct the table name
-    table_name = f"{str(interface_state.my_node_num)}_{channel}_messages"
+    table_name = f"{str(owner_node_num())}_{channel}_messages"
     quoted_table_name = f'"{table_name}"'  # Quote the table name becuase we begin with numerics and contain spaces
     return quoted_table_name
 
 
+@hot_path.timed("db.save_message")
 def save_message_to_db(channel: str, user_id: str, message_text: str) -> int | None:
     """Save messages to the database, ensuring the table exists."""
     try:
@@ -43,11 +59,12 @@ def save_message_to_db(channel: str, user_id: str, message_text: str) -> int | N
             return timestamp
 
     except sqlite3.Error as e:
-        logging.error(f"SQLite error in save_message_to_db: {e}")
+        logging.error("SQLite error in save_message_to_db: %s", e)
     except Exception as e:
-        logging.error(f"Unexpected error in save_message_to_db: {e}")
+        logging.error("Unexpected error in save_message_to_db: %s", e)
 
 
+@hot_path.timed("db.update_ack_nak")
 def update_ack_nak(channel: str, timestamp: int, message: str, ack: str) -> None:
     try:
         with sqlite3.connect(config.db_file_path) as db_connection:
@@ -60,24 +77,81 @@ def update_ack_nak(channel: str, timestamp: int, message: str, ack: str) -> None
                       message_text = ?
             """
 
-            db_cursor.execute(update_query, (ack, str(interface_state.my_node_num), timestamp, message))
+            db_cursor.execute(update_query, (ack, str(owner_node_num()), timestamp, message))
             db_connection.commit()
 
     except sqlite3.Error as e:
-        logging.error(f"SQLite error in update_ack_nak: {e}")
+        logging.error("SQLite error in update_ack_nak: %s", e)
 
     except Exception as e:
-        logging.error(f"Unexpected error in update_ack_nak: {e}")
+        logging.error("Unexpected error in update_ack_nak: %s", e)
+
+
+def read_recent_messages(db_cursor: sqlite3.Cursor, quoted_table_name: str) -> list[tuple[Any, ...]]:
+    """The newest MESSAGE_WINDOW rows of a message table, oldest first."""
+    query = f"SELECT user_id, message_text, timestamp, ack_type FROM {quoted_table_name} ORDER BY rowid DESC LIMIT ?"
+    db_cursor.execute(query, (MESSAGE_WINDOW,))
+    return [(row[0], row[1], row[2], row[3]) for row in reversed(db_cursor.fetchall())]  # Save as tuples
+
+
+def format_stored_messages(db_messages: list[tuple[Any, ...]], my_id: str) -> list[tuple[str, str]]:
+    """Message rows as the lines of ui_state.all_messages, grouped under hourly headers."""
+    hourly_messages = {}
+    for row in db_messages:
+        user_id, message, timestamp, ack_type = row
+
+        # Only ack_type is allowed to be None
+        if user_id is None or message is None or timestamp is None:
+            logging.warning("Skipping row with NULL required field(s): %s", row)
+            continue
+
+        hour = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:00")
+        if hour not in hourly_messages:
+            hourly_messages[hour] = []
+
+        ack_str = config.ack_unknown_str
+        if ack_type == "Implicit":
+            ack_str = config.ack_implicit_str
+        elif ack_type == "Ack":
+            ack_str = config.ack_str
+        elif ack_type == "Nak":
+            ack_str = config.nak_str
+
+        ts_str = datetime.fromtimestamp(timestamp).strftime("[%H:%M:%S]")
+
+        if user_id == my_id:
+            sanitized_message = message.replace("\x00", "")
+            formatted_message = (
+                f"{ts_str} {config.sent_message_prefix}{ack_str}: ",
+                sanitized_message,
+            )
+        else:
+            sanitized_message = message.replace("\x00", "")
+            formatted_message = (
+                f"{ts_str} {config.message_prefix} {get_name_from_database(int(user_id), 'short')}: ",
+                sanitized_message,
+            )
+
+        hourly_messages[hour].append(formatted_message)
+
+    # Flatten the hourly messages
+    lines = []
+    for hour, messages in sorted(hourly_messages.items()):
+        lines.append((f"-- {hour} --", ""))
+        lines.extend(messages)
+    return lines
 
 
-def load_messages_from_db() -> None:  # noqa: PLR0912, PLR0915
-    """Load messages from the database for all channels and update ui_state.all_messages and ui_state.channel_list."""
+@hot_path.timed("db.load_messages")
+def load_messages_from_db() -> None:
+    """Load recent messages from the database for all channels and update ui_state.all_messages and ui_state.channel_list."""
     try:
         with sqlite3.connect(config.db_file_path) as db_connection:
             db_cursor = db_connection.cursor()
 
+            my_id = str(owner_node_num())
             query = "SELECT name FROM sqlite_master WHERE type='table' AND name LIKE ?"
-            db_cursor.execute(query, (f"{str(interface_state.my_node_num)}_%_messages",))
+            db_cursor.execute(query, (f"{my_id}_%_messages",))
             tables = [row[0] for row in db_cursor.fetchall()]
 
             # Iterate through each table and fetch its messages
@@ -90,12 +164,9 @@ def load_messages_from_db() -> None:  # noqa: PLR0912, PLR0915
                     update_table_query = f"ALTER TABLE {quoted_table_name} ADD COLUMN ack_type TEXT"
                     db_cursor.execute(update_table_query)
 
-                query = f"SELECT user_id, message_text, timestamp, ack_type FROM {quoted_table_name}"
-
                 try:
-                    # Fetch all messages from the table
-                    db_cursor.execute(query)
-                    db_messages = [(row[0], row[1], row[2], row[3]) for row in db_cursor.fetchall()]  # Save as tuples
+                    # Fetch the latest messages from the table
+                    db_messages = read_recent_messages(db_cursor, quoted_table_name)
 
                     # Extract the channel name from the table name
                     channel = table_name.split("_")[1]
@@ -112,65 +183,48 @@ def load_messages_from_db() -> None:  # noqa: PLR0912, PLR0915
                         ui_state.all_messages[channel] = []
 
                     # Add messages to ui_state.all_messages grouped by hourly timestamp
-                    hourly_messages = {}
-                    for row in db_messages:
-                        user_id, message, timestamp, ack_type = row
-
-                        # Only ack_type is allowed to be None
-                        if user_id is None or message is None or timestamp is None:
-                            logging.warning(f"Skipping row with NULL required field(s): {row}")
-                            continue
-
-                        hour = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:00")
-                        if hour not in hourly_messages:
-                            hourly_messages[hour] = []
-
-                        ack_str = config.ack_unknown_str
-                        if ack_type == "Implicit":
-                            ack_str = config.ack_implicit_str
-                        elif ack_type == "Ack":
-                            ack_str = config.ack_str
-                        elif ack_type == "Nak":
-                            ack_str = config.nak_str
-
-                        ts_str = datetime.fromtimestamp(timestamp).strftime("[%H:%M:%S]")
-
-                        if user_id == str(interface_state.my_node_num):
-                            sanitized_message = message.replace("\x00", "")
-                            formatted_message = (
-                                f"{ts_str} {config.sent_message_prefix}{ack_str}: ",
-                                sanitized_message,
-                            )
-                        else:
-                            sanitized_message = message.replace("\x00", "")
-                            formatted_message = (
-                                f"{ts_str} {config.message_prefix} {get_name_from_database(int(user_id), 'short')}: ",
-                                sanitized_message,
-                            )
-
-                        hourly_messages[hour].append(formatted_message)
-
-                    # Flatten the hourly messages into ui_state.all_messages[channel]
-                    for hour, messages in sorted(hourly_messages.items()):
-                        ui_state.all_messages[channel].append((f"-- {hour} --", ""))
-                        ui_state.all_messages[channel].extend(messages)
+                    ui_state.all_messages[channel].extend(format_stored_messages(db_messages, my_id))
+                    if isinstance(ui_state.all_messages, MessageWindows):
+                        ui_state.all_messages.trim(channel)
+                        ui_state.all_messages.touch(channel)
 
                 except sqlite3.Error as e:
-                    logging.error(f"SQLite error while loading messages from table '{table_name}': {e}")
+                    logging.error("SQLite error while loading messages from table '%s': %s", table_name, e)
+
+    except sqlite3.Error as e:
+        logging.error("SQLite error in load_messages_from_db: %s", e)
+
+
+@hot_path.timed("db.reload_channel")
+def reload_channel_messages(channel: str | int, windows: MessageWindows) -> None:
+    """Read an emptied channel's recent messages back into its window. Runs after the writes queued before it."""
+    try:
+        with sqlite3.connect(config.db_file_path) as db_connection:
+            db_cursor = db_connection.cursor()
+            quoted_table_name = get_table_name(channel)
+            exists = db_cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name = ?", (quoted_table_name.strip('"'),)
+            ).fetchone()
+            db_messages = read_recent_messages(db_cursor, quoted_table_name) if exists else []
+        stored = format_stored_messages(db_messages, str(owner_node_num()))
+        with app_state.lock:
+            windows.refill(channel, stored)
 
     except sqlite3.Error as e:
-        logging.error(f"SQLite error in load_messages_from_db: {e}")
+        logging.error("SQLite error in reload_channel_messages: %s", e)
+    except Exception as e:
+        logging.error("Unexpected error in reload_channel_messages: %s", e)
 
 
-def init_nodedb() -> None:
-    """Initialize the node database and update it with nodes from the interface."""
+def init_nodedb(nodes: list[dict[str, Any]] | None = None) -> None:
+    """Initialize the node database and update it with nodes from the interface, or only the given ones."""
 
     try:
-        if not interface_state.interface.nodes:
+        nodes_snapshot = list((interface_state.interface.nodes or {}).values()) if nodes is None else nodes
+        if not nodes_snapshot:
             return  # No nodes to initialize
 
         ensure_node_table_exists()  # Ensure the table exists before insertion
-        nodes_snapshot = list(interface_state.interface.nodes.values())
 
         # Insert or update all nodes
         for node in nodes_snapshot:
@@ -187,11 +241,12 @@ def init_nodedb() -> None:
         logging.info("Node database initialized successfully.")
 
     except sqlite3.Error as e:
-        logging.error(f"SQLite error in init_nodedb: {e}")
+        logging.error("SQLite error in init_nodedb: %s", e)
     except Exception as e:
-        logging.error(f"Unexpected error in init_nodedb: {e}")
+        logging.error("Unexpected error in init_nodedb: %s", e)
 
 
+@hot_path.timed("db.store_nodeinfo")
 def maybe_store_nodeinfo_in_db(packet: dict[str, object]) -> None:
     """Save nodeinfo unless that record is already there, updating if necessary."""
     try:
@@ -206,11 +261,12 @@ def maybe_store_nodeinfo_in_db(packet: dict[str, object]) -> None:
         update_node_info_in_db(user_id, long_name, short_name, hw_model, is_licensed, role, public_key)
 
     except sqlite3.Error as e:
-        logging.error(f"SQLite error in maybe_store_nodeinfo_in_db: {e}")
+        logging.error("SQLite error in maybe_store_nodeinfo_in_db: %s", e)
     except Exception as e:
-        logging.error(f"Unexpected error in maybe_store_nodeinfo_in_db: {e}")
+        logging.error("Unexpected error in maybe_store_nodeinfo_in_db: %s", e)
 
 
+@hot_path.timed("db.update_node_info")
 def update_node_info_in_db(  # noqa: PLR0913
     user_id: int | str,
     long_name: str | None = None,
@@ -227,7 +283,7 @@ def update_node_info_in_db(  # noqa: PLR0913
 
         with sqlite3.connect(config.db_file_path) as db_connection:
             db_cursor = db_connection.cursor()
-            table_name = f'"{interface_state.my_node_num}_nodedb"'  # Quote in case of numeric names
+            table_name = f'"{owner_node_num()}_nodedb"'  # Quote in case of numeric names
 
             table_columns = [i[1] for i in db_cursor.execute(f"PRAGMA table_info({table_name})")]
             if "chat_archived" not in table_columns:
@@ -282,16 +338,24 @@ def update_node_info_in_db(  # noqa: PLR0913
                 upsert_query, (user_id, long_name, short_name, hw_model, is_licensed, role, public_key, chat_archived)
             )
             db_connection.commit()
+        search_index.set_node(int(user_id), long_name, short_name)
+        with _archived_lock:
+            archived = _archived_chats.get(owner_node_num())
+            if archived is not None:
+                if chat_archived:
+                    archived.add(int(user_id))
+                else:
+                    archived.discard(int(user_id))
 
     except sqlite3.Error as e:
-        logging.error(f"SQLite error in update_node_info_in_db: {e}")
+        logging.error("SQLite error in update_node_info_in_db: %s", e)
     except Exception as e:
-        logging.error(f"Unexpected error in update_node_info_in_db: {e}")
+        logging.error("Unexpected error in update_node_info_in_db: %s", e)
 
 
 def ensure_node_table_exists() -> None:
     """Ensure the node database table exists."""
-    table_name = f'"{interface_state.my_node_num}_nodedb"'  # Quote for safety
+    table_name = f'"{owner_node_num()}_nodedb"'  # Quote for safety
     schema = """
         user_id TEXT PRIMARY KEY,
         long_name TEXT,
@@ -314,11 +378,12 @@ def ensure_table_exists(table_name: str, schema: str) -> None:
             db_cursor.execute(create_table_query)
             db_connection.commit()
     except sqlite3.Error as e:
-        logging.error(f"SQLite error in ensure_table_exists({table_name}): {e}")
+        logging.error("SQLite error in ensure_table_exists(%s): %s", table_name, e)
     except Exception as e:
-        logging.error(f"Unexpected error in ensure_table_exists({table_name}): {e}")
+        logging.error("Unexpected error in ensure_table_exists(%s): %s", table_name, e)
 
 
+@hot_path.timed("db.get_name")
 def get_name_from_database(user_id: int, type: str = "long") -> str:
     """
     Retrieve a user's name (long or short) from the node database.
@@ -332,7 +397,7 @@ def get_name_from_database(user_id: int, type: str = "long") -> str:
             db_cursor = db_connection.cursor()
 
             # Construct table name
-            table_name = f"{str(interface_state.my_node_num)}_nodedb"
+            table_name = f"{str(owner_node_num())}_nodedb"
             nodeinfo_table = f'"{table_name}"'  # Quote table name for safety
 
             # Determine the correct column to fetch
@@ -346,30 +411,42 @@ def get_name_from_database(user_id: int, type: str = "long") -> str:
             return result[0] if result else decimal_to_hex(user_id)
 
     except sqlite3.Error as e:
-        logging.error(f"SQLite error in get_name_from_database: {e}")
+        logging.error("SQLite error in get_name_from_database: %s", e)
         return "Unknown"
 
     except Exception as e:
-        logging.error(f"Unexpected error in get_name_from_database: {e}")
+        logging.error("Unexpected error in get_name_from_database: %s", e)
         return "Unknown"
 
 
-def is_chat_archived(user_id: int) -> int:
-    try:
-        with sqlite3.connect(config.db_file_path) as db_connection:
-            db_cursor = db_connection.cursor()
-            table_name = f"{str(interface_state.my_node_num)}_nodedb"
-            nodeinfo_table = f'"{table_name}"'
-            query = f"SELECT chat_archived FROM {nodeinfo_table} WHERE user_id = ?"
-            db_cursor.execute(query, (user_id,))
-            result = db_cursor.fetchone()
-
-            return result[0] if result else 0
-
-    except sqlite3.Error as e:
-        logging.error(f"SQLite error in is_chat_archived: {e}")
-        return "Unknown"
-
-    except Exception as e:
-        logging.error(f"Unexpected error in is_chat_archived: {e}")
-        return "Unknown"
+def archived_chats() -> set[int]:
+    """Node numbers whose chats are archived, read from the node table once per radio and then kept in memory."""
+    owner = owner_node_num()
+    with _archived_lock:
+        archived = _archived_chats.get(owner)
+        if archived is not None:
+            return archived
+        try:
+            ensure_node_table_exists()
+            with sqlite3.connect(config.db_file_path) as db_connection:
+                db_cursor = db_connection.cursor()
+                nodeinfo_table = f'"{owner}_nodedb"'
+                table_columns = [i[1] for i in db_cursor.execute(f"PRAGMA table_info({nodeinfo_table})")]
+                if "chat_archived" in table_columns:
+                    db_cursor.execute(f"SELECT user_id FROM {nodeinfo_table} WHERE chat_archived")
+                    archived = {int(row[0]) for row in db_cursor.fetchall()}
+                else:
+                    archived = set()
+        except sqlite3.Error as e:
+            logging.error("SQLite error in archived_chats: %s", e)
+            return set()  # Not cached, so the next call tries again
+        except Exception as e:
+            logging.error("Unexpected error in archived_chats: %s", e)
+            return set()
+        _archived_chats[owner] = archived
+        return archived
+
+
+def is_chat_archived(user_id: int | str) -> bool:
+    """Whether the chat with a node is archived. Channel names never are."""
+    return user_id in archived_chats()
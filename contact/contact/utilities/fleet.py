@@ -0,0 +1,314 @@
+import json
+import logging
+import threading
+import time
+from argparse import Namespace
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from meshtastic.protobuf import admin_pb2, channel_pb2
+from meshtastic.util import camel_to_snake
+
+from contact.utilities.config_io import apply_config_plan, load_config_file, plan_config_import
+from contact.utilities.interfaces import initialize_interface, parse_interface_spec
+
+FLEET_WORKERS = 4  # nodes configured at once overall
+FLEET_MESH_CONCURRENCY = 2  # remote nodes configured at once over one mesh interface; each costs airtime
+FLEET_RETRIES = 2  # extra attempts per node after the first
+FLEET_RETRY_BACKOFF = 5.0  # seconds before the first retry, doubled for each one after
+FLEET_REMOTE_TIMEOUT = 60.0  # seconds to wait for a remote node's response or ACK over the mesh
+
+FleetProgressCallback = Callable[[str, int, int, str], None]  # (target name, completed, total, label)
+
+MAX_CHANNELS = 8  # channel slots on a node; a remote node's are read back one request each
+
+ModuleConfigType = admin_pb2.AdminMessage.ModuleConfigType
+MODULE_CONFIG_TYPES = {  # LocalModuleConfig field -> what to ask the node for; the enum doesn't follow field order
+    "mqtt": ModuleConfigType.MQTT_CONFIG,
+    "serial": ModuleConfigType.SERIAL_CONFIG,
+    "external_notification": ModuleConfigType.EXTNOTIF_CONFIG,
+    "store_forward": ModuleConfigType.STOREFORWARD_CONFIG,
+    "range_test": ModuleConfigType.RANGETEST_CONFIG,
+    "telemetry": ModuleConfigType.TELEMETRY_CONFIG,
+    "canned_message": ModuleConfigType.CANNEDMSG_CONFIG,
+    "audio": ModuleConfigType.AUDIO_CONFIG,
+    "remote_hardware": ModuleConfigType.REMOTEHARDWARE_CONFIG,
+    "neighbor_info": ModuleConfigType.NEIGHBORINFO_CONFIG,
+    "ambient_lighting": ModuleConfigType.AMBIENTLIGHTING_CONFIG,
+    "detection_sensor": ModuleConfigType.DETECTIONSENSOR_CONFIG,
+    "paxcounter": ModuleConfigType.PAXCOUNTER_CONFIG,
+}
+
+
+@dataclass
+class FleetTarget:
+    """A node to configure: either remote over the mesh (node_num) or a separately attached radio (connection)."""
+
+    name: str
+    node_num: int | None = None
+    connection: Namespace | None = None
+
+
+@dataclass
+class FleetResult:
+    target: str
+    ok: bool = False
+    changes: int = 0
+    failed: list[str] = field(default_factory=list)
+    attempts: int = 0
+    error: str | None = None
+    elapsed: float = 0.0
+
+
+def parse_node_target(spec: str) -> FleetTarget:
+    """'!a1b2c3d4', '0xa1b2c3d4' or a decimal node number."""
+    text = spec.strip()
+    if text.startswith("!"):
+        node_num = int(text[1:], 16)
+    else:
+        node_num = int(text, 0)
+    return FleetTarget(name=f"!{node_num:08x}", node_num=node_num)
+
+
+def parse_interface_target(spec: str) -> FleetTarget:
+    """'serial:/dev/ttyUSB0', 'tcp:host[:port]' or 'ble:name'."""
+    return FleetTarget(name=spec, connection=parse_interface_spec(spec))
+
+
+def _request_admin(node, message: admin_pb2.AdminMessage, timeout: float) -> dict[str, Any] | None:
+    """
+    Send an admin request and wait for the response packet.
+
+    Node.requestConfig waits on the interface-wide acknowledgment flag, so concurrent requests to
+    several remote nodes would trip over each other; this waits on a per-request event instead.
+    """
+    received = threading.Event()
+    response: dict[str, Any] = {}
+
+    def on_response(packet: dict[str, Any]) -> None:
+        response.update(packet)
+        received.set()
+
+    node._sendAdmin(message, wantResponse=True, onResponse=on_response)
+    if not received.wait(timeout):
+        return None
+    return response
+
+
+def _request_admin_reply(node, message: admin_pb2.AdminMessage, what: str, timeout: float) -> admin_pb2.AdminMessage:
+    packet = _request_admin(node, message, timeout)
+    admin = (packet or {}).get("decoded", {}).get("admin")
+    if not admin:
+        raise TimeoutError(f"No {what} from node")
+    return admin["raw"]
+
+
+def fetch_remote_channels(node, timeout: float = FLEET_REMOTE_TIMEOUT) -> None:
+    """Read every channel slot of a remote node, so its channel URL can be compared and setURL can write it."""
+    channels = []
+    for index in range(MAX_CHANNELS):
+        message = admin_pb2.AdminMessage()
+        message.get_channel_request = index + 1  # 1-based on the wire
+        channel = channel_pb2.Channel()
+        channel.CopyFrom(_request_admin_reply(node, message, f"channel {index}", timeout).get_channel_response)
+        channels.append(channel)
+    node.channels = channels
+
+
+def fetch_remote_config(node, configuration: dict[str, Any], timeout: float = FLEET_REMOTE_TIMEOUT) -> None:
+    """
+    Get a session key from a remote node, then read back only the sections the config file touches,
+    and the channels if it sets a channel URL.
+    """
+    message = admin_pb2.AdminMessage()
+    message.get_config_request = admin_pb2.AdminMessage.ConfigType.SESSIONKEY_CONFIG
+    if _request_admin(node, message, timeout) is None:
+        raise TimeoutError("No session key from node")
+
+    sections = [(camel_to_snake(name), "config") for name in configuration.get("config") or {}]
+    sections += [(camel_to_snake(name), "module_config") for name in configuration.get("module_config") or {}]
+    wants_channels = bool(configuration.get("channel_url") or configuration.get("channelUrl"))
+    if wants_channels:
+        sections.append(("lora", "config"))  # Part of the URL
+
+    for name, kind in sections:
+        message = admin_pb2.AdminMessage()
+        if kind == "config":
+            if name not in node.localConfig.DESCRIPTOR.fields_by_name:
+                continue
+            message.get_config_request = admin_pb2.AdminMessage.ConfigType.Value(f"{name.upper()}_CONFIG")
+            target, oneof = getattr(node.localConfig, name), "get_config_response"
+        else:
+            if name not in node.moduleConfig.DESCRIPTOR.fields_by_name:
+                continue
+            if name not in MODULE_CONFIG_TYPES:
+                logging.warning("Can't read module config %s back from the node; writing it as the file has it", name)
+                continue
+            message.get_module_config_request = MODULE_CONFIG_TYPES[name]
+            target, oneof = getattr(node.moduleConfig, name), "get_module_config_response"
+
+        reply = getattr(_request_admin_reply(node, message, f"{name} config", timeout), oneof)
+        if reply.HasField(name):
+            target.CopyFrom(getattr(reply, name))
+
+    if wants_channels:
+        fetch_remote_channels(node, timeout)
+
+
+def _push_once(
+    target: FleetTarget,
+    configuration: dict[str, Any],
+    mesh_interface,
+    mesh_slots: threading.Semaphore,
+    progress: Callable[[int, int, str], None],
+) -> tuple[int, list[str]]:
+    if target.node_num is not None:
+        with mesh_slots:
+            node = mesh_interface.getNode(target.node_num, requestChannels=False)
+            fetch_remote_config(node, configuration, FLEET_REMOTE_TIMEOUT)
+            plan = plan_config_import(mesh_interface, node, configuration)
+            failed = apply_config_plan(mesh_interface, node, plan, progress, timeout=FLEET_REMOTE_TIMEOUT)
+            return len(plan.changes), failed
+
+    interface = initialize_interface(target.connection)
+    if interface is None:
+        raise ConnectionError(f"Could not connect to {target.name}")
+    try:
+        node = interface.localNode
+        plan = plan_config_import(interface, node, configuration)
+        return len(plan.changes), apply_config_plan(interface, node, plan, progress)
+    finally:
+        interface.close()
+
+
+def _push_with_retries(  # noqa: PLR0913, PLR0917
+    target: FleetTarget,
+    configuration: dict[str, Any],
+    mesh_interface,
+    mesh_slots: threading.Semaphore,
+    retries: int,
+    progress: FleetProgressCallback | None,
+) -> FleetResult:
+    result = FleetResult(target.name)
+    started = time.monotonic()
+
+    def report(completed: int, total: int, label: str) -> None:
+        if progress:
+            progress(target.name, completed, total, label)
+
+    for attempt in range(1, retries + 2):
+        result.attempts = attempt
+        try:
+            # Each attempt re-diffs against the node, so a retry only sends what didn't land.
+            changes, failed = _push_once(target, configuration, mesh_interface, mesh_slots, report)
+            result.changes = max(result.changes, changes)
+            result.failed = failed
+            result.error = None
+            if not failed:
+                result.ok = True
+                break
+        except (Exception, SystemExit) as e:  # The meshtastic API exits on some errors; that fails this node only
+            result.error = str(e) if isinstance(e, Exception) else f"meshtastic exited with status {e.code}"
+            logging.error("Fleet push to %s failed on attempt %d: %s", target.name, attempt, result.error)
+
+        if attempt <= retries:
+            time.sleep(FLEET_RETRY_BACKOFF * 2 ** (attempt - 1))
+
+    result.elapsed = round(time.monotonic() - started, 1)
+    return result
+
+
+def push_config(  # noqa: PLR0913
+    configuration: dict[str, Any],
+    targets: list[FleetTarget],
+    mesh_interface=None,
+    *,
+    workers: int = FLEET_WORKERS,
+    mesh_concurrency: int = FLEET_MESH_CONCURRENCY,
+    retries: int = FLEET_RETRIES,
+    progress: FleetProgressCallback | None = None,
+) -> list[FleetResult]:
+    """Apply one config to many nodes in parallel and return a result per node, in target order."""
+    if any(target.node_num is not None for target in targets) and mesh_interface is None:
+        raise ValueError("Remote node targets need a mesh interface")
+
+    mesh_slots = threading.Semaphore(max(1, mesh_concurrency))
+    results: dict[str, FleetResult] = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="fleet") as pool:
+        futures = {
+            pool.submit(
+                _push_with_retries, target, configuration, mesh_interface, mesh_slots, retries, progress
+            ): target
+            for target in targets
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.target] = result
+
+    return [results[target.name] for target in targets]
+
+
+def format_fleet_report(results: list[FleetResult]) -> str:
+    width = max([len(result.target) for result in results] + [6])
+    lines = [f"{'Node':<{width}}  Result  Changes  Attempts  Time"]
+    for result in results:
+        status = "OK" if result.ok else "FAILED"
+        line = f"{result.target:<{width}}  {status:<6}  {result.changes:>7}  {result.attempts:>8}  {result.elapsed:>5}s"
+        if result.error:
+            line += f"  {result.error}"
+        elif result.failed:
+            line += f"  unconfirmed: {', '.join(result.failed)}"
+        lines.append(line)
+    succeeded = sum(result.ok for result in results)
+    lines.append(f"{succeeded}/{len(results)} nodes configured")
+    return "\n".join(lines)
+
+
+def save_fleet_report(results: list[FleetResult], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([asdict(result) for result in results], f, indent=2)
+
+
+def run_fleet_from_args(args: Namespace) -> int:
+    """Headless entry point for --fleet-config. Returns the process exit code."""
+    configuration = load_config_file(args.fleet_config)
+    targets = [parse_node_target(spec) for spec in args.fleet_nodes or []]
+    targets += [parse_interface_target(spec) for spec in args.fleet_interfaces or []]
+    if not targets:
+        print("No fleet targets given; use --fleet-nodes and/or --fleet-interfaces.")
+        return 2
+
+    mesh_interface = None
+    if args.fleet_nodes:
+        mesh_interface = initialize_interface(args)
+        if mesh_interface is None:
+            print("Could not connect to the radio used for remote admin.")
+            return 1
+
+    print_lock = threading.Lock()
+
+    def print_progress(name: str, completed: int, total: int, label: str) -> None:
+        with print_lock:
+            print(f"[{name}] {completed}/{total} {label}", flush=True)
+
+    try:
+        results = push_config(
+            configuration,
+            targets,
+            mesh_interface,
+            workers=args.fleet_workers,
+            mesh_concurrency=args.fleet_mesh_concurrency,
+            retries=args.fleet_retries,
+            progress=print_progress,
+        )
+    finally:
+        if mesh_interface is not None:
+            mesh_interface.close()
+
+    print(format_fleet_report(results))
+    if args.fleet_report:
+        save_fleet_report(results, args.fleet_report)
+    return 0 if all(result.ok for result in results) else 1
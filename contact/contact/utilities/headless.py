@@ -0,0 +1,251 @@
+import logging
+import time
+from collections import Counter
+from dataclasses import asdict
+from functools import partial
+from typing import Any
+
+from meshtastic import BROADCAST_ADDR
+from meshtastic.protobuf import portnums_pb2
+from pubsub import pub
+
+from contact.utilities.control_socket import ControlServer
+from contact.utilities.singleton import app_state, interface_state, ui_state
+
+HISTORY_LIMIT = 50  # messages returned by "history" when no limit is given
+TELEMETRY_SINCE = 24 * 3600  # seconds of telemetry returned when no "since" is given
+
+# Node admin actions an attached UI may forward to the daemon's radio.
+NODE_ADMIN_ACTIONS = ("removeNode", "setFavorite", "removeFavorite", "setIgnored", "removeIgnored")
+
+
+class PacketStats:
+    """Running packet counters for the "stats" command."""
+
+    def __init__(self) -> None:
+        self.started_at = time.time()
+        self.total = 0
+        self.decoded = 0
+        self.last_packet_at: float | None = None
+        self.by_portnum: Counter[str] = Counter()
+        self.by_sender: Counter[int] = Counter()
+
+    def record(self, packet: dict[str, Any]) -> None:
+        self.total += 1
+        self.last_packet_at = time.time()
+        if "from" in packet:
+            self.by_sender[packet["from"]] += 1
+        if "decoded" in packet:
+            self.decoded += 1
+            self.by_portnum[packet["decoded"].get("portnum", "UNKNOWN")] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        uptime = max(time.time() - self.started_at, 1.0)
+        return {
+            "uptime": round(uptime),
+            "total": self.total,
+            "decoded": self.decoded,
+            "encrypted": self.total - self.decoded,
+            "per_minute": round(self.total * 60 / uptime, 2),
+            "last_packet_at": self.last_packet_at,
+            "by_portnum": dict(self.by_portnum.most_common()),
+            "top_senders": [[sender, count] for sender, count in self.by_sender.most_common(10)],
+        }
+
+
+class HeadlessDaemon:
+    """
+    Serves the shared state over a ControlServer while the usual rx/tx/db pipeline runs without curses.
+
+    The daemon owns the radio and the database writes for received packets; attached UIs get
+    every packet as an event and send through the "send_data" command.
+    """
+
+    def __init__(self, socket_path: str) -> None:
+        self.stats = PacketStats()
+        self.server = ControlServer(
+            socket_path,
+            {
+                "status": self.status,
+                "state": self.state,
+                "channels": self.channels,
+                "nodes": self.nodes,
+                "history": self.history,
+                "telemetry": self.telemetry,
+                "nearby": self.nearby,
+                "positions": self.positions,
+                "tracks": self.tracks,
+                "stats": lambda request: self.stats.as_dict(),
+                "send": self.send,
+                "send_data": self.send_data,
+                "node_admin": self.node_admin,
+            },
+        )
+
+    def start(self) -> None:
+        pub.subscribe(self.on_packet, "meshtastic.receive")
+        self.server.start()
+
+    def stop(self) -> None:
+        pub.unsubscribe(self.on_packet, "meshtastic.receive")
+        self.server.stop()
+
+    def on_packet(self, packet: dict[str, Any], interface: Any) -> None:
+        if interface is not interface_state.interface:
+            return  # Only packets from our own radio
+        self.stats.record(packet)
+        node = interface_state.interface.nodesByNum.get(packet.get("from"))
+        self.server.broadcast("packet", packet=packet, node=node)
+
+    @staticmethod
+    def forward_response(connection: Any, packet: dict[str, Any]) -> None:
+        connection.send({"event": "response", "packet": packet})
+
+    # Commands
+
+    def status(self, request: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "my_node_num": interface_state.my_node_num,
+            "connected": interface_state.connected,
+            "reconnecting": interface_state.reconnecting,
+        }
+
+    def state(self, request: dict[str, Any]) -> dict[str, Any]:
+        from contact.utilities.snapshot import build_snapshot  # noqa: PLC0415
+
+        with app_state.lock:
+            return build_snapshot(messages_per_channel=None)
+
+    def channels(self, request: dict[str, Any]) -> list[Any]:
+        with app_state.lock:
+            return list(ui_state.channel_list)
+
+    def nodes(self, request: dict[str, Any]) -> list[dict[str, Any]]:
+        """Every node, or those matching "filter" (the node pane's filter syntax, e.g. "hops:<=1 sort:snr")."""
+        from contact.utilities.node_query import parse_node_query  # noqa: PLC0415
+        from contact.utilities.utils import get_node_list  # noqa: PLC0415
+
+        query_text = request.get("filter")
+        if query_text:
+            parse_node_query(query_text)  # Report a bad filter instead of ignoring it
+        with app_state.lock:
+            nodes_by_num = interface_state.interface.nodesByNum
+            node_list = get_node_list(query_text) if query_text else ui_state.node_list
+            return [nodes_by_num[num] for num in node_list if num in nodes_by_num]
+
+    def history(self, request: dict[str, Any]) -> list[list[str]]:
+        from contact.utilities.db_handler import reload_channel_messages  # noqa: PLC0415
+        from contact.utilities.message_window import MessageWindows  # noqa: PLC0415
+
+        limit = int(request.get("limit", HISTORY_LIMIT))
+        with app_state.lock:
+            channel_id = self._channel_id(request.get("channel", 0))
+            windows = ui_state.all_messages
+            if isinstance(windows, MessageWindows):
+                if windows.start_reload(channel_id):  # Dropped to save memory; read back now to answer
+                    reload_channel_messages(channel_id, windows)
+                windows.touch(channel_id)
+            messages = ui_state.all_messages.get(channel_id, [])
+            return [list(entry) for entry in messages[-limit:]] if limit > 0 else []
+
+    def telemetry(self, request: dict[str, Any]) -> Any:
+        """A node's series for one metric, or with no node, every node's summary of it over the range."""
+        from contact.utilities.telemetry_store import query_telemetry, summarize_telemetry  # noqa: PLC0415
+
+        metric = request.get("metric", "device.batteryLevel")
+        start = time.time() - float(request.get("since", TELEMETRY_SINCE))
+        node = request.get("node")
+        if node is None:
+            return {str(num): asdict(sample) for num, sample in summarize_telemetry(metric, start).items()}
+        if isinstance(node, str):
+            node = int(node.lstrip("!"), 16)
+        return [asdict(sample) for sample in query_telemetry(node, metric, start, resolution=request.get("resolution"))]
+
+    def nearby(self, request: dict[str, Any]) -> list[dict[str, Any]]:
+        """Nodes last heard within "km" of "lat"/"lon", nearest first."""
+        from contact.utilities.position_store import nodes_within  # noqa: PLC0415
+
+        found = nodes_within(float(request["lat"]), float(request["lon"]), float(request.get("km", 1.0)))
+        return [{**asdict(point), "distance_km": round(distance, 3)} for distance, point in found]
+
+    def positions(self, request: dict[str, Any]) -> list[dict[str, Any]]:
+        """Last-known positions inside "south", "west", "north", "east"."""
+        from contact.utilities.position_store import positions_in_bbox  # noqa: PLC0415
+
+        box = [float(request[edge]) for edge in ("south", "west", "north", "east")]
+        return [asdict(point) for point in positions_in_bbox(*box)]
+
+    def tracks(self, request: dict[str, Any]) -> Any:
+        """Tracks as a GeoJSON object, or with "format": "gpx", as a GPX document."""
+        from contact.utilities.position_store import (  # noqa: PLC0415
+            load_tracks,
+            node_names,
+            tracks_to_geojson,
+            tracks_to_gpx,
+        )
+
+        nodes = [int(node.lstrip("!"), 16) if isinstance(node, str) else node for node in request.get("nodes", [])]
+        since = request.get("since")
+        tracks = load_tracks(nodes, time.time() - float(since) if since else None)
+        names = node_names(list(tracks))
+        return tracks_to_gpx(tracks, names) if request.get("format") == "gpx" else tracks_to_geojson(tracks, names)
+
+    def send(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Send a chat message the same way the UI does, so it is stored and tracked for ACKs."""
+        from contact.message_handlers.tx_handler import send_message  # noqa: PLC0415
+
+        text = request.get("text")
+        if not text:
+            raise ValueError("Nothing to send")
+        with app_state.lock:
+            channel_id = self._channel_id(request.get("channel", 0))
+            if channel_id not in ui_state.channel_list:
+                if not isinstance(channel_id, int):
+                    raise ValueError(f"Unknown channel '{channel_id}'")
+                ui_state.channel_list.append(channel_id)  # Direct message to a node without a chat yet
+            send_message(text, channel=ui_state.channel_list.index(channel_id))
+        return {"channel": channel_id}
+
+    def send_data(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Transmit for an attached UI; responses come back to that client only, as "response" events."""
+        on_response = partial(self.forward_response, self.server.requester()) if request.get("callback") else None
+        packet = interface_state.interface.sendData(
+            request["data"],
+            destinationId=request.get("destinationId", BROADCAST_ADDR),
+            portNum=request.get("portNum", portnums_pb2.PortNum.PRIVATE_APP),
+            wantAck=request.get("wantAck", False),
+            wantResponse=request.get("wantResponse", False),
+            onResponse=on_response,
+            onResponseAckPermitted=request.get("ackPermitted", False),
+            channelIndex=request.get("channelIndex", 0),
+            hopLimit=request.get("hopLimit"),
+        )
+        return {"id": packet.id}
+
+    def node_admin(self, request: dict[str, Any]) -> None:
+        action = request.get("action")
+        if action not in NODE_ADMIN_ACTIONS:
+            raise ValueError(f"Unknown node action '{action}'")
+        node_num = request["node"]
+        getattr(interface_state.interface.localNode, action)(node_num)
+
+        with app_state.lock:
+            nodes_by_num = interface_state.interface.nodesByNum
+            if action == "removeNode":
+                node = nodes_by_num.pop(node_num, None)
+                interface_state.interface.nodes.pop(f"!{node_num:08x}", None)
+                if node is not None and node_num in ui_state.node_list:
+                    ui_state.node_list.remove(node_num)
+            elif node_num in nodes_by_num:
+                field = "isFavorite" if action.endswith("Favorite") else "isIgnored"
+                nodes_by_num[node_num][field] = action.startswith("set")
+        logging.info("%s %s on behalf of an attached client", action, node_num)
+
+    @staticmethod
+    def _channel_id(channel: Any) -> Any:
+        """Accept a channel index, a channel name or a node number (for direct messages)."""
+        if isinstance(channel, int) and 0 <= channel < len(ui_state.channel_list):
+            return ui_state.channel_list[channel]
+        if isinstance(channel, str) and channel.startswith("!"):
+            return int(channel[1:], 16)
+        return channel
@@ -1,24 +1,44 @@
+import logging
+from collections.abc import Callable
+
 import contact.ui.default_config as config
-from contact.utilities.ini_utils import parse_ini_file
+from contact.utilities.ini_utils import load_catalog
 
-_translations = {}
-_language = None
+_translations: dict[str, str] = {}
+_language: str | None = None
+_listeners: list[Callable[[str], None]] = []
 
 
-def _load_translations() -> None:
+def set_language(language: str) -> None:
+    """Switch the UI language: load its compiled catalog and rebind the lookup table t() reads from."""
     global _translations, _language  # noqa: PLW0603
-    language = config.language
-    if _translations and _language == language:
-        return
-
-    translation_file = config.get_localisation_file(language)
-    _translations, _ = parse_ini_file(translation_file)
+    _translations, _ = load_language_catalog(language)
     _language = language
+    config.language = language
+
+    for listener in _listeners:
+        listener(language)
+
+
+def load_language_catalog(language: str) -> tuple[dict[str, str], dict[str, str]]:
+    """The (field_mapping, help_text) catalog of a language; English if it can't be read, empty if that can't either."""
+    for name in dict.fromkeys((language, "en")):
+        try:
+            return load_catalog(config.get_localisation_file(name), config.translations_cache_dir)
+        except OSError as e:
+            logging.error("Unable to load translations for '%s': %s", name, e)
+    return {}, {}
+
+
+def on_language_change(listener: Callable[[str], None]) -> None:
+    """Call listener(language) after every set_language(), e.g. to rebind a module's own tables."""
+    _listeners.append(listener)
 
 
 def t(key: str, default: str | None = None, **kwargs: object) -> str:
-    _load_translations()
     text = _translations.get(key, default if default is not None else key)
+    if not kwargs:
+        return text
     try:
         return text.format(**kwargs)
     except Exception:
@@ -27,3 +47,6 @@ def t(key: str, default: str | None = None, **kwargs: object) -> str:
 
 def t_text(text: str, **kwargs: object) -> str:
     return t(text, default=text, **kwargs)
+
+
+set_language(config.language)
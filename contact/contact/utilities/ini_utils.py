@@ -1,13 +1,15 @@
-from contact.utilities import i18n
+import logging
+import os
+import pickle
+
+CATALOG_VERSION = 1  # bump when the parsed catalog format changes
+DEFAULT_HELP = "No help available."
+
+_catalogs: dict[str, tuple[tuple[int, int], tuple[dict[str, str], dict[str, str]]]] = {}
 
 
 def parse_ini_file(ini_file_path: str) -> tuple[dict[str, str], dict[str, str]]:
     """Parses an INI file and returns a mapping of keys to human-readable names and help text."""
-    try:
-        default_help = i18n.t("ui.help.no_help", default="No help available.")
-    except Exception:
-        default_help = "No help available."
-
     field_mapping: dict[str, str] = {}
     help_text: dict[str, str] = {}
     current_section: str | None = None
@@ -41,13 +43,72 @@ def parse_ini_file(ini_file_path: str) -> tuple[dict[str, str], dict[str, str]]:
                 field_mapping[full_key] = human_readable_name
 
                 # Handle help text or default
-                help = parts[2] if len(parts) == 3 and parts[2] else default_help  # noqa: PLR2004
+                help = parts[2] if len(parts) == 3 and parts[2] else None  # noqa: PLR2004
                 help_text[full_key] = help
 
             else:
                 # Handle cases with only the key present
                 full_key = f"{current_section}.{key}" if current_section else key
                 field_mapping[full_key] = key
-                help_text[full_key] = default_help
+                help_text[full_key] = None
+
+    # The fallback help text comes from the same file, so it is in the same language
+    default_help = field_mapping.get("ui.help.no_help", DEFAULT_HELP)
+    for full_key, help in help_text.items():
+        if help is None:
+            help_text[full_key] = default_help
 
     return field_mapping, help_text
+
+
+def load_catalog(ini_file_path: str, cache_dir: str | None = None) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Same result as parse_ini_file, compiled once per version of the INI file.
+
+    Catalogs are kept in memory for the life of the process and pickled to cache_dir keyed by
+    the file's mtime and size, so later launches skip parsing until the INI is edited.
+    """
+    stat = os.stat(ini_file_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    memo = _catalogs.get(ini_file_path)
+    if memo and memo[0] == stamp:
+        return memo[1]
+
+    cache_path = None
+    catalog = None
+    if cache_dir:
+        name = os.path.splitext(os.path.basename(ini_file_path))[0]
+        cache_path = os.path.join(cache_dir, f"i18n-{name}.v{CATALOG_VERSION}.pickle")
+        try:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)  # only ever written by _write_catalog_cache, in the user's config dir
+            if cached["source"] == os.path.abspath(ini_file_path) and cached["stamp"] == stamp:
+                catalog = cached["catalog"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable translation cache {cache_path}: {e}")
+
+    if catalog is None:
+        catalog = parse_ini_file(ini_file_path)
+        if cache_path:
+            _write_catalog_cache(cache_path, ini_file_path, stamp, catalog)
+
+    _catalogs[ini_file_path] = (stamp, catalog)
+    return catalog
+
+
+def _write_catalog_cache(cache_path: str, ini_file_path: str, stamp: tuple[int, int], catalog: tuple) -> None:
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                {"source": os.path.abspath(ini_file_path), "stamp": stamp, "catalog": catalog},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logging.warning(f"Unable to write translation cache {cache_path}: {e}")
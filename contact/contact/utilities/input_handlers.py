@@ -2,6 +2,7 @@ import base64
 import binascii
 import curses
 import ipaddress
+from collections.abc import Callable
 
 from contact.ui.colors import get_color
 from contact.ui.dialog import dialog
@@ -25,7 +26,7 @@ def get_dialog_width() -> int:
         return MAX_DIALOG_WIDTH
 
 
-def invalid_input(window: curses.window, message: str, redraw_func: callable | None = None) -> None:
+def invalid_input(window: curses.window, message: str, redraw_func: Callable[[], None] | None = None) -> None:
     """Displays an invalid input message in the given window and redraws if needed."""
     cursor_y, cursor_x = window.getyx()
     curses.curs_set(0)
@@ -336,9 +337,7 @@ def get_admin_key_input(current_value: list[bytes]) -> list[str] | None:  # noqa
 
         # Move cursor to the correct position inside the field
         curses.curs_set(1)
-        admin_key_win.move(
-            3 + cursor_pos, 18 + len(user_values[cursor_pos])
-        )  # Position cursor at end of text  # noqa: PLR2004
+        admin_key_win.move(3 + cursor_pos, 18 + len(user_values[cursor_pos]))  # Position cursor at end of text  # noqa: PLR2004
 
         # Show error message if needed
         if invalid_input_msg:
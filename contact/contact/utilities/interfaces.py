@@ -1,16 +1,54 @@
 import logging
+from argparse import Namespace
 
-import meshtastic.ble_interface
-import meshtastic.serial_interface
-import meshtastic.tcp_interface
+# The meshtastic transports are imported inside each branch so that only the one
+# actually used gets loaded. The BLE stack in particular is slow to import.
 
 
-def initialize_interface(args):  # noqa: PLR0912
+def parse_interface_spec(spec: str) -> Namespace:
+    """'serial:/dev/ttyUSB0', 'tcp:host[:port]', 'ble:name' or 'replay:capture', as args for initialize_interface."""
+    kind, _, address = spec.partition(":")
+    connection = Namespace(port=None, host=None, ble=None, replay=None, replay_speed=1.0)
+    if kind == "serial":
+        connection.port = address or None
+    elif kind == "tcp":
+        connection.host = address or "localhost"
+    elif kind == "ble":
+        connection.ble = address or "any"
+    elif kind == "replay" and address:
+        connection.replay = address
+    else:
+        raise ValueError(f"Unknown interface '{spec}', expected serial:, tcp:, ble: or replay:")
+    return connection
+
+
+def describe_connection(args) -> str:
+    """A short name for the connection args describe, for logs."""
+    if getattr(args, "replay", None):
+        return f"replay:{args.replay}"
+    if args.ble:
+        return f"ble:{args.ble}"
+    if args.host:
+        return f"tcp:{args.host}"
+    return f"serial:{args.port}" if args.port else "serial"
+
+
+def initialize_interface(args):  # noqa: PLR0911, PLR0912
+    """Connect as args say; None if that failed (the reason is logged)."""
     try:
-        if args.ble:
+        if getattr(args, "replay", None):
+            from contact.utilities.capture import ReplayInterface  # noqa: PLC0415
+
+            return ReplayInterface(args.replay, args.replay_speed)
+
+        elif args.ble:
+            import meshtastic.ble_interface  # noqa: PLC0415
+
             return meshtastic.ble_interface.BLEInterface(args.ble if args.ble != "any" else None)
 
         elif args.host:
+            import meshtastic.tcp_interface  # noqa: PLC0415
+
             try:
                 if ":" in args.host:
                     tcp_hostname, tcp_port = args.host.split(":")
@@ -21,23 +59,32 @@ def initialize_interface(args):  # noqa: PLR0912
             except Exception as ex:
                 logging.error(f"Error connecting to {args.host}. {ex}")
         else:
+            import meshtastic.serial_interface  # noqa: PLC0415
+
             try:
                 client = meshtastic.serial_interface.SerialInterface(args.port)
             except FileNotFoundError as ex:
                 logging.error(f"The serial device at '{args.port}' was not found. {ex}")
+                return None
             except PermissionError as ex:
                 logging.error(
                     f"You probably need to add yourself to the `dialout` group to use a serial connection. {ex}"
                 )
-            except Exception as ex:
-                logging.error(f"Unexpected error initializing interface: {ex}")
+                return None
             except OSError as ex:
                 logging.error(f"The serial device couldn't be opened, it might be in use by another process. {ex}")
+                return None
+            except Exception as ex:
+                logging.error(f"Unexpected error initializing interface: {ex}")
+                return None
             if client.devPath is None:
+                import meshtastic.tcp_interface  # noqa: PLC0415
+
                 try:
                     client = meshtastic.tcp_interface.TCPInterface("localhost")
                 except Exception as ex:
                     logging.error(f"Error connecting to localhost:{ex}")
+                    return None
 
             return client
 
@@ -0,0 +1,166 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from typing import Any
+
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+# Subsystems that can be given their own level, by module prefix. Anything else is "app".
+SUBSYSTEMS = {
+    "rx": ("contact.message_handlers.rx_handler",),
+    "tx": ("contact.message_handlers.tx_handler",),
+    "db": ("contact.utilities.db_handler",),
+    "ui": ("contact.ui",),
+    "daemon": ("contact.utilities.headless", "contact.utilities.control_socket", "contact.utilities.remote_interface"),
+    "radio": ("meshtastic", "contact.utilities.interfaces", "contact.utilities.capture"),
+}
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_subsystem_cache: dict[tuple[str, str], str] = {}
+_listener: logging.handlers.QueueListener | None = None
+_listener_lock = threading.Lock()
+
+
+def _module_name(record: logging.LogRecord) -> str:
+    # The app logs through the root logger, so contact modules are told apart by file path.
+    if record.name != "root":
+        return record.name
+    path = os.path.abspath(record.pathname)
+    if not path.startswith(_PACKAGE_DIR + os.sep):
+        return record.module
+    relative = os.path.relpath(path, os.path.dirname(_PACKAGE_DIR))
+    return os.path.splitext(relative)[0].replace(os.sep, ".")
+
+
+def subsystem_of(record: logging.LogRecord) -> str:
+    key = (record.name, record.pathname)
+    subsystem = _subsystem_cache.get(key)
+    if subsystem is None:
+        module = _module_name(record)
+        subsystem = next(
+            (
+                name
+                for name, prefixes in SUBSYSTEMS.items()
+                if any(module == prefix or module.startswith(prefix + ".") for prefix in prefixes)
+            ),
+            "app",
+        )
+        _subsystem_cache[key] = subsystem
+    return subsystem
+
+
+def _parse_level(level: Any, fallback: int) -> int:
+    if isinstance(level, int):
+        return level
+    parsed = logging.getLevelName(str(level).upper())
+    return parsed if isinstance(parsed, int) else fallback
+
+
+class SubsystemFilter(logging.Filter):
+    """Drops records below their subsystem's level before they are queued."""
+
+    def __init__(self, default_level: int, levels: dict[str, int]) -> None:
+        super().__init__()
+        self.default_level = default_level
+        self.levels = levels
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        subsystem = subsystem_of(record)
+        record.subsystem = subsystem
+        return record.levelno >= self.levels.get(subsystem, self.default_level)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line: time, level, subsystem, thread, message and any traceback."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "subsystem": getattr(record, "subsystem", "app"),
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only the %-merge happens on the calling thread; JSON encoding and the write are the listener's.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(
+    log_file_path: str,
+    level: Any = "INFO",
+    levels: dict[str, Any] | None = None,
+    max_bytes: int | str = LOG_MAX_BYTES,
+    backup_count: int | str = LOG_BACKUP_COUNT,
+) -> None:
+    """
+    Route all logging through a queue to a rotating JSON-lines file written by a background thread.
+
+    levels sets per-subsystem levels on top of level, e.g. {"rx": "DEBUG", "radio": "WARNING"}.
+    """
+    global _listener  # noqa: PLW0603
+
+    default_level = _parse_level(level, logging.INFO)
+    try:
+        max_bytes, backup_count = int(max_bytes), int(backup_count)
+    except ValueError:
+        max_bytes, backup_count = LOG_MAX_BYTES, LOG_BACKUP_COUNT
+    subsystem_levels = {name: _parse_level(value, default_level) for name, value in (levels or {}).items()}
+    unknown = set(subsystem_levels) - set(SUBSYSTEMS) - {"app"}
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True
+    )
+    file_handler.setFormatter(JsonLinesFormatter())
+
+    queue_handler = _QueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(SubsystemFilter(default_level, subsystem_levels))
+
+    with _listener_lock:
+        stop_logging()
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        # The root level is the most verbose one asked for, so disabled calls stay a single level check.
+        root.setLevel(min([default_level, *subsystem_levels.values()]))
+        _listener = logging.handlers.QueueListener(queue_handler.queue, file_handler)
+        _listener.start()
+
+    if unknown:
+        logging.warning("Unknown log subsystems %s; known: %s", sorted(unknown), ", ".join(SUBSYSTEMS))
+
+
+def stop_logging() -> None:
+    """Flush queued records to the file and stop the writer thread."""
+    global _listener  # noqa: PLW0603
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
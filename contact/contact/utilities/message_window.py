@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from typing import Any
+
+MESSAGE_WINDOW = 500  # lines (messages and hour headers) kept in memory per channel
+RESIDENT_CHANNELS = 16  # channels whose lines stay in memory; the rest are read back from the database when shown
+
+
+def is_header(entry: tuple[str, str]) -> bool:
+    return entry[0].startswith("--")
+
+
+class MessageWindows(dict):
+    """
+    ui_state.all_messages: the latest lines of each channel, for the channels used most recently.
+
+    A channel keeps at most MESSAGE_WINDOW lines. Past RESIDENT_CHANNELS, the least recently used channel's
+    list is emptied, keeping the channel and the list object (the merged view shares it), and is filled again
+    from the database the next time the channel is shown. Memory stays flat however long the client runs.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._recent: OrderedDict[Any, None] = OrderedDict.fromkeys(self)
+        self.evicted: set[Any] = set()
+        self._loading: dict[Any, int] = {}  # channel -> its length when the reload was queued
+
+    def touch(self, channel: Any, keep: Any = None) -> None:
+        """Mark channel as just used, emptying the least recently used ones (never keep) beyond the limit."""
+        self._recent[channel] = None
+        self._recent.move_to_end(channel)
+        for old in list(self._recent):
+            if len(self._recent) <= RESIDENT_CHANNELS:
+                break
+            if old in {channel, keep}:
+                continue
+            del self._recent[old]
+            if old in self:
+                self[old].clear()
+                self.evicted.add(old)
+                self._loading.pop(old, None)
+
+    def trim(self, channel: Any) -> None:
+        """Drop a channel's oldest lines beyond MESSAGE_WINDOW, keeping the hour header over the first one left."""
+        messages = self[channel]
+        excess = len(messages) - MESSAGE_WINDOW
+        if excess <= 0:
+            return
+        header = next((entry for entry in reversed(messages[:excess]) if is_header(entry)), None)
+        del messages[:excess]
+        if header is not None and messages and not is_header(messages[0]):
+            messages[0] = header  # In place of the oldest line left, so the window keeps its size
+            if len(messages) > 1 and is_header(messages[1]):
+                del messages[0]  # No line of that hour was left
+
+    def start_reload(self, channel: Any) -> bool:
+        """True if channel was emptied and should be read back; it then counts as loading until refill()."""
+        if channel not in self.evicted:
+            return False
+        self.evicted.discard(channel)
+        self._loading[channel] = len(self.get(channel, ()))
+        return True
+
+    def refill(self, channel: Any, stored: list[tuple[str, str]]) -> None:
+        """
+        Put a channel's stored lines back, ahead of lines added since start_reload(), which the database may not
+        have yet. Lines added before it, while the channel was emptied, were written first and are in stored.
+        """
+        start = self._loading.pop(channel, None)
+        if start is None or channel not in self:
+            return  # Emptied again meanwhile
+        messages = self[channel]
+        newer = messages[start:]
+        if newer and stored and is_header(newer[0]) and newer[0] == next(filter(is_header, reversed(stored)), None):
+            newer = newer[1:]  # Same hour as the last stored line
+        messages[:] = stored + newer
+        self.trim(channel)
+
+
+def find_sent_entry(messages: list[tuple[str, str]], entry: tuple[str, str]) -> int | None:
+    """
+    Where a sent message's line is now, searching from the newest. Lines move as a channel is trimmed and
+    are replaced when it is read back, so this matches the line itself, then an unconfirmed line of the same text.
+    """
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index] is entry:
+            return index
+    for index in range(len(messages) - 1, -1, -1):
+        prefix, message = messages[index]
+        if message == entry[1] and prefix.endswith(entry[0].split("] ", 1)[-1]):
+            return index
+    return None
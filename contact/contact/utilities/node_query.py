@@ -0,0 +1,248 @@
+import bisect
+import functools
+import re
+import time
+import weakref
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+# Node filter syntax, terms separated by spaces and all of them required:
+#   role:router,repeater   hw:tbeam   hops:<=2   heard:<30m   pos   enc   fav   ignored
+#   sort:hops,-heard       any other word matches the long or short name, or the !node id
+# A leading "-" negates a term; in sort: it reverses that key.
+MISSING_HOPS = 100  # nodes with unknown hops sort after every known distance
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+COMPARISONS: dict[str, Callable[[float, float], bool]] = {
+    "<=": lambda a, b: a <= b,
+    ">=": lambda a, b: a >= b,
+    "<": lambda a, b: a < b,
+    ">": lambda a, b: a > b,
+    "=": lambda a, b: a == b,
+}
+_COMPARISON = re.compile(r"^(<=|>=|<|>|=)?(.+)$")
+
+
+class NodeKeys(NamedTuple):
+    """What filters and sorts look at for one node, taken from its nodesByNum entry. A tuple, to compare fast."""
+
+    num: int
+    name: str  # casefolded long name
+    short_name: str  # casefolded
+    role: str
+    hw_model: str
+    hops: int | None
+    last_heard: int
+    snr: float | None
+    has_position: bool
+    encrypted: bool
+    favorite: bool
+    ignored: bool
+
+    @classmethod
+    def of(cls, node: dict[str, Any]) -> "NodeKeys":
+        user = node.get("user", {})
+        position = node.get("position", {})
+        last_heard = node.get("lastHeard")
+        return cls(
+            num=node["num"],
+            name=str(user.get("longName", "")).casefold(),
+            short_name=str(user.get("shortName", "")).casefold(),
+            role=str(user.get("role", "CLIENT")).casefold(),
+            hw_model=str(user.get("hwModel", "")).casefold(),
+            hops=node.get("hopsAway"),
+            last_heard=last_heard if isinstance(last_heard, int) else 0,
+            snr=node.get("snr"),
+            has_position=bool(position.get("latitudeI") or position.get("latitude")),
+            encrypted=bool(user.get("publicKey")),
+            favorite=bool(node.get("isFavorite")),
+            ignored=bool(node.get("isIgnored")),
+        )
+
+
+# Each key puts the "best" node first: most recently heard, fewest hops, strongest signal, A to Z.
+SORT_KEYS: dict[str, Callable[[NodeKeys], Any]] = {
+    "heard": lambda keys: -keys.last_heard,
+    "name": lambda keys: keys.name,
+    "hops": lambda keys: MISSING_HOPS if keys.hops is None else keys.hops,
+    "snr": lambda keys: float("inf") if keys.snr is None else -keys.snr,
+    "role": lambda keys: keys.role,
+    "hw": lambda keys: keys.hw_model,
+}
+# config.node_sort values; anything else sorts by last heard.
+CONFIG_SORTS = {"lastHeard": "heard", "name": "name", "hops": "hops"}
+
+Predicate = Callable[[NodeKeys, float], bool]  # keys, now
+
+
+@dataclass(frozen=True)
+class NodeQuery:
+    filters: tuple[Predicate, ...] = ()
+    sort: tuple[tuple[str, bool], ...] = ()  # (key, reversed)
+
+    def matches(self, keys: NodeKeys, now: float) -> bool:
+        return all(predicate(keys, now) for predicate in self.filters)
+
+
+def _compare(value: str, parse: Callable[[str], float]) -> tuple[Callable[[float, float], bool], float]:
+    match = _COMPARISON.match(value)
+    if match is None:
+        raise ValueError(f"Missing value in '{value}'")
+    return COMPARISONS[match[1] or "="], parse(match[2])
+
+
+def parse_duration(text: str) -> float:
+    """Seconds in "90", "30m", "2h", "1d" or "1w"."""
+    unit = DURATION_UNITS.get(text[-1:].lower())
+    try:
+        return float(text[:-1]) * unit if unit else float(text)
+    except ValueError:
+        raise ValueError(f"Not a duration: '{text}'") from None
+
+
+def _term(name: str, value: str) -> Predicate:  # noqa: PLR0911
+    if name == "role":
+        roles = set(value.casefold().split(","))
+        return lambda keys, now: keys.role in roles
+    if name == "hw":
+        fragment = value.casefold()
+        return lambda keys, now: fragment in keys.hw_model
+    if name == "hops":
+        compare, hops = _compare(value, int)
+        return lambda keys, now: keys.hops is not None and compare(keys.hops, hops)
+    if name == "heard":
+        # heard:<1h is "heard within the last hour", heard:>1d "not heard for a day"
+        compare, seconds = _compare(value if value[:1] in "<>=" else f"<{value}", parse_duration)
+        return lambda keys, now: keys.last_heard > 0 and compare(now - keys.last_heard, seconds)
+    if name in {"pos", "position"}:
+        return lambda keys, now: keys.has_position
+    if name in {"enc", "encrypted", "secure"}:
+        return lambda keys, now: keys.encrypted
+    if name in {"fav", "favorite"}:
+        return lambda keys, now: keys.favorite
+    if name == "ignored":
+        return lambda keys, now: keys.ignored
+    raise ValueError(f"Unknown filter '{name}'")
+
+
+def _name_matches(word: str) -> Predicate:
+    word = word.casefold()
+    return lambda keys, now: word in keys.name or word in keys.short_name or word in f"!{keys.num:08x}"
+
+
+@functools.lru_cache(maxsize=32)
+def parse_node_query(text: str) -> NodeQuery:
+    """Compile a filter such as "role:router hops:<=2 -fav sort:heard". Raises ValueError on unknown terms."""
+    filters: list[Predicate] = []
+    sort: list[tuple[str, bool]] = []
+    for word in text.split():
+        negate = word.startswith("-") and len(word) > 1
+        term = word[1:] if negate else word
+        name, _, value = term.partition(":")
+        name = name.lower()
+        if name == "sort":
+            for key in value.split(","):
+                if key.lstrip("-") not in SORT_KEYS:
+                    raise ValueError(f"Unknown sort key '{key}'")
+                sort.append((key.lstrip("-"), key.startswith("-")))
+            continue
+        if value or name in {"pos", "position", "enc", "encrypted", "secure", "fav", "favorite", "ignored"}:
+            predicate = _term(name, value)
+        else:
+            predicate = _name_matches(term)
+        filters.append((lambda keys, now, test=predicate: not test(keys, now)) if negate else predicate)
+    return NodeQuery(tuple(filters), tuple(sort))
+
+
+class _Reversed:
+    """Sorts its value in reverse, for descending text keys."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __lt__(self, other: "_Reversed") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Reversed) and other.value == self.value
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+
+def sort_key(keys: NodeKeys, sort: tuple[tuple[str, bool], ...]) -> tuple[Any, ...]:
+    """Favorites first and ignored nodes last, then the given keys; the node number breaks ties."""
+    ordered = []
+    for name, reverse in sort:
+        value = SORT_KEYS[name](keys)
+        ordered.append((-value if isinstance(value, (int, float)) else _Reversed(value)) if reverse else value)
+    return (keys.ignored, not keys.favorite, *ordered, keys.num)
+
+
+class NodeIndex:
+    """
+    Filter and sort keys for every node of one interface, kept up to date a node at a time.
+
+    Each sort order in use is kept as a sorted list of precomputed sort keys. A changed node is moved
+    within it by bisection, so a packet costs one key comparison if nothing that sorts or filters on
+    changed, and a list insertion otherwise, rather than a sort of every node.
+    """
+
+    MAX_ORDERS = 8  # sort orders kept; the least recently added is dropped beyond this
+
+    def __init__(self) -> None:
+        self.keys: dict[int, NodeKeys] = {}
+        self._orders: dict[tuple[tuple[str, bool], ...], list[tuple[Any, ...]]] = {}
+
+    def rebuild(self, nodes: Iterable[dict[str, Any]]) -> None:
+        self.keys = {node["num"]: NodeKeys.of(node) for node in nodes if "num" in node}
+        self._orders.clear()
+
+    def update(self, node: dict[str, Any] | None, node_num: int) -> bool:
+        """Refresh one node's keys (dropping it if it is gone). True if anything changed."""
+        old = self.keys.get(node_num)
+        new = NodeKeys.of(node) if node is not None and "num" in node else None  # Unindexed, as in rebuild()
+        if old == new:
+            return False
+        for sort, order in self._orders.items():
+            if old is not None:
+                del order[bisect.bisect_left(order, sort_key(old, sort))]
+            if new is not None:
+                bisect.insort(order, sort_key(new, sort))
+        if new is None:
+            del self.keys[node_num]
+        else:
+            self.keys[node_num] = new
+        return True
+
+    def select(self, query: NodeQuery, default_sort: str, pinned: int | None = None) -> list[int]:
+        """Node numbers matching query, in its sort order (default_sort without one). pinned, our node, leads."""
+        order = self._order(query.sort or ((default_sort, False),))
+        if query.filters:
+            now = time.time()
+            keys = self.keys
+            nums = [entry[-1] for entry in order if entry[-1] != pinned and query.matches(keys[entry[-1]], now)]
+        else:
+            nums = [entry[-1] for entry in order if entry[-1] != pinned]
+        return nums if pinned is None else [pinned, *nums]
+
+    def _order(self, sort: tuple[tuple[str, bool], ...]) -> list[tuple[Any, ...]]:
+        order = self._orders.get(sort)
+        if order is None:
+            if len(self._orders) >= self.MAX_ORDERS:
+                del self._orders[next(iter(self._orders))]
+            order = self._orders[sort] = sorted(sort_key(keys, sort) for keys in self.keys.values())
+        return order
+
+
+_indexes: "weakref.WeakKeyDictionary[Any, NodeIndex]" = weakref.WeakKeyDictionary()
+
+
+def index_for(interface: Any) -> NodeIndex:
+    """The node index of an interface, one per radio."""
+    index = _indexes.get(interface)
+    if index is None:
+        index = _indexes[interface] = NodeIndex()
+    return index
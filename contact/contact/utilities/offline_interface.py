@@ -0,0 +1,53 @@
+from typing import Any
+
+from meshtastic.protobuf import channel_pb2, localonly_pb2
+
+
+class OfflineNode:
+    """Stands in for meshtastic.node.Node using channels and config that were captured earlier."""
+
+    def __init__(
+        self,
+        node_num: int,
+        channels: list[channel_pb2.Channel] | None = None,
+        local_config: localonly_pb2.LocalConfig | None = None,
+        module_config: localonly_pb2.LocalModuleConfig | None = None,
+    ) -> None:
+        self.nodeNum = node_num
+        self.channels = channels or []
+        self.localConfig = local_config or localonly_pb2.LocalConfig()
+        self.moduleConfig = module_config or localonly_pb2.LocalModuleConfig()
+
+    def getChannelByChannelIndex(self, channelIndex: int) -> channel_pb2.Channel | None:  # noqa: N802, N803
+        if 0 <= channelIndex < len(self.channels):
+            return self.channels[channelIndex]
+        return None
+
+
+class OfflineInterface:
+    """
+    Implements the subset of the meshtastic interface API the UI reads from, without a radio.
+
+    Anything that would transmit raises ConnectionError; callers check interface_state.connected first.
+    """
+
+    def __init__(self, my_node_num: int, nodes: dict[str, dict[str, Any]], local_node: OfflineNode) -> None:
+        self.myInfo = {"myNodeNum": my_node_num}
+        self.nodes = nodes
+        self.nodesByNum = {node["num"]: node for node in nodes.values() if "num" in node}
+        self.localNode = local_node
+
+    def getMyNodeInfo(self) -> dict[str, Any] | None:  # noqa: N802
+        return self.nodesByNum.get(self.myInfo["myNodeNum"])
+
+    def getNode(self, nodeId: str, requestChannels: bool = True, **kwargs: Any) -> OfflineNode:  # noqa: N802, N803
+        return self.localNode
+
+    def sendText(self, *args: Any, **kwargs: Any) -> None:  # noqa: N802
+        raise ConnectionError("Not connected to a radio")
+
+    def sendData(self, *args: Any, **kwargs: Any) -> None:  # noqa: N802
+        raise ConnectionError("Not connected to a radio")
+
+    def close(self) -> None:
+        pass
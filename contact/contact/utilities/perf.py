@@ -0,0 +1,187 @@
+import functools
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+HOT_PATH_RING_SIZE = 1024  # samples kept per timer
+HOT_PATH_RATE_WINDOW = 10.0  # seconds of samples behind the per-second rates
+
+
+class StartupProfiler:
+    """
+    Records how long each named startup phase takes.
+
+    Disabled by default so the calls sprinkled through the startup path cost next to nothing.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.ready_at: float | None = None  # when the first screen was painted, which ends startup
+        self.phases: dict[str, float] = {}
+        self._started: dict[str, float] = {}
+
+    def begin(self, name: str) -> None:
+        if self.enabled and name not in self._started:
+            self._started[name] = time.perf_counter()
+
+    def end(self, name: str) -> None:
+        if not self.enabled or name in self.phases or name not in self._started:
+            return
+        self.phases[name] = time.perf_counter() - self._started[name]
+
+    def ready(self) -> None:
+        """Mark startup as done, so the total leaves out the session that follows."""
+        if self.ready_at is None:
+            self.ready_at = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def format_report(self) -> str:
+        lines = ["Startup profile:"]
+        for name, elapsed in self.phases.items():
+            lines.append(f"  {name:<24} {elapsed * 1000:9.1f} ms")
+        end = time.perf_counter() if self.ready_at is None else self.ready_at
+        lines.append(f"  {'total':<24} {(end - self.origin) * 1000:9.1f} ms")
+        return "\n".join(lines)
+
+    def log_report(self) -> None:
+        if self.enabled and self.phases:
+            logging.info(self.format_report())
+
+
+class HotPathMetrics:
+    """
+    Timers and gauges for the receive, transmit, database and drawing paths.
+
+    Each timer keeps its latest samples in a bounded deque. Appending to a deque is atomic, so the
+    rx thread, the UI thread and readers of the panel never take a lock. Disabled by default;
+    a disabled timer costs one attribute check per call.
+    """
+
+    def __init__(self, ring_size: int = HOT_PATH_RING_SIZE) -> None:
+        self.enabled = False
+        self.ring_size = ring_size
+        self.started_at = time.monotonic()
+        self.samples: dict[str, deque[tuple[float, float]]] = {}
+        self.totals: dict[str, int] = {}  # approximate if two threads finish the same timer at once
+        self.gauges: dict[str, Callable[[], float]] = {}
+
+    def enable(self) -> None:
+        if not self.enabled:
+            self.started_at = time.monotonic()
+            self.enabled = True
+
+    def record(self, name: str, duration: float) -> None:
+        ring = self.samples.get(name)
+        if ring is None:
+            ring = self.samples.setdefault(name, deque(maxlen=self.ring_size))
+        ring.append((time.monotonic(), duration))
+        self.totals[name] = self.totals.get(name, 0) + 1
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        """Decorator recording each call of the wrapped function under name."""
+
+        def decorator(func: F) -> F:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - started)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorator
+
+    @contextmanager
+    def track(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def gauge(self, name: str, read: Callable[[], float]) -> None:
+        """Register a queue depth or similar value, read whenever a summary is taken."""
+        self.gauges[name] = read
+
+    def summary(self) -> dict[str, Any]:
+        now = time.monotonic()
+        window = min(HOT_PATH_RATE_WINDOW, max(now - self.started_at, 1e-3))
+        timers = {}
+        for name, ring in list(self.samples.items()):
+            samples = _copy_ring(ring)
+            if not samples:
+                continue
+            durations = sorted(duration for _, duration in samples)
+            recent = sum(1 for at, _ in samples if now - at <= window)
+            timers[name] = {
+                "count": self.totals.get(name, len(samples)),
+                "rate": round(recent / window, 2),
+                "p50_ms": round(durations[len(durations) // 2] * 1000, 3),
+                "p99_ms": round(durations[min(len(durations) - 1, int(len(durations) * 0.99))] * 1000, 3),
+                "max_ms": round(durations[-1] * 1000, 3),
+            }
+
+        gauges = {}
+        for name, read in list(self.gauges.items()):
+            try:
+                gauges[name] = read()
+            except Exception as e:
+                logging.debug("Gauge %s unavailable: %s", name, e)
+        return {"uptime": round(now - self.started_at, 1), "timers": timers, "gauges": gauges}
+
+    def format_lines(self, width: int) -> list[str]:
+        """The summary as fixed-width lines for the performance panel."""
+        summary = self.summary()
+        name_width = max(8, width - 43)
+        lines = [f"{'Timer':<{name_width}} {'count':>7} {'/s':>7} {'p50ms':>8} {'p99ms':>8} {'maxms':>8}"]
+        for name, timer in sorted(summary["timers"].items()):
+            lines.append(
+                f"{name[:name_width]:<{name_width}} {timer['count']:>7} {timer['rate']:>7.1f} "
+                f"{timer['p50_ms']:>8.2f} {timer['p99_ms']:>8.2f} {timer['max_ms']:>8.2f}"
+            )
+        if summary["gauges"]:
+            lines.append("  ".join(f"{name}={value}" for name, value in sorted(summary["gauges"].items())))
+        return [line[:width] for line in lines]
+
+    def dump_json(self, path: str) -> None:
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"generated_at": time.time(), **self.summary()}, f, indent=2)
+            logging.info("Wrote performance metrics to %s", path)
+        except OSError as e:
+            logging.error("Unable to write performance metrics to %s: %s", path, e)
+
+
+def _copy_ring(ring: deque[tuple[float, float]]) -> list[tuple[float, float]]:
+    # Another thread may append mid-copy; the copy is retried rather than locked.
+    for _ in range(3):
+        try:
+            return list(ring)
+        except RuntimeError:
+            continue
+    return []
+
+
+startup_profiler = StartupProfiler()
+hot_path = HotPathMetrics()
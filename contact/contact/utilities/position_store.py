@@ -0,0 +1,307 @@
+import json
+import logging
+import math
+import re
+import sqlite3
+import time
+import xml.etree.ElementTree as ET
+from argparse import Namespace
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import contact.ui.default_config as config
+from contact.utilities.db_handler import owner_node_num
+from contact.utilities.perf import hot_path
+
+# Last-known positions are indexed on a grid of cells this many degrees on a side (about 5.5 km of latitude).
+# An area query seeks the index once per row of cells it covers instead of scanning every node.
+GRID_DEGREES = 0.05
+MAX_CELL_ROWS = 2000  # beyond this many rows of cells a query uses one range over the whole band
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+GPX_NAMESPACE = "http://www.topografix.com/GPX/1/1"
+_TRACK_TABLE = re.compile(r"^(\d+)_positions$")
+
+
+@dataclass
+class TrackPoint:
+    """One fix of a node: where it was (degrees, metres) and when it was heard there (epoch seconds)."""
+
+    node_num: int
+    timestamp: int
+    latitude: float
+    longitude: float
+    altitude: float | None = None
+
+
+def get_track_table_name(owner: int | None = None) -> str:
+    return f'"{owner_node_num() if owner is None else owner}_positions"'
+
+
+def get_last_position_table_name() -> str:
+    return f'"{owner_node_num()}_last_positions"'
+
+
+def create_position_tables(db_connection: sqlite3.Connection) -> None:
+    last_positions = get_last_position_table_name()
+    db_connection.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {get_track_table_name()} (
+            node_num INTEGER,
+            timestamp INTEGER,
+            latitude REAL,
+            longitude REAL,
+            altitude REAL,
+            PRIMARY KEY (node_num, timestamp)
+        ) WITHOUT ROWID
+        """
+    )
+    db_connection.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {last_positions} (
+            node_num INTEGER PRIMARY KEY,
+            timestamp INTEGER,
+            latitude REAL,
+            longitude REAL,
+            altitude REAL,
+            cell_lat INTEGER,
+            cell_lon INTEGER
+        )
+        """
+    )
+    db_connection.execute(
+        f'CREATE INDEX IF NOT EXISTS "{owner_node_num()}_last_positions_cell" ON {last_positions} (cell_lat, cell_lon)'
+    )
+
+
+def grid_cell(degrees: float) -> int:
+    return math.floor(degrees / GRID_DEGREES)
+
+
+def extract_fix(position: dict[str, Any]) -> tuple[float, float, float | None] | None:
+    """Latitude, longitude and altitude of a decoded position, or None when it has no fix."""
+    latitude = position.get("latitude", position.get("latitudeI", 0) / 1e7)
+    longitude = position.get("longitude", position.get("longitudeI", 0) / 1e7)
+    if not latitude and not longitude:
+        return None  # Radios without a fix report 0, 0
+    return latitude, longitude, position.get("altitude")
+
+
+@hot_path.timed("db.record_position")
+def record_position(packet: dict[str, Any], timestamp: float | None = None) -> None:
+    """Add a POSITION_APP fix to its sender's track, unless the node has not moved since its last one."""
+    try:
+        fix = extract_fix(packet["decoded"].get("position", {}))
+        if fix is None:
+            return
+        latitude, longitude, altitude = fix
+        node_num = packet["from"]
+        now = int(time.time() if timestamp is None else timestamp)
+        last_positions = get_last_position_table_name()
+
+        with sqlite3.connect(config.db_file_path) as db_connection:
+            create_position_tables(db_connection)
+            last = db_connection.execute(
+                f"SELECT latitude, longitude, altitude FROM {last_positions} WHERE node_num = ?", (node_num,)
+            ).fetchone()
+            if last != (latitude, longitude, altitude):
+                db_connection.execute(
+                    f"INSERT OR REPLACE INTO {get_track_table_name()} VALUES (?, ?, ?, ?, ?)",
+                    (node_num, now, latitude, longitude, altitude),
+                )
+            # The last-known position is refreshed either way, so it says when the node was last heard there.
+            db_connection.execute(
+                f"INSERT OR REPLACE INTO {last_positions} VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (node_num, now, latitude, longitude, altitude, grid_cell(latitude), grid_cell(longitude)),
+            )
+            db_connection.commit()
+
+    except sqlite3.Error as e:
+        logging.error("SQLite error in record_position: %s", e)
+    except Exception as e:
+        logging.error("Unexpected error in record_position: %s", e)
+
+
+def _longitude_ranges(west: float, east: float) -> list[tuple[float, float]]:
+    """Split a west-to-east span that crosses the antimeridian into two."""
+    if east - west >= 360:  # noqa: PLR2004
+        return [(-180.0, 180.0)]
+    west = (west + 180) % 360 - 180
+    east = (east + 180) % 360 - 180
+    return [(west, east)] if west <= east else [(west, 180.0), (-180.0, east)]
+
+
+def positions_in_bbox(south: float, west: float, north: float, east: float) -> list[TrackPoint]:
+    """Last-known positions inside a box (degrees; west may be greater than east across the antimeridian)."""
+    south, north = max(south, -90.0), min(north, 90.0)
+    rows_of_cells = grid_cell(north) - grid_cell(south) + 1
+    if rows_of_cells <= MAX_CELL_ROWS:
+        lat_clause = f"cell_lat IN ({', '.join(str(cell) for cell in range(grid_cell(south), grid_cell(north) + 1))})"
+    else:
+        lat_clause = f"cell_lat BETWEEN {grid_cell(south)} AND {grid_cell(north)}"
+
+    points = []
+    try:
+        with sqlite3.connect(config.db_file_path) as db_connection:
+            for low, high in _longitude_ranges(west, east):
+                rows = db_connection.execute(
+                    f"""
+                    SELECT node_num, timestamp, latitude, longitude, altitude FROM {get_last_position_table_name()}
+                    WHERE {lat_clause} AND cell_lon BETWEEN ? AND ?
+                        AND latitude BETWEEN ? AND ? AND longitude BETWEEN ? AND ?
+                    """,
+                    (grid_cell(low), grid_cell(high), south, north, low, high),
+                ).fetchall()
+                points.extend(TrackPoint(*row) for row in rows)
+    except sqlite3.Error as e:
+        logging.debug("No positions stored yet: %s", e)
+    return points
+
+
+def nodes_within(latitude: float, longitude: float, radius_km: float) -> list[tuple[float, TrackPoint]]:
+    """Nodes last heard within radius_km of a point, nearest first, with their distance in km."""
+    lat_span = radius_km / KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(min(abs(latitude) + lat_span, 90.0)))
+    lon_span = 360.0 if cos_lat < 1e-9 else radius_km / (KM_PER_DEGREE * cos_lat)  # noqa: PLR2004
+    candidates = positions_in_bbox(latitude - lat_span, longitude - lon_span, latitude + lat_span, longitude + lon_span)
+    found = [(distance_km(latitude, longitude, point.latitude, point.longitude), point) for point in candidates]
+    return sorted(((distance, point) for distance, point in found if distance <= radius_km), key=lambda item: item[0])
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle (haversine) distance."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def load_tracks(
+    nodes: list[int] | None = None, start: float | None = None, owners: list[int] | None = None
+) -> dict[int, list[TrackPoint]]:
+    """
+    Tracks by node, oldest fix first, as recorded by the current radio or by the given ones.
+
+    Fixes that several radios heard at the same moment are only listed once.
+    """
+    tracks: dict[int, list[TrackPoint]] = {}
+    tables = [get_track_table_name(owner) for owner in owners] if owners is not None else [get_track_table_name()]
+    if not tables:
+        return tracks
+    conditions, params = [], []
+    if nodes:
+        conditions.append(f"node_num IN ({', '.join('?' for _ in nodes)})")
+        params.extend(nodes)
+    if start is not None:
+        conditions.append("timestamp >= ?")
+        params.append(int(start))
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = " UNION ".join(
+        f"SELECT node_num, timestamp, latitude, longitude, altitude FROM {table}{where}" for table in tables
+    )
+    try:
+        with sqlite3.connect(config.db_file_path) as db_connection:
+            rows = db_connection.execute(f"{query} ORDER BY node_num, timestamp", params * len(tables)).fetchall()
+    except sqlite3.Error as e:
+        logging.debug("No tracks stored yet: %s", e)
+        return tracks
+    for row in rows:
+        tracks.setdefault(row[0], []).append(TrackPoint(*row))
+    return tracks
+
+
+def track_owners() -> list[int]:
+    """The radios that have recorded tracks in client.db."""
+    try:
+        with sqlite3.connect(config.db_file_path) as db_connection:
+            names = [name for (name,) in db_connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    except sqlite3.Error as e:
+        logging.error("SQLite error in track_owners: %s", e)
+        return []
+    return [int(match[1]) for match in map(_TRACK_TABLE.match, names) if match]
+
+
+def node_names(nodes: list[int], owners: list[int] | None = None) -> dict[int, str]:
+    """Long names from the node databases of the given radios (the current one by default), else node IDs."""
+    known: dict[int, str] = {}
+    with sqlite3.connect(config.db_file_path) as db_connection:
+        for owner in owners if owners is not None else [owner_node_num()]:
+            try:
+                rows = db_connection.execute(f'SELECT user_id, long_name FROM "{owner}_nodedb"').fetchall()
+            except sqlite3.Error:
+                continue  # That radio has not stored any nodes
+            for user_id, long_name in rows:
+                known.setdefault(int(user_id), long_name)
+    return {node_num: known.get(node_num) or f"!{node_num:08x}" for node_num in nodes}
+
+
+def _iso_time(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")  # noqa: UP017 - datetime.UTC is 3.11+
+
+
+def tracks_to_geojson(tracks: dict[int, list[TrackPoint]], names: dict[int, str]) -> dict[str, Any]:
+    """A FeatureCollection with one LineString (or Point, for a single fix) per node."""
+    features = []
+    for node_num, points in tracks.items():
+        coordinates = [
+            [point.longitude, point.latitude] + ([point.altitude] if point.altitude is not None else [])
+            for point in points
+        ]
+        geometry = (
+            {"type": "LineString", "coordinates": coordinates}
+            if len(coordinates) > 1
+            else {"type": "Point", "coordinates": coordinates[0]}
+        )
+        properties = {
+            "node_num": node_num,
+            "node_id": f"!{node_num:08x}",
+            "name": names[node_num],
+            "times": [_iso_time(point.timestamp) for point in points],
+        }
+        features.append({"type": "Feature", "geometry": geometry, "properties": properties})
+    return {"type": "FeatureCollection", "features": features}
+
+
+def tracks_to_gpx(tracks: dict[int, list[TrackPoint]], names: dict[int, str]) -> str:
+    """A GPX 1.1 document with one track per node."""
+    ET.register_namespace("", GPX_NAMESPACE)
+    gpx = ET.Element(f"{{{GPX_NAMESPACE}}}gpx", version="1.1", creator="contact")
+    for node_num, points in tracks.items():
+        track = ET.SubElement(gpx, f"{{{GPX_NAMESPACE}}}trk")
+        ET.SubElement(track, f"{{{GPX_NAMESPACE}}}name").text = f"{names[node_num]} (!{node_num:08x})"
+        segment = ET.SubElement(track, f"{{{GPX_NAMESPACE}}}trkseg")
+        for point in points:
+            trackpoint = ET.SubElement(
+                segment, f"{{{GPX_NAMESPACE}}}trkpt", lat=f"{point.latitude:.7f}", lon=f"{point.longitude:.7f}"
+            )
+            if point.altitude is not None:
+                ET.SubElement(trackpoint, f"{{{GPX_NAMESPACE}}}ele").text = f"{point.altitude:g}"
+            ET.SubElement(trackpoint, f"{{{GPX_NAMESPACE}}}time").text = _iso_time(point.timestamp)
+    ET.indent(gpx)
+    return ET.tostring(gpx, encoding="unicode", xml_declaration=True) + "\n"
+
+
+def export_tracks_from_args(args: Namespace) -> int:
+    """Write every radio's tracks in client.db to args.export_tracks (.gpx, or GeoJSON otherwise). Exit status."""
+    nodes = [int(node.lstrip("!"), 16) for node in args.export_nodes or []]
+    start = time.time() - args.export_since * 3600 if args.export_since else None
+    owners = track_owners()
+    tracks = load_tracks(nodes, start, owners)
+    names = node_names(list(tracks), owners)
+    if args.export_tracks.lower().endswith(".gpx"):
+        document = tracks_to_gpx(tracks, names)
+    else:
+        document = json.dumps(tracks_to_geojson(tracks, names), indent=2)
+    try:
+        with open(args.export_tracks, "w", encoding="utf-8") as export_file:
+            export_file.write(document)
+    except OSError as e:
+        print(f"Could not write {args.export_tracks}: {e}")
+        return 1
+    fixes = sum(len(points) for points in tracks.values())
+    print(f"Wrote {fixes} fixes from {len(tracks)} nodes to {args.export_tracks}")
+    return 0
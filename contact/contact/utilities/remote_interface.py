@@ -0,0 +1,142 @@
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from meshtastic import BROADCAST_ADDR
+from meshtastic.protobuf import mesh_pb2, portnums_pb2
+from pubsub import pub
+
+from contact.utilities.control_socket import ControlClient
+from contact.utilities.offline_interface import OfflineInterface, OfflineNode
+from contact.utilities.singleton import interface_state
+
+
+class RemoteNode(OfflineNode):
+    """The daemon's local node: node DB edits are forwarded to the daemon's radio."""
+
+    def __init__(self, client: ControlClient, base: OfflineNode) -> None:
+        super().__init__(base.nodeNum, base.channels, base.localConfig, base.moduleConfig)
+        self.client = client
+
+    def _admin(self, action: str, nodeId: int) -> None:  # noqa: N803
+        self.client.request("node_admin", action=action, node=nodeId)
+
+    def removeNode(self, nodeId: int) -> None:  # noqa: N802, N803
+        self._admin("removeNode", nodeId)
+
+    def setFavorite(self, nodeId: int) -> None:  # noqa: N802, N803
+        self._admin("setFavorite", nodeId)
+
+    def removeFavorite(self, nodeId: int) -> None:  # noqa: N802, N803
+        self._admin("removeFavorite", nodeId)
+
+    def setIgnored(self, nodeId: int) -> None:  # noqa: N802, N803
+        self._admin("setIgnored", nodeId)
+
+    def removeIgnored(self, nodeId: int) -> None:  # noqa: N802, N803
+        self._admin("removeIgnored", nodeId)
+
+
+class RemoteInterface(OfflineInterface):
+    """
+    Attaches the UI to a headless daemon instead of a radio.
+
+    Packets the daemon receives are re-published on "meshtastic.receive" so the usual rx handler
+    draws them; transmissions go through the daemon, and their responses come back to the callbacks
+    given here. The daemon has already stored received packets, so the UI doesn't store them again.
+    """
+
+    persists_received = False
+    supports_settings = False  # The settings menu talks to the radio's admin API directly
+
+    def __init__(self, socket_path: str) -> None:
+        from contact.utilities.snapshot import snapshot_node  # noqa: PLC0415
+
+        try:
+            self.client = ControlClient(socket_path, on_event=self._on_event)
+        except OSError as e:
+            raise ConnectionError(f"No contact daemon at {socket_path}: {e}") from e
+        self._response_handlers: dict[int, Callable[[dict[str, Any]], Any]] = {}
+        self.state = self.client.request("state")
+        base_node = snapshot_node(self.state)
+        super().__init__(self.state["my_node_num"], self.state.get("nodes", {}), RemoteNode(self.client, base_node))
+        self.client.subscribe()
+
+    def sendText(  # noqa: N802, PLR0913, PLR0917 - mirrors MeshInterface.sendText
+        self,
+        text: str,
+        destinationId: int | str = BROADCAST_ADDR,  # noqa: N803
+        wantAck: bool = False,  # noqa: N803
+        wantResponse: bool = False,  # noqa: N803
+        onResponse: Callable[[dict[str, Any]], Any] | None = None,  # noqa: N803
+        channelIndex: int = 0,  # noqa: N803
+        **kwargs: Any,
+    ) -> mesh_pb2.MeshPacket:
+        return self.sendData(
+            text.encode("utf-8"),
+            destinationId,
+            portNum=portnums_pb2.PortNum.TEXT_MESSAGE_APP,
+            wantAck=wantAck,
+            wantResponse=wantResponse,
+            onResponse=onResponse,
+            channelIndex=channelIndex,
+            **kwargs,
+        )
+
+    def sendData(  # noqa: N802, PLR0913, PLR0917 - mirrors MeshInterface.sendData
+        self,
+        data: Any,
+        destinationId: int | str = BROADCAST_ADDR,  # noqa: N803
+        portNum: int = portnums_pb2.PortNum.PRIVATE_APP,  # noqa: N803
+        wantAck: bool = False,  # noqa: N803
+        wantResponse: bool = False,  # noqa: N803
+        onResponse: Callable[[dict[str, Any]], Any] | None = None,  # noqa: N803
+        onResponseAckPermitted: bool = False,  # noqa: N803
+        channelIndex: int = 0,  # noqa: N803
+        hopLimit: int | None = None,  # noqa: N803
+        **kwargs: Any,
+    ) -> mesh_pb2.MeshPacket:
+        if hasattr(data, "SerializeToString"):
+            data = data.SerializeToString()
+        # Same rule as MeshInterface: plain ACKs only reach callbacks that asked for them.
+        ack_permitted = onResponseAckPermitted or getattr(onResponse, "__name__", "") == "onAckNak"
+        result = self.client.request(
+            "send_data",
+            data=data,
+            destinationId=destinationId,
+            portNum=portNum,
+            wantAck=wantAck,
+            wantResponse=wantResponse,
+            callback=onResponse is not None,
+            ackPermitted=ack_permitted,
+            channelIndex=channelIndex,
+            hopLimit=hopLimit,
+        )
+        packet = mesh_pb2.MeshPacket()
+        packet.id = result["id"]
+        if onResponse is not None:
+            self._response_handlers[packet.id] = onResponse
+        return packet
+
+    def _on_event(self, event: str, data: dict[str, Any]) -> None:
+        if event == "packet":
+            node = data.get("node")
+            if node and "num" in node:
+                self.nodesByNum[node["num"]] = node
+                node_id = node.get("user", {}).get("id") or f"!{node['num']:08x}"
+                self.nodes[node_id] = node
+            pub.sendMessage("meshtastic.receive", packet=data["packet"], interface=self)
+
+        elif event == "response":
+            packet = data["packet"]
+            handler = self._response_handlers.pop(packet.get("decoded", {}).get("requestId"), None)
+            if handler is not None:
+                handler(packet)
+
+        elif event == "disconnected":
+            logging.error("Lost connection to the contact daemon")
+            interface_state.connected = False
+
+    def close(self) -> None:
+        self.client.on_event = None  # A deliberate close isn't a lost connection
+        self.client.close()
@@ -0,0 +1,93 @@
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+PREFIX, SUBSTRING, FUZZY = 0, 1, 2  # match quality, best first
+
+
+def match_tier(text: str, terms: tuple[str, ...]) -> int | None:
+    """How well casefolded text matches any of the terms, or None if it doesn't."""
+    if any(term.startswith(text) for term in terms):
+        return PREFIX
+    if any(text in term for term in terms):
+        return SUBSTRING
+    for term in terms:
+        letters = iter(term)
+        if all(char in letters for char in text):  # The letters of text appear in order, e.g. "lfst" in "longfast"
+            return FUZZY
+    return None
+
+
+class SearchIndex:
+    """
+    Casefolded search terms for nodes (long and short name, !hex id, number) and channels (name).
+
+    Node names are filled in from the node database the first time they are searched and kept current
+    by update_node_info_in_db, so a search never queries the database per candidate. They are kept
+    per radio, like the node tables.
+    """
+
+    def __init__(self) -> None:
+        self._terms: dict[Any, tuple[str, ...]] = {}  # channel name or (owner, node number) -> terms
+        self._lock = threading.Lock()
+
+    def set_node(self, node_num: int, long_name: str, short_name: str) -> None:
+        from contact.utilities.db_handler import owner_node_num  # noqa: PLC0415
+
+        terms = (str(long_name).casefold(), str(short_name).casefold(), f"!{node_num:08x}", str(node_num))
+        with self._lock:
+            self._terms[owner_node_num(), node_num] = terms
+
+    def terms(self, item: Any) -> tuple[str, ...]:
+        """The terms of a node number or channel name."""
+        if not isinstance(item, int):
+            terms = self._terms.get(item)
+            if terms is None:
+                terms = self._terms[item] = (str(item).casefold(),)
+            return terms
+
+        from contact.utilities.db_handler import get_name_from_database, owner_node_num  # noqa: PLC0415
+
+        terms = self._terms.get((owner_node_num(), item))
+        if terms is None:
+            self.set_node(item, get_name_from_database(item, "long"), get_name_from_database(item, "short"))
+            terms = self._terms[owner_node_num(), item]
+        return terms
+
+
+class NameSearch:
+    """
+    One search prompt over a node or channel list.
+
+    Matches are ranked by quality, then by position counting on from start. Every match for a longer
+    text also matches the shorter one, so typing only re-checks the previous matches, and backspace
+    goes back to them.
+    """
+
+    def __init__(self, index: SearchIndex, items: Sequence[Any], start: int = 0) -> None:
+        self.index = index
+        count = len(items)
+        # (item, position counting on from start), in that order
+        everything = [(items[(start + offset) % count], offset) for offset in range(count)]
+        self._steps: list[tuple[str, list[tuple[int, int, Any]]]] = [
+            ("", [(0, offset, item) for item, offset in everything])
+        ]
+
+    def matches(self, text: str) -> list[Any]:
+        """Items matching text, best first."""
+        text = text.casefold()
+        while not text.startswith(self._steps[-1][0]):
+            self._steps.pop()
+        previous_text, previous = self._steps[-1]
+        if text != previous_text:
+            narrowed = []
+            for _, offset, item in previous:
+                tier = match_tier(text, self.index.terms(item))
+                if tier is not None:
+                    narrowed.append((tier, offset, item))
+            narrowed.sort(key=lambda match: match[:2])
+            self._steps.append((text, narrowed))
+        return [item for _, _, item in self._steps[-1][1]]
+
+
+search_index = SearchIndex()
@@ -0,0 +1,253 @@
+import contextlib
+import logging
+from argparse import Namespace
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field, fields, replace
+from typing import Any
+
+from contact.ui.ui_events import CHANNELS, MESSAGES
+from contact.ui.ui_state import ChatUIState, InterfaceState
+from contact.utilities.singleton import app_state, interface_state, ui_events, ui_state
+
+# The parts of ChatUIState that belong to one radio. Window focus, panels and layout stay with the console.
+SESSION_UI_FIELDS = (
+    "channel_list",
+    "all_messages",
+    "notifications",
+    "packet_buffer",
+    "node_list",
+    "selected_channel",
+    "selected_message",
+    "selected_node",
+    "last_sent_time",
+    "last_traceroute_time",
+)
+
+
+def _fresh_ui() -> dict[str, Any]:
+    blank = ChatUIState()
+    return {name: getattr(blank, name) for name in SESSION_UI_FIELDS}
+
+
+@dataclass
+class Session:
+    """One connected radio: its interface and node number, and its channels, messages and nodes while inactive."""
+
+    name: str
+    connection: Namespace | None = None
+    interface_state: InterfaceState = field(default_factory=InterfaceState)
+    ui: dict[str, Any] = field(default_factory=_fresh_ui)
+
+
+class SessionManager:
+    """
+    Several radios in one console (--interfaces), sharing client.db.
+
+    The rest of the app works on the interface_state and ui_state singletons, so the active session's
+    state lives in them and the others are parked on their Session. Switching swaps the two. Each radio
+    keeps its own tables in the database, since those are named after its node number.
+
+    Packets and ACKs for an inactive radio are posted to the UI thread and handled there with that
+    session swapped in for the duration, so the UI never sees another radio's state mid-keypress.
+    The merged view is a read-only session listing every radio's channels, prefixed with its name; it
+    shares their message lists and shows the node list of the radio it was opened from.
+
+    With one radio or none (the daemon, --attach, a warm start) nothing is swapped and handlers run as before.
+    """
+
+    def __init__(self) -> None:
+        self.sessions: list[Session] = []
+        self.active: Session | None = None
+        self.merged = Session(name="*")
+        self._home: Session | None = None  # the radio the merged view was opened from
+        self._merged_targets: dict[str, tuple[Session, Any]] = {}
+        self._listeners: dict[Callable[..., None], Callable[..., None]] = {}  # pubsub only holds weak references
+
+    @property
+    def multiple(self) -> bool:
+        return len(self.sessions) > 1
+
+    @property
+    def merged_active(self) -> bool:
+        return self.active is self.merged
+
+    def add(self, interface: Any, connection: Namespace | None = None, name: str | None = None) -> Session:
+        """Register a connected radio. The first one becomes the active session."""
+        session = Session(name=self._unique_name(name or _short_name(interface)), connection=connection)
+        session.interface_state.interface = interface
+        with app_state.lock:
+            self.sessions.append(session)
+            if self.active is None:
+                self.active = session
+                self._load(session)
+        return session
+
+    def interfaces(self) -> list[Any]:
+        return [self._state_of(session).interface for session in self.sessions]
+
+    def session_for(self, interface: Any) -> Session | None:
+        for session in self.sessions:
+            if self._state_of(session).interface is interface:
+                return session
+        return None
+
+    @contextlib.contextmanager
+    def activated(self, session: Session) -> Iterator[None]:
+        """Make session the one the singletons show for the duration, e.g. to handle its packets."""
+        with app_state.lock:
+            if session is self.active:
+                yield
+                return
+            self._save(self.active)
+            self._load(session)
+            try:
+                yield
+            finally:
+                self._save(session)
+                self._load(self.active)
+
+    def switch(self, session: Session) -> None:
+        with app_state.lock:
+            if session is self.active:
+                return
+            self._save(self.active)
+            self.active = session
+            self._load(session)
+
+    def cycle(self) -> None:
+        """Switch to the next radio; from the merged view, to the one after the radio it was opened from."""
+        if not self.sessions:
+            return
+        current = self._home if self.merged_active else self.active
+        index = self.sessions.index(current) if current in self.sessions else -1
+        self.switch(self.sessions[(index + 1) % len(self.sessions)])
+
+    def toggle_merged(self) -> None:
+        with app_state.lock:
+            if self.merged_active:
+                self.switch(self._home or self.sessions[0])
+                return
+            self._home = self.active
+            self._save(self.active)
+            self.merged.interface_state = replace(self.active.interface_state)
+            self.merged.ui = {**self.active.ui, "selected_channel": 0, "selected_message": 0, "notifications": []}
+            self.active = self.merged
+            self._load(self.merged)
+            self._refresh_merged()
+
+    def open_merged_channel(self, index: int) -> None:
+        """Leave the merged view for the radio and channel listed at index."""
+        with app_state.lock:
+            if not self.merged_active or not 0 <= index < len(ui_state.channel_list):
+                return
+            session, channel = self._merged_targets[ui_state.channel_list[index]]
+            self.switch(session)
+            if channel in ui_state.channel_list:
+                ui_state.selected_channel = ui_state.channel_list.index(channel)
+                if ui_state.selected_channel in ui_state.notifications:
+                    ui_state.notifications.remove(ui_state.selected_channel)
+
+    def run_in(self, session: Session, func: Callable[..., Any], *args: Any) -> None:
+        """Call func with session swapped in, then bring the merged view up to date."""
+        with self.activated(session):
+            func(*args)
+        if self.merged_active:
+            self._refresh_merged()
+            ui_events.request_redraw(CHANNELS, MESSAGES)
+
+    def run_each(self, func: Callable[[], Any]) -> None:
+        """Call func once per radio, with that radio's session swapped in (just once without sessions)."""
+        if not self.sessions:
+            func()
+            return
+        for session in self.sessions:
+            with self.activated(session):
+                func()
+
+    def receive_listener(self, handler: Callable[[dict[str, Any], Any], None]) -> Callable[[dict[str, Any], Any], None]:
+        """A "meshtastic.receive" listener running handler in the session of the interface the packet came from."""
+        if handler in self._listeners:
+            return self._listeners[handler]
+
+        def listener(packet: dict[str, Any], interface: Any) -> None:
+            with app_state.lock:
+                session = self.session_for(interface)
+                if session is None or session is self.active:
+                    handler(packet, interface)
+                else:
+                    ui_events.post(self.run_in, session, handler, packet, interface)
+
+        self._listeners[handler] = listener
+        return listener
+
+    def bind(self, callback: Callable[..., None]) -> Callable[..., None]:
+        """Tie a response callback (ACKs, traceroutes) to the session active now, so it lands there."""
+        session = self.active
+        if session is None:
+            return callback
+
+        def bound(*args: Any) -> None:
+            with app_state.lock:
+                if session is self.active:
+                    callback(*args)
+                else:
+                    ui_events.post(self.run_in, session, callback, *args)
+
+        return bound
+
+    def _state_of(self, session: Session) -> InterfaceState:
+        return interface_state if session is self.active else session.interface_state
+
+    def _save(self, session: Session) -> None:
+        session.ui = {name: getattr(ui_state, name) for name in SESSION_UI_FIELDS}
+        session.interface_state = replace(interface_state)
+
+    def _load(self, session: Session) -> None:
+        for name, value in session.ui.items():
+            setattr(ui_state, name, value)
+        for item in fields(InterfaceState):
+            setattr(interface_state, item.name, getattr(session.interface_state, item.name))
+
+    def _refresh_merged(self) -> None:
+        """Rebuild the merged channel list from every radio's, keeping the selection. The merged view is active."""
+        selected = ui_state.channel_list[ui_state.selected_channel] if ui_state.channel_list else None
+        targets: dict[str, tuple[Session, Any]] = {}
+        all_messages: dict[str, list[Any]] = {}
+        notifications = []
+        for session in self.sessions:
+            nodes = getattr(session.interface_state.interface, "nodesByNum", None) or {}
+            for index, channel in enumerate(session.ui["channel_list"]):
+                if isinstance(channel, int):
+                    user = nodes.get(channel, {}).get("user", {})
+                    label = f"{session.name}: {user.get('longName') or f'!{channel:08x}'}"
+                else:
+                    label = f"{session.name}: {channel}"
+                if index in session.ui["notifications"]:
+                    notifications.append(len(targets))
+                targets[label] = (session, channel)
+                all_messages[label] = session.ui["all_messages"].get(channel, [])
+
+        self._merged_targets = targets
+        ui_state.channel_list = list(targets)
+        ui_state.all_messages = all_messages
+        ui_state.notifications = notifications
+        ui_state.selected_channel = ui_state.channel_list.index(selected) if selected in targets else 0
+
+    def _unique_name(self, name: str) -> str:
+        taken = {session.name for session in self.sessions}
+        unique, suffix = name, 2
+        while unique in taken:
+            unique, suffix = f"{name}-{suffix}", suffix + 1
+        return unique
+
+
+def _short_name(interface: Any) -> str:
+    try:
+        user = interface.getMyNodeInfo()["user"]
+        return user.get("shortName") or user["id"]
+    except Exception as e:
+        logging.warning("Could not name the radio's session: %s", e)
+        return "radio"
+
+
+session_manager = SessionManager()
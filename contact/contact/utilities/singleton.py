@@ -1,6 +1,14 @@
+from contextvars import ContextVar
+
+from contact.ui.ui_events import UIEvents
 from contact.ui.ui_state import AppState, ChatUIState, InterfaceState, MenuState
 
 ui_state = ChatUIState()
 interface_state = InterfaceState()
 app_state = AppState()
 menu_state = MenuState()
+ui_events = UIEvents()
+
+# The node whose tables a database call uses, when it is not interface_state's: set for writes that run
+# later on the asyncio core's DB thread, by which time another radio's session may be active.
+db_owner: ContextVar[int | None] = ContextVar("db_owner", default=None)
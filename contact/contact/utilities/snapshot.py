@@ -0,0 +1,110 @@
+import json
+import logging
+import os
+import time
+from typing import Any
+
+from google.protobuf.json_format import MessageToDict, ParseDict
+from meshtastic.protobuf import channel_pb2, localonly_pb2
+
+import contact.ui.default_config as config
+from contact.utilities.message_window import MessageWindows
+from contact.utilities.offline_interface import OfflineInterface, OfflineNode
+from contact.utilities.singleton import interface_state, ui_state
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MESSAGES_PER_CHANNEL = 100
+
+
+def _jsonable(value: Any) -> Any:
+    """Strip values that can't round-trip through JSON (raw protobufs, payload bytes)."""
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items() if k != "raw" and _is_plain(v)}
+    if isinstance(value, list | tuple):
+        return [_jsonable(v) for v in value if _is_plain(v)]
+    return value
+
+
+def _is_plain(value: Any) -> bool:
+    return value is None or isinstance(value, str | int | float | bool | dict | list | tuple)
+
+
+def build_snapshot(messages_per_channel: int | None = SNAPSHOT_MESSAGES_PER_CHANNEL) -> dict[str, Any]:
+    """Capture channels, the node DB and messages from the shared state as a JSON-ready dict."""
+    interface = interface_state.interface
+    local_node = interface.localNode
+    start = -messages_per_channel if messages_per_channel else 0
+    return {
+        "version": SNAPSHOT_VERSION,
+        "saved_at": int(time.time()),
+        "my_node_num": interface_state.my_node_num,
+        "channels": [MessageToDict(channel) for channel in local_node.channels or []],
+        "lora": MessageToDict(local_node.localConfig.lora),
+        "nodes": _jsonable(dict(interface.nodes or {})),
+        "channel_list": list(ui_state.channel_list),
+        "messages": [
+            [channel, [list(entry) for entry in messages[start:]]]
+            for channel, messages in ui_state.all_messages.items()
+        ],
+    }
+
+
+def save_snapshot(path: str | None = None) -> None:
+    """Persist channels, the node DB and recent messages so the next launch can paint immediately."""
+    path = path or config.snapshot_file_path
+    if interface_state.interface is None or not interface_state.my_node_num:
+        return
+
+    try:
+        snapshot = build_snapshot()
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        logging.info(f"Saved warm-start snapshot to {path}")
+
+    except Exception as e:
+        logging.error(f"Unable to save warm-start snapshot: {e}")
+
+
+def load_snapshot(path: str | None = None) -> dict[str, Any] | None:
+    """Return the last saved snapshot, or None if there isn't a usable one."""
+    path = path or config.snapshot_file_path
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring unreadable warm-start snapshot {path}: {e}")
+        return None
+
+    if snapshot.get("version") != SNAPSHOT_VERSION or not snapshot.get("my_node_num"):
+        return None
+    return snapshot
+
+
+def snapshot_node(snapshot: dict[str, Any]) -> OfflineNode:
+    """Rebuild the local node's channels and LoRa config from a snapshot."""
+    channels = [ParseDict(channel, channel_pb2.Channel()) for channel in snapshot.get("channels", [])]
+    local_config = localonly_pb2.LocalConfig()
+    ParseDict(snapshot.get("lora", {}), local_config.lora)
+    return OfflineNode(snapshot["my_node_num"], channels, local_config)
+
+
+def apply_snapshot(snapshot: dict[str, Any], interface: OfflineInterface | None = None) -> None:
+    """Populate the shared UI state from a snapshot, backed by an OfflineInterface until the radio connects."""
+    my_node_num = snapshot["my_node_num"]
+    if interface is None:
+        interface = OfflineInterface(my_node_num, snapshot.get("nodes", {}), snapshot_node(snapshot))
+    interface_state.interface = interface
+    interface_state.my_node_num = my_node_num
+    interface_state.connected = False
+
+    ui_state.channel_list = snapshot.get("channel_list", [])
+    ui_state.all_messages = MessageWindows(
+        (channel, [tuple(entry) for entry in messages]) for channel, messages in snapshot.get("messages", [])
+    )
+    ui_state.selected_channel = 0
@@ -0,0 +1,170 @@
+import contextlib
+import logging
+import random
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from pubsub import pub
+
+from contact.ui.ui_events import CHANNELS, MESSAGES, NODES, STATUS
+from contact.utilities.sessions import Session, session_manager
+from contact.utilities.singleton import app_state, interface_state, ui_events, ui_state
+
+RECONNECT_DELAY = 2.0  # seconds before the first reconnect attempt, doubled after each failure
+RECONNECT_MAX_DELAY = 300.0
+
+
+def backoff_delay(attempt: int, initial: float = RECONNECT_DELAY, maximum: float = RECONNECT_MAX_DELAY) -> float:
+    """Seconds to wait before retry number attempt (from 0): doubling up to maximum, with jitter."""
+    # The jitter keeps a bench of radios behind one flaky hub from retrying in lockstep.
+    return min(maximum, initial * 2**attempt) * random.uniform(0.5, 1.0)
+
+
+@dataclass
+class Link:
+    """A supervised radio connection."""
+
+    name: str
+    connect: Callable[[], Any]  # opens a fresh interface, or returns None
+    interface: Any
+    session: Session | None = None
+    reconnecting: bool = False
+    reconnects: int = 0
+
+
+def _call_now(func: Callable[..., Any], *args: Any) -> None:
+    func(*args)
+
+
+class ConnectionSupervisor:
+    """
+    Keeps radio links up: on "meshtastic.connection.lost" it reconnects in the background with
+    exponential backoff, then brings the session up to date without reloading it.
+
+    Messages sent meanwhile wait in tx_handler's outbox and go out once the link is back.
+    State changes are handed to dispatch: the UI thread's queue in the chat UI, a direct call
+    (under app_state.lock) in the daemon.
+    """
+
+    def __init__(self) -> None:
+        self.links: list[Link] = []
+        self.dispatch: Callable[..., None] = _call_now
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    def watch(self, interface: Any, connect: Callable[[], Any], name: str, session: Session | None = None) -> Link:
+        link = Link(name=name, connect=connect, interface=interface, session=session)
+        with self._lock:
+            if not self.links:
+                pub.subscribe(self.on_connection_lost, "meshtastic.connection.lost")
+            self.links.append(link)
+        return link
+
+    def stop(self) -> None:
+        """Stop reconnecting, e.g. before the interfaces are closed on exit."""
+        self._stopping.set()
+        with self._lock:
+            if self.links:
+                pub.unsubscribe(self.on_connection_lost, "meshtastic.connection.lost")
+            self.links.clear()
+
+    def on_connection_lost(self, interface: Any) -> None:
+        with self._lock:
+            link = next((link for link in self.links if link.interface is interface), None)
+            if link is None or link.reconnecting or self._stopping.is_set():
+                return
+            link.reconnecting = True
+
+        logging.warning("Lost the connection to %s; reconnecting", link.name)
+        self.dispatch(self._mark_lost, link)
+        threading.Thread(target=self._reconnect, args=(link,), name=f"reconnect {link.name}", daemon=True).start()
+
+    def connect_with_backoff(self, connect: Callable[[], Any], name: str) -> Any:
+        """Call connect until it returns an interface, backing off between attempts. None once stopped."""
+        attempt = 0
+        while not self._stopping.is_set():
+            try:
+                interface = connect()
+            except Exception as e:
+                logging.error("Connecting to %s failed: %s", name, e)
+                interface = None
+            if interface is not None:
+                return interface
+            delay = backoff_delay(attempt)
+            attempt += 1
+            logging.info("Retrying %s in %.0f seconds (attempt %d)", name, delay, attempt + 1)
+            self._stopping.wait(delay)
+        return None
+
+    def _reconnect(self, link: Link) -> None:
+        try:
+            link.interface.close()  # Stops the old heartbeat timer and reader thread
+        except Exception as e:
+            logging.debug("Closing the lost interface to %s: %s", link.name, e)
+
+        interface = self.connect_with_backoff(link.connect, link.name)
+        if interface is not None:
+            self.dispatch(self._adopt, link, interface)
+
+    def _mark_lost(self, link: Link) -> None:
+        with self._context(link):
+            interface_state.connected = False
+            interface_state.reconnecting = True
+        ui_events.request_redraw(STATUS)
+
+    def _adopt(self, link: Link, interface: Any) -> None:
+        from contact.message_handlers.tx_handler import flush_outbox  # noqa: PLC0415
+
+        if self._stopping.is_set():
+            interface.close()
+            return
+        with self._context(link):
+            resync(link.interface, interface)
+            link.interface = interface
+            interface_state.connected = True
+            interface_state.reconnecting = False
+            sent = flush_outbox()
+        link.reconnecting = False
+        link.reconnects += 1
+        logging.info("Reconnected to %s (reconnect %d); sent %d held messages", link.name, link.reconnects, sent)
+        ui_events.request_redraw(CHANNELS, MESSAGES, NODES, STATUS)
+
+    @staticmethod
+    def _context(link: Link) -> contextlib.AbstractContextManager:
+        return session_manager.activated(link.session) if link.session is not None else app_state.lock
+
+
+def resync(old_interface: Any, interface: Any) -> None:
+    """
+    Move the current session onto a reconnected interface, keeping messages and selection.
+
+    Channels the radio gained are added, and only nodes whose user info changed while the link was
+    down are written to the node database. Called with app_state.lock held.
+    """
+    from contact.utilities.db_handler import init_nodedb  # noqa: PLC0415
+    from contact.utilities.utils import get_channels, get_node_num, refresh_node_list  # noqa: PLC0415
+
+    interface_state.interface = interface
+    node_num = get_node_num()
+    if node_num != interface_state.my_node_num:
+        logging.warning("Reconnected to node %s instead of %s", node_num, interface_state.my_node_num)
+        interface_state.my_node_num = node_num
+
+    known_channels = len(ui_state.channel_list)
+    get_channels()  # Only appends channels that are not listed yet
+    if len(ui_state.channel_list) > known_channels:
+        logging.info("Radio has %d new channels", len(ui_state.channel_list) - known_channels)
+
+    old_nodes = getattr(old_interface, "nodes", None) or {}
+    changed = [
+        node
+        for node_id, node in (interface.nodes or {}).items()
+        if "user" in node and old_nodes.get(node_id, {}).get("user") != node["user"]
+    ]
+    init_nodedb(changed)
+    refresh_node_list()
+
+
+supervisor = ConnectionSupervisor()
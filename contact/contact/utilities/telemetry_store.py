@@ -0,0 +1,207 @@
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import contact.ui.default_config as config
+from contact.utilities.db_handler import owner_node_num
+from contact.utilities.perf import hot_path
+
+# Each sample is stored at every resolution as it arrives, so there is no rollup pass to fall behind.
+# Finer resolutions are dropped once they are older than their retention.
+RAW = 0  # one row per second a sample arrived in
+MINUTE = 60
+HOUR = 3600
+RETENTION = {RAW: 24 * HOUR, MINUTE: 7 * 24 * HOUR, HOUR: 365 * 24 * HOUR}
+PRUNE_INTERVAL = 10 * 60  # seconds between deletions of expired rows, per radio
+
+# Telemetry variants that are stored, and the prefix of their metric names (e.g. "device.batteryLevel").
+# The SNR a telemetry packet was received with is kept alongside as "link.snr".
+METRIC_GROUPS = {"deviceMetrics": "device", "environmentMetrics": "environment"}
+
+_last_pruned: dict[int, float] = {}
+
+
+@dataclass
+class TelemetrySample:
+    """A metric aggregated over one bucket (its start time, in seconds), or over a whole range."""
+
+    timestamp: int
+    count: int
+    mean: float
+    minimum: float
+    maximum: float
+
+
+def get_telemetry_table_name() -> str:
+    return f'"{owner_node_num()}_telemetry"'
+
+
+def create_telemetry_table(db_connection: sqlite3.Connection) -> None:
+    # WITHOUT ROWID keeps rows clustered on the key, so a node's series for one metric and
+    # resolution sits together on disk and a range query is a single index scan.
+    db_connection.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {get_telemetry_table_name()} (
+            node_num INTEGER,
+            metric TEXT,
+            resolution INTEGER,
+            bucket INTEGER,
+            count INTEGER,
+            total REAL,
+            minimum REAL,
+            maximum REAL,
+            PRIMARY KEY (node_num, metric, resolution, bucket)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def bucket_start(timestamp: float, resolution: int) -> int:
+    return int(timestamp) - int(timestamp) % resolution if resolution else int(timestamp)
+
+
+def extract_metrics(telemetry: dict[str, Any]) -> dict[str, float]:
+    """The numeric device and environment readings of a decoded telemetry payload, by metric name."""
+    metrics = {}
+    for group, prefix in METRIC_GROUPS.items():
+        for name, value in telemetry.get(group, {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                metrics[f"{prefix}.{name}"] = float(value)
+    return metrics
+
+
+@hot_path.timed("db.record_telemetry")
+def record_telemetry(packet: dict[str, Any], timestamp: float | None = None) -> None:
+    """Store the readings of a TELEMETRY_APP packet under its sender, at every resolution."""
+    try:
+        metrics = extract_metrics(packet["decoded"].get("telemetry", {}))
+        if metrics and "rxSnr" in packet:
+            metrics["link.snr"] = float(packet["rxSnr"])
+        if not metrics:
+            return
+        node_num = packet["from"]
+        now = int(time.time() if timestamp is None else timestamp)
+
+        table_name = get_telemetry_table_name()
+        rows = [
+            (node_num, metric, resolution, bucket_start(now, resolution), value, value, value)
+            for metric, value in metrics.items()
+            for resolution in RETENTION
+        ]
+        with sqlite3.connect(config.db_file_path) as db_connection:
+            create_telemetry_table(db_connection)
+            db_connection.executemany(
+                f"""
+                INSERT INTO {table_name} (node_num, metric, resolution, bucket, count, total, minimum, maximum)
+                VALUES (?, ?, ?, ?, 1, ?, ?, ?)
+                ON CONFLICT(node_num, metric, resolution, bucket) DO UPDATE SET
+                    count = count + 1,
+                    total = total + excluded.total,
+                    minimum = min(minimum, excluded.minimum),
+                    maximum = max(maximum, excluded.maximum)
+                """,
+                rows,
+            )
+            if now - _last_pruned.get(owner_node_num(), 0) >= PRUNE_INTERVAL:
+                prune_telemetry(db_connection, now)
+            db_connection.commit()
+
+    except sqlite3.Error as e:
+        logging.error("SQLite error in record_telemetry: %s", e)
+    except Exception as e:
+        logging.error("Unexpected error in record_telemetry: %s", e)
+
+
+def prune_telemetry(db_connection: sqlite3.Connection, now: int) -> None:
+    """Delete rows older than the retention of their resolution."""
+    table_name = get_telemetry_table_name()
+    for resolution, retention in RETENTION.items():
+        db_connection.execute(
+            f"DELETE FROM {table_name} WHERE resolution = ? AND bucket < ?", (resolution, now - retention)
+        )
+    _last_pruned[owner_node_num()] = now
+
+
+def pick_resolution(start: float, now: float | None = None) -> int:
+    """The finest resolution still kept as far back as start."""
+    age = (time.time() if now is None else now) - start
+    return next((resolution for resolution, retention in RETENTION.items() if age <= retention), HOUR)
+
+
+def query_telemetry(
+    node_num: int, metric: str, start: float, end: float | None = None, resolution: int | None = None
+) -> list[TelemetrySample]:
+    """A node's metric between start and end (epoch seconds), oldest first, at the finest resolution kept."""
+    resolution = pick_resolution(start) if resolution is None else resolution
+    end = time.time() if end is None else end
+    try:
+        with sqlite3.connect(config.db_file_path) as db_connection:
+            rows = db_connection.execute(
+                f"""
+                SELECT bucket, count, total, minimum, maximum FROM {get_telemetry_table_name()}
+                WHERE node_num = ? AND metric = ? AND resolution = ? AND bucket >= ? AND bucket <= ?
+                ORDER BY bucket
+                """,
+                (node_num, metric, resolution, bucket_start(start, resolution), end),
+            ).fetchall()
+    except sqlite3.Error as e:
+        logging.debug("No telemetry for %s (%s): %s", node_num, metric, e)  # No table until the first sample
+        return []
+    return [
+        TelemetrySample(bucket, count, total / count, minimum, maximum)
+        for bucket, count, total, minimum, maximum in rows
+    ]
+
+
+def hourly_series(node_num: int, metric: str, hours: int, now: float | None = None) -> list[float | None]:
+    """Hourly means of a metric over the last hours, oldest first and None for hours without samples.
+
+    Reads at most one pre-aggregated row per hour, however many samples were recorded.
+    """
+    now = time.time() if now is None else now
+    first = bucket_start(now, HOUR) - (hours - 1) * HOUR
+    means = {sample.timestamp: sample.mean for sample in query_telemetry(node_num, metric, first, now, HOUR)}
+    return [means.get(first + hour * HOUR) for hour in range(hours)]
+
+
+def summarize_telemetry(metric: str, start: float, end: float | None = None) -> dict[int, TelemetrySample]:
+    """One metric over a range for every node that reported it, e.g. battery trends across the fleet.
+
+    The timestamp of each summary is the node's latest bucket in the range.
+    """
+    resolution = pick_resolution(start)
+    end = time.time() if end is None else end
+    try:
+        with sqlite3.connect(config.db_file_path) as db_connection:
+            rows = db_connection.execute(
+                f"""
+                SELECT node_num, max(bucket), sum(count), sum(total), min(minimum), max(maximum)
+                FROM {get_telemetry_table_name()}
+                WHERE metric = ? AND resolution = ? AND bucket >= ? AND bucket <= ?
+                GROUP BY node_num
+                """,
+                (metric, resolution, bucket_start(start, resolution), end),
+            ).fetchall()
+    except sqlite3.Error as e:
+        logging.debug("No telemetry for %s: %s", metric, e)
+        return {}
+    return {
+        node_num: TelemetrySample(latest, count, total / count, minimum, maximum)
+        for node_num, latest, count, total, minimum, maximum in rows
+    }
+
+
+def telemetry_metrics(node_num: int) -> list[str]:
+    """The metrics stored for a node."""
+    try:
+        with sqlite3.connect(config.db_file_path) as db_connection:
+            rows = db_connection.execute(
+                f"SELECT DISTINCT metric FROM {get_telemetry_table_name()} WHERE node_num = ? AND resolution = ?",
+                (node_num, HOUR),
+            ).fetchall()
+    except sqlite3.Error as e:
+        logging.debug("No telemetry for %s: %s", node_num, e)
+        return []
+    return sorted(metric for (metric,) in rows)
@@ -0,0 +1,141 @@
+import re
+from functools import lru_cache
+from unicodedata import east_asian_width
+
+TOKEN_PATTERN = re.compile(r"\S+|\s+")  # words and runs of spaces, kept separately
+WHITESPACE_TRANS = dict.fromkeys(map(ord, "\t\n\x0b\x0c\r "), ord(" "))
+WRAP_MARGIN = 2  # Left and right margin
+
+# Help text markup -> (color, bold, underline)
+HELP_MARKUP_PATTERN = re.compile(
+    r"\[warning\](?P<warning>.*?)\[/warning\]"
+    r"|\[note\](?P<note>.*?)\[/note\]"
+    r"|\[underline\](?P<underline>.*?)\[/underline\]"
+    r"|\\033\[31m(?P<ansi_red>.*?)\\033\[0m"
+    r"|\\033\[32m(?P<ansi_green>.*?)\\033\[0m"
+    r"|\\033\[4m(?P<ansi_underline>.*?)\\033\[0m"
+)
+HELP_MARKUP_STYLES = {
+    "warning": ("settings_warning", True, False),  # Red for warnings
+    "note": ("settings_note", True, False),  # Green for notes
+    "underline": ("settings_default", False, True),  # Underline
+    "ansi_red": ("settings_warning", True, False),  # Red text
+    "ansi_green": ("settings_note", True, False),  # Green text
+    "ansi_underline": ("settings_default", False, True),  # Underline
+}
+
+Segment = tuple[str, str, bool, bool]  # (text, color, bold, underline)
+
+_char_widths: dict[str, int] = {}  # filled on first sight of each non-ASCII character
+
+
+def char_width(char: str) -> int:
+    width = _char_widths.get(char)
+    if width is None:
+        width = _char_widths[char] = 2 if east_asian_width(char) in "FW" else 1
+    return width
+
+
+def text_width(text: str) -> int:
+    """Terminal cell width: 2 for wide/fullwidth characters (CJK, most emoji), 1 otherwise."""
+    if text.isascii():
+        return len(text)
+    widths = _char_widths
+    total = 0
+    for char in text:
+        width = widths.get(char)
+        total += width if width is not None else char_width(char)
+    return total
+
+
+@lru_cache(maxsize=4096)
+def _wrap_text(text: str, wrap_width: int) -> tuple[str, ...]:
+    text = text.translate(WHITESPACE_TRANS)
+    wrapped_lines = []
+    line_buffer = ""
+    line_length = 0
+    wrap_width -= WRAP_MARGIN
+
+    for word in TOKEN_PATTERN.findall(text):
+        word_length = text_width(word)
+
+        if word_length > wrap_width:  # Break long words
+            if line_buffer:
+                wrapped_lines.append(line_buffer.strip())
+                line_buffer = ""
+                line_length = 0
+            for i in range(0, word_length, wrap_width):
+                wrapped_lines.append(word[i : i + wrap_width])
+            continue
+
+        if line_length + word_length > wrap_width and not word.isspace():
+            wrapped_lines.append(line_buffer.strip())
+            line_buffer = ""
+            line_length = 0
+
+        line_buffer += word
+        line_length += word_length
+
+    if line_buffer:
+        wrapped_lines.append(line_buffer.strip())
+
+    return tuple(wrapped_lines)
+
+
+def wrap_text(text: str, wrap_width: int) -> list[str]:
+    """
+    Wraps text while preserving spaces and breaking long words.
+
+    Results are cached per (text, width), so redrawing a message history only wraps the
+    messages that are new since the last draw or after a resize.
+    """
+    return list(_wrap_text(text, wrap_width))
+
+
+def split_help_markup(text: str) -> list[Segment]:
+    """Split a help line into styled segments, keeping the text between markup as-is."""
+    segments = []
+    last_pos = 0
+    for match in HELP_MARKUP_PATTERN.finditer(text):
+        start = match.start()
+        if last_pos < start:
+            segments.append((text[last_pos:start], "settings_default", False, False))
+        color, bold, underline = HELP_MARKUP_STYLES[match.lastgroup]
+        segments.append((match.group(match.lastgroup), color, bold, underline))
+        last_pos = match.end()
+
+    if last_pos < len(text):
+        segments.append((text[last_pos:], "settings_default", False, False))
+    return segments
+
+
+def _wrap_segments(segments: list[Segment], wrap_width: int) -> list[tuple[Segment, ...]]:
+    wrapped_lines = []
+    line_buffer = []
+    line_length = 0
+
+    for text, color, bold, underline in segments:
+        for word in TOKEN_PATTERN.findall(text):
+            word_length = len(word)
+
+            if line_length + word_length > wrap_width and not word.isspace():
+                # If the word (ignoring spaces) exceeds width, wrap the line
+                wrapped_lines.append(tuple(line_buffer))
+                line_buffer = []
+                line_length = 0
+
+            line_buffer.append((word, color, bold, underline))
+            line_length += word_length
+
+    if line_buffer:
+        wrapped_lines.append(tuple(line_buffer))
+    return wrapped_lines
+
+
+@lru_cache(maxsize=512)
+def wrap_help_text(help_content: str, wrap_width: int) -> tuple[tuple[Segment, ...], ...]:
+    """Split help text on its literal \\n markers, apply markup and wrap. Cached per (text, width)."""
+    wrapped_help = []
+    for raw_line in help_content.split("\\n"):  # Preserve new lines
+        wrapped_help.extend(_wrap_segments(split_help_markup(raw_line), wrap_width))
+    return tuple(wrapped_help)
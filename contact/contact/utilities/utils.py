@@ -7,6 +7,8 @@ from meshtastic.protobuf import config_pb2, portnums_pb2
 
 import contact.ui.default_config as config
 import contact.utilities.telemetry_beautifier as tb
+from contact.utilities.message_window import MessageWindows
+from contact.utilities.node_query import CONFIG_SORTS, NodeQuery, index_for, parse_node_query
 from contact.utilities.singleton import interface_state, ui_state
 
 DAYS_IN_YEAR = 365
@@ -14,6 +16,7 @@ DAYS_IN_MONTH = 30
 DAYS_IN_WEEK = 7
 SECONDS_IN_HOUR = 3600
 SECONDS_IN_MINUTE = 60
+SPARK_BLOCKS = "▁▂▃▄▅▆▇█"
 
 KEY_ESC = 27
 KEY_BACKSPACE = 127
@@ -51,37 +54,40 @@ def get_channels():
     return ui_state.channel_list
 
 
-def get_node_list():
-    if interface_state.interface.nodes:
-        my_node_num = interface_state.my_node_num
+def get_node_list(query_text=None, rebuild=False):
+    """
+    The node pane's node numbers: ours first, then the others matching ui_state.node_filter (or query_text).
 
-        def node_sort(node):
-            if config.node_sort == "lastHeard":
-                return -node["lastHeard"] if ("lastHeard" in node and isinstance(node["lastHeard"], int)) else 0
-            elif config.node_sort == "name":
-                return node["user"]["longName"]
-            elif config.node_sort == "hops":
-                return node["hopsAway"] if "hopsAway" in node else 100
-            else:
-                return node
-
-        sorted_nodes = sorted(interface_state.interface.nodes.values(), key=node_sort)
-
-        # Move favorite nodes to the beginning
-        sorted_nodes = sorted(
-            sorted_nodes, key=lambda node: node["isFavorite"] if "isFavorite" in node else False, reverse=True
-        )
-
-        # Move ignored nodes to the end
-        sorted_nodes = sorted(sorted_nodes, key=lambda node: node["isIgnored"] if "isIgnored" in node else False)
-
-        node_list = [node["num"] for node in sorted_nodes if node["num"] != my_node_num]
-        return [my_node_num] + node_list  # Ensuring your node is always first
-    return []
+    The interface's node index follows received packets (see refresh_node_list), so it is only rebuilt
+    when asked to or when it has lost track of nodes coming or going.
+    """
+    interface = interface_state.interface
+    if not interface.nodes:
+        return []
+    index = index_for(interface)
+    if rebuild or len(index.keys) != len(interface.nodes):
+        index.rebuild(interface.nodes.values())
+    return select_nodes(index, query_text)
 
 
-def refresh_node_list():
-    new_node_list = get_node_list()
+def select_nodes(index, query_text=None):
+    try:
+        query = parse_node_query(ui_state.node_filter if query_text is None else query_text)
+    except ValueError:
+        query = NodeQuery()  # A half-typed filter shows every node
+    return index.select(query, CONFIG_SORTS.get(config.node_sort, "heard"), pinned=interface_state.my_node_num)
+
+
+def refresh_node_list(node_num=None):
+    """Update ui_state.node_list, after a change to node_num only if given. True if the list changed."""
+    interface = interface_state.interface
+    index = index_for(interface)
+    if node_num is None or not interface.nodes or len(index.keys) != len(interface.nodes):
+        new_node_list = get_node_list(rebuild=True)
+    elif index.update(interface.nodes.get(decimal_to_hex(node_num)), node_num):
+        new_node_list = select_nodes(index)
+    else:
+        return False  # Nothing that filters or sorts look at has changed
     if new_node_list != ui_state.node_list:
         ui_state.node_list = new_node_list
         return True
@@ -149,7 +155,27 @@ def get_time_ago(timestamp):
     return "now"
 
 
+def sparkline(values, low=None, high=None):
+    """Draw values as block characters scaled from low to high (their own range by default), a space for None."""
+    present = [value for value in values if value is not None]
+    if not present:
+        return ""
+    low = min(present) if low is None else low
+    high = max(present) if high is None else high
+    top = len(SPARK_BLOCKS) - 1
+    levels = []
+    for value in values:
+        if value is None:
+            levels.append(" ")
+        elif high > low:
+            levels.append(SPARK_BLOCKS[round((min(max(value, low), high) - low) / (high - low) * top)])
+        else:
+            levels.append(SPARK_BLOCKS[top // 2])  # A flat series sits mid-height
+    return "".join(levels)
+
+
 def add_new_message(channel_id, prefix, message):
+    """Show a message in a channel, under an hour header. Returns its line."""
     if channel_id not in ui_state.all_messages:
         ui_state.all_messages[channel_id] = []
 
@@ -176,7 +202,14 @@ def add_new_message(channel_id, prefix, message):
 
     # Add the message
     ts_str = time.strftime("[%H:%M:%S] ")
-    ui_state.all_messages[channel_id].append((f"{ts_str}{prefix}", message))
+    entry = (f"{ts_str}{prefix}", message)
+    ui_state.all_messages[channel_id].append(entry)
+
+    if isinstance(ui_state.all_messages, MessageWindows):  # Not the merged view's, which only borrows the lists
+        ui_state.all_messages.trim(channel_id)
+        selected = ui_state.channel_list[ui_state.selected_channel] if ui_state.channel_list else None
+        ui_state.all_messages.touch(channel_id, keep=selected)
+    return entry
 
 
 def parse_protobuf(packet: dict) -> str | dict:  # noqa: PLR0911
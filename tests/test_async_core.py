@@ -0,0 +1,45 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+# Add the contact package directory to path to import the asyncio core
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+from contact.utilities.async_core import AsyncCore  # noqa: E402
+
+
+def test_helpers_run_inline_when_not_started():
+    core = AsyncCore()
+    calls = []
+
+    def handler(packet, interface):
+        calls.append(packet)
+
+    assert core.receive_listener(handler) is handler
+    assert core.threadsafe(handler) is handler
+    core.run_db(calls.append, "write")
+    assert calls == ["write"]
+
+
+def test_reader_thread_work_runs_on_the_loop_with_one_repaint():
+    core = AsyncCore()
+    core.start()
+    try:
+        seen, repaints, writes = [], [], []
+        core.on_repaint = lambda: repaints.append(len(seen))
+
+        def on_receive(packet, interface):
+            seen.append((packet, threading.current_thread() is threading.main_thread()))
+            core.run_db(writes.append, packet)
+
+        listener = core.receive_listener(on_receive)
+        reader = threading.Thread(target=lambda: [listener(i, None) for i in range(5)])
+        reader.start()
+        reader.join()
+        core.loop.run_until_complete(asyncio.sleep(0.05))
+    finally:
+        core.stop()
+
+    assert seen == [(i, True) for i in range(5)]
+    assert repaints == [5]  # A burst is painted once, after every packet in it
+    assert writes == list(range(5))  # Database writes keep their order
@@ -0,0 +1,106 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("meshtastic")
+
+# Add the contact package directory to path to import the capture module
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+from meshtastic.protobuf import channel_pb2  # noqa: E402
+from pubsub import pub  # noqa: E402
+
+from contact.utilities.capture import CaptureRecorder, ReplayInterface, load_capture  # noqa: E402
+from contact.utilities.offline_interface import OfflineInterface, OfflineNode  # noqa: E402
+
+MY_NODE = 0x11111111
+OTHER_NODE = 0x22222222
+
+PACKETS = [
+    {
+        "from": OTHER_NODE,
+        "to": 0xFFFFFFFF,
+        "rxTime": 1700000000,
+        "decoded": {"portnum": "TEXT_MESSAGE_APP", "payload": "hello 👋".encode(), "text": "hello 👋"},
+    },
+    {
+        "from": OTHER_NODE,
+        "to": MY_NODE,
+        "rxTime": 1700000005,
+        "decoded": {
+            "portnum": "NODEINFO_APP",
+            "payload": b"\x00\xff",
+            "user": {"id": "!22222222", "longName": "Other", "shortName": "OTH"},
+        },
+    },
+    {"from": OTHER_NODE, "to": 0xFFFFFFFF, "encrypted": "AAEC"},
+]
+
+
+def _radio():
+    channel = channel_pb2.Channel()
+    channel.role = channel_pb2.Channel.Role.PRIMARY
+    channel.settings.name = "Test"
+    nodes = {"!11111111": {"num": MY_NODE, "user": {"id": "!11111111", "longName": "Me", "shortName": "ME"}}}
+    return OfflineInterface(MY_NODE, nodes, OfflineNode(MY_NODE, [channel]))
+
+
+def _record(path, packets):
+    radio = _radio()
+    recorder = CaptureRecorder(str(path))
+    recorder.start()
+    try:
+        for packet in packets:
+            pub.sendMessage("meshtastic.receive", packet=packet, interface=radio)
+    finally:
+        recorder.stop()
+    return recorder
+
+
+def test_capture_round_trip(tmp_path):
+    path = tmp_path / "session.capture"
+    assert _record(path, PACKETS).count == len(PACKETS)
+
+    header, packets = load_capture(str(path))
+    assert header["my_node_num"] == MY_NODE
+    assert [packet for _, packet in packets] == PACKETS
+    assert all(earlier <= later for (earlier, _), (later, _) in zip(packets, packets[1:], strict=False))
+
+
+def test_appended_sessions_play_back_to_back(tmp_path):
+    path = tmp_path / "session.capture"
+    _record(path, PACKETS[:1])
+    _record(path, PACKETS[1:])
+
+    _, packets = load_capture(str(path))
+    assert [packet for _, packet in packets] == PACKETS
+
+
+def test_replay_publishes_packets_and_updates_nodes(tmp_path):
+    path = tmp_path / "session.capture"
+    _record(path, PACKETS)
+
+    replay = ReplayInterface(str(path), speed=0)
+    assert replay.localNode.channels[0].settings.name == "Test"
+    assert replay.getMyNodeInfo()["user"]["longName"] == "Me"
+
+    received = []
+
+    def listener(packet, interface):
+        if interface is replay:
+            received.append(packet)
+
+    pub.subscribe(listener, "meshtastic.receive")
+    try:
+        assert replay.play() == len(PACKETS)
+    finally:
+        pub.unsubscribe(listener, "meshtastic.receive")
+
+    assert received == PACKETS
+    assert replay.finished.is_set()
+    assert replay.nodesByNum[OTHER_NODE]["user"]["longName"] == "Other"
+    assert replay.nodesByNum[OTHER_NODE]["lastHeard"] == 1700000005  # noqa: PLR2004
+
+    sent = replay.sendText("reply", destinationId=OTHER_NODE)
+    assert sent.id == replay.sent[-1]["id"]
+    assert replay.sent[-1]["data"] == b"reply"
@@ -0,0 +1,39 @@
+import curses
+import itertools
+import sys
+from pathlib import Path
+
+# Add the contact package to path to import the color helpers
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+import contact.ui.default_config as config  # noqa: E402
+from contact.ui import colors  # noqa: E402
+
+
+def per_call_color(category: str, bold: object, reverse: object, underline: object) -> int:
+    """get_color as it was before the table: a color_pair call and attribute bits per lookup."""
+    color = curses.color_pair(config.COLOR_CONFIG[category])
+    if bold:
+        color |= curses.A_BOLD
+    if reverse:
+        color |= curses.A_REVERSE
+    if underline:
+        color |= curses.A_UNDERLINE
+    return color
+
+
+def test_table_matches_the_per_call_attributes(monkeypatch):
+    monkeypatch.setattr(curses, "color_pair", lambda pair: pair << 8)  # As ncurses' COLOR_PAIR(), without a terminal
+    monkeypatch.setattr(config, "COLOR_CONFIG", {"default": 1, "node_list": 2, "settings_warning": 3})
+    monkeypatch.setattr(colors, "_color_table", {})
+
+    def all_combinations() -> list[int]:
+        return [colors.get_color("node_list", *flags) for flags in itertools.product([False, True], repeat=3)]
+
+    before = all_combinations()
+    colors.build_color_table()
+    assert all_combinations() == before
+
+    truthy_values = [False, True, 0, 1, 2, None, "", "yes"]  # Callers pass counts and strings, too
+    for category in config.COLOR_CONFIG:
+        for flags in itertools.product(truthy_values, repeat=3):
+            assert colors.get_color(category, *flags) == per_call_color(category, *flags), (category, flags)
@@ -0,0 +1,184 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("meshtastic")
+
+# Add the contact package to path to import the config import/export helpers
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+from meshtastic.protobuf import channel_pb2, config_pb2, localonly_pb2  # noqa: E402
+from pubsub import pub  # noqa: E402
+
+from contact.utilities.config_io import AdminWriter, ConfigChange, apply_config_plan, plan_config_import  # noqa: E402
+
+WINDOW = 2
+NODE_NUM = 0x1234
+CHANNEL_URL = "https://meshtastic.org/e/#CgMSAQESCAgBOAFAA0gB"
+
+
+class AckingNode:
+    """Answers each admin packet with a routing ACK, or the errorReason (None: nothing) given for its label."""
+
+    def __init__(self, radio: object, events: list[tuple[str, str]], replies: dict[str, str | None]) -> None:
+        self.radio = radio
+        self.events = events
+        self.replies = replies
+        self.last_id = 0
+
+    def send(self, label: str) -> SimpleNamespace:
+        self.last_id += 1
+        self.events.append(("send", label))
+        reason = self.replies.get(label, "NONE")
+        if reason is not None:
+            routing = {} if reason == "NONE" else {"errorReason": reason}  # NONE is left out, as meshtastic does
+            packet = {"decoded": {"requestId": self.last_id, "routing": routing}}
+            pub.sendMessage("meshtastic.receive.routing", packet=packet, interface=self.radio)
+        return SimpleNamespace(id=self.last_id)
+
+    def beginSettingsTransaction(self) -> SimpleNamespace:  # noqa: N802
+        return self.send("begin transaction")
+
+    def commitSettingsTransaction(self) -> SimpleNamespace:  # noqa: N802
+        return self.send("commit transaction")
+
+
+def run_writer(labels: list[str], replies: dict[str, str | None], radio: object = None) -> tuple[list[str], list]:
+    radio = radio or object()
+    events: list[tuple[str, str]] = []
+    node = AckingNode(radio, events, replies)
+    writer = AdminWriter(radio, node, lambda done, total, label: events.append(("done", label)), 0.05, WINDOW)
+    for label in labels:
+        writer.add(label, lambda label=label: node.send(label))
+    return writer.run(), events
+
+
+def test_writes_are_bracketed_and_kept_within_the_window():
+    failed, events = run_writer(["lora", "device", "position", "display", "mqtt"], {})
+
+    assert failed == []
+    assert events[:2] == [("send", "begin transaction"), ("done", "begin transaction")]
+    assert events[-2:] == [("send", "commit transaction"), ("done", "commit transaction")]
+    outstanding = most = 0
+    for kind, _ in events[2:-2]:
+        outstanding += 1 if kind == "send" else -1
+        most = max(most, outstanding)
+    assert most == WINDOW  # Back-pressure: the next write waits for the oldest
+    assert [label for kind, label in events if kind == "done"][1:-1] == [
+        "lora",
+        "device",
+        "position",
+        "display",
+        "mqtt",
+    ]
+
+
+def test_naks_and_missing_acks_fail_their_writes_only(caplog):
+    failed, events = run_writer(["lora", "device", "position"], {"lora": "NO_RESPONSE", "position": None})
+
+    assert failed == ["lora", "position"]
+    assert events[-1] == ("done", "commit transaction")  # The rest still goes through
+    assert "Radio rejected lora: NO_RESPONSE" in caplog.text
+    assert "No ACK for position" in caplog.text
+
+
+def test_acks_from_another_radio_are_ignored():
+    other = object()
+
+    class OtherRadioNode(AckingNode):
+        def send(self, label: str) -> SimpleNamespace:
+            self.radio, radio = other, self.radio
+            try:
+                return super().send(label)
+            finally:
+                self.radio = radio
+
+    radio = object()
+    events: list[tuple[str, str]] = []
+    writer = AdminWriter(radio, OtherRadioNode(radio, events, {}), timeout=0.05)
+    assert writer.run() == ["begin transaction", "commit transaction"]
+
+
+class ConfigNode(AckingNode):
+    """A node with settings; every write is recorded as a send and ACKed."""
+
+    def __init__(self, radio: object, events: list[tuple[str, str]], channels: list | None) -> None:
+        super().__init__(radio, events, {})
+        self.nodeNum = NODE_NUM
+        self.channels = channels
+        self.localConfig = localonly_pb2.LocalConfig()
+        self.localConfig.lora.hop_limit = 3
+        self.localConfig.lora.region = config_pb2.Config.LoRaConfig.RegionCode.EU_868
+        self.localConfig.device.role = config_pb2.Config.DeviceConfig.Role.CLIENT
+        self.moduleConfig = localonly_pb2.LocalModuleConfig()
+
+    def getURL(self) -> str:  # noqa: N802
+        return CHANNEL_URL
+
+    def setOwner(self, long_name: str | None = None, short_name: str | None = None) -> SimpleNamespace:  # noqa: N802
+        return self.send("owner")
+
+    def setURL(self, url: str) -> SimpleNamespace:  # noqa: N802
+        return self.send("channel_url")
+
+    def _sendAdmin(self, message) -> SimpleNamespace:  # noqa: N802
+        section = message.set_config if message.HasField("set_config") else message.set_module_config
+        return self.send(section.WhichOneof("payload_variant"))
+
+
+def make_node(channels_known: bool = True) -> tuple[SimpleNamespace, ConfigNode, list[tuple[str, str]]]:
+    events: list[tuple[str, str]] = []
+    interface = SimpleNamespace(nodesByNum={NODE_NUM: {"num": NODE_NUM, "user": {"longName": "Me"}}})
+    node = ConfigNode(interface, events, [channel_pb2.Channel()] if channels_known else None)
+    return interface, node, events
+
+
+def import_config(interface, node, configuration: dict):
+    plan = plan_config_import(interface, node, configuration)
+    return plan, apply_config_plan(interface, node, plan, timeout=0.05)
+
+
+def test_an_identical_import_writes_nothing():
+    interface, node, events = make_node()
+    configuration = {
+        "owner": "Me",
+        "channel_url": CHANNEL_URL,
+        "config": {"lora": {"hopLimit": 3, "region": "EU_868"}, "device": {"role": "CLIENT"}},
+    }
+
+    plan, failed = import_config(interface, node, configuration)
+
+    assert plan.is_empty and plan.config_sections == [] and failed == []
+    assert events == []  # Not even a settings transaction
+
+
+def test_one_changed_field_writes_only_its_section():
+    interface, node, events = make_node()
+    configuration = {
+        "owner": "Me",
+        "config": {"lora": {"hopLimit": 5, "region": "EU_868"}, "device": {"role": "CLIENT"}},
+    }
+
+    plan, failed = import_config(interface, node, configuration)
+
+    assert plan.changes == [ConfigChange("config.lora.hop_limit", 3, 5)]
+    assert failed == []
+    assert [label for kind, label in events if kind == "send"] == ["begin transaction", "lora", "commit transaction"]
+    assert node.localConfig.lora.hop_limit == 5  # noqa: PLR2004
+
+
+def test_unknown_channels_leave_the_channel_url_alone(caplog):
+    interface, node, events = make_node(channels_known=False)  # A remote node fetched without its channels
+
+    plan, failed = import_config(interface, node, {"channel_url": "https://meshtastic.org/e/#other"})
+
+    assert plan.is_empty and plan.channel_url is None and failed == []
+    assert plan.skipped == ["channel_url"]
+    assert events == []
+    assert "not writing the channel URL" in caplog.text
+
+    interface, node, events = make_node()
+    plan, failed = import_config(interface, node, {"channel_url": "https://meshtastic.org/e/#other"})
+    assert plan.changes == [ConfigChange("channel_url", CHANNEL_URL, "https://meshtastic.org/e/#other")]
+    assert ("send", "channel_url") in events
@@ -0,0 +1,130 @@
+import socket
+import stat
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the contact package to path to import the control socket
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+from contact.utilities import control_socket  # noqa: E402
+from contact.utilities.control_socket import ControlClient, ControlServer  # noqa: E402
+
+EVENTS = 50
+
+
+@pytest.fixture
+def socket_path():
+    with tempfile.TemporaryDirectory(dir="/tmp") as directory:  # AF_UNIX paths are short
+        yield str(Path(directory) / "contact.sock")
+
+
+@pytest.fixture
+def serve(socket_path):
+    servers = []
+
+    def serve(handlers: dict | None = None) -> ControlServer:
+        server = ControlServer(socket_path, handlers or {})
+        server.start()
+        servers.append(server)
+        return server
+
+    yield serve
+    for server in servers:
+        server.stop()
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.events: list[tuple[str, dict]] = []
+        self.changed = threading.Condition()
+
+    def __call__(self, event: str, data: dict) -> None:
+        with self.changed:
+            self.events.append((event, data))
+            self.changed.notify_all()
+
+    def wait_for(self, count: int) -> list[tuple[str, dict]]:
+        with self.changed:
+            self.changed.wait_for(lambda: len(self.events) >= count, 5.0)
+        return self.events
+
+
+def test_a_client_that_stops_reading_is_dropped_without_stalling_the_rest(serve, socket_path, monkeypatch):
+    monkeypatch.setattr(control_socket, "CLIENT_QUEUE_LIMIT", 4)
+    server = serve()
+    stuck = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stuck.connect(socket_path)
+    stuck.sendall(b'{"id": 1, "cmd": "subscribe"}\n')  # ...and never reads again
+    events = Recorder()
+    client = ControlClient(socket_path, on_event=events)
+    client.subscribe()
+    time.sleep(0.1)
+
+    broadcasting = 0.0
+    for number in range(EVENTS):
+        started = time.monotonic()
+        server.broadcast("packet", number=number, payload="x" * 100_000)  # Soon more than the stuck socket holds
+        broadcasting += time.monotonic() - started
+        events.wait_for(number + 1)
+    assert broadcasting < 1.0  # Queued, never written inline
+
+    assert [data["number"] for _, data in events.events] == list(range(EVENTS))
+    assert len(server._subscribers) == 1
+    client.close()
+    stuck.close()
+
+
+def test_the_socket_is_private_and_a_live_daemon_is_not_replaced(serve, socket_path):
+    serve({"ping": lambda request: "pong"})
+    assert stat.S_IMODE(Path(socket_path).stat().st_mode) == 0o600  # noqa: PLR2004
+
+    with pytest.raises(OSError, match="Another daemon"):
+        ControlServer(socket_path, {})
+    client = ControlClient(socket_path)
+    assert client.request("ping") == "pong"  # Still the first daemon's
+    client.close()
+
+
+def test_a_stale_socket_file_is_replaced(serve, socket_path):
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()  # The file stays; nothing listens on it
+
+    serve({"ping": lambda request: "pong"})
+    client = ControlClient(socket_path)
+    assert client.request("ping") == "pong"
+    client.close()
+
+
+def test_responses_go_only_to_the_client_that_sent(serve, socket_path, monkeypatch):
+    pytest.importorskip("meshtastic")
+    from contact.utilities.headless import HeadlessDaemon  # noqa: PLC0415
+    from contact.utilities.singleton import interface_state  # noqa: PLC0415
+
+    callbacks = []
+
+    class Radio:
+        def sendData(self, data, **kwargs):  # noqa: N802
+            callbacks.append(kwargs["onResponse"])
+            return type("Packet", (), {"id": len(callbacks)})()
+
+    monkeypatch.setattr(interface_state, "interface", Radio())
+    daemon = HeadlessDaemon.__new__(HeadlessDaemon)
+    daemon.server = serve({"send_data": daemon.send_data})
+    sender, bystander = Recorder(), Recorder()
+    clients = [ControlClient(socket_path, on_event=sender), ControlClient(socket_path, on_event=bystander)]
+    for client in clients:
+        client.subscribe()
+
+    assert clients[0].request("send_data", data=b"hi", callback=True) == {"id": 1}
+    callbacks[0]({"decoded": {"requestId": 1}})
+
+    assert sender.wait_for(1) == [("response", {"packet": {"decoded": {"requestId": 1}}})]
+    daemon.server.broadcast("packet", packet={})
+    assert bystander.wait_for(1) == [("packet", {"packet": {}})]  # Not the response before it
+    for client in clients:
+        client.close()
@@ -0,0 +1,42 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add the contact package to path to import the database helpers
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+import contact.ui.default_config as config  # noqa: E402
+from contact.utilities import db_handler  # noqa: E402
+from contact.utilities.singleton import interface_state  # noqa: E402
+
+
+def test_archived_chats_are_read_once_and_kept_in_sync(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "db_file_path", str(tmp_path / "client.db"))
+    monkeypatch.setattr(db_handler, "_archived_chats", {})
+    monkeypatch.setattr(interface_state, "my_node_num", 1)
+    db_handler.update_node_info_in_db(7, long_name="Seven", chat_archived=True)
+    db_handler.update_node_info_in_db(8, long_name="Eight")
+    monkeypatch.setattr(interface_state, "my_node_num", 2)
+    db_handler.update_node_info_in_db(8, long_name="Eight", chat_archived=True)
+
+    monkeypatch.setattr(interface_state, "my_node_num", 1)
+    assert db_handler.is_chat_archived(7) is True
+    assert db_handler.is_chat_archived(8) is False
+    assert db_handler.is_chat_archived("LongFast") is False
+
+    db_handler.update_node_info_in_db(7, chat_archived=False)
+    db_handler.update_node_info_in_db(8, chat_archived=True)
+
+    def no_disk(*args, **kwargs):
+        raise AssertionError("read the database again")
+
+    monkeypatch.setattr(sqlite3, "connect", no_disk)
+    assert not db_handler.is_chat_archived(7)
+    assert db_handler.is_chat_archived(8)
+    monkeypatch.undo()
+
+    monkeypatch.setattr(config, "db_file_path", str(tmp_path / "client.db"))
+    monkeypatch.setattr(db_handler, "_archived_chats", {})
+    monkeypatch.setattr(interface_state, "my_node_num", 2)
+    assert db_handler.archived_chats() == {8}  # Each radio has its own
+    monkeypatch.setattr(interface_state, "my_node_num", 1)
+    assert db_handler.archived_chats() == {8}  # The updates were written through
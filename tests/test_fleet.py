@@ -0,0 +1,185 @@
+import json
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("meshtastic")
+
+# Add the contact package to path to import the fleet config push
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+from meshtastic.node import Node  # noqa: E402
+from meshtastic.protobuf import admin_pb2, channel_pb2, localonly_pb2  # noqa: E402
+from pubsub import pub  # noqa: E402
+
+from contact.utilities import fleet  # noqa: E402
+
+MODULE_SECTIONS = {"MQTT_CONFIG": "mqtt", "EXTNOTIF_CONFIG": "external_notification"}
+
+
+class Radio:
+    """The settings on a remote node, and how many fleet attempts it ignores before answering."""
+
+    def __init__(self, silent_attempts: int = 0) -> None:
+        self.local_config = localonly_pb2.LocalConfig()
+        self.local_config.lora.hop_limit = 3
+        self.module_config = localonly_pb2.LocalModuleConfig()
+        self.channels = [channel_pb2.Channel(index=index) for index in range(fleet.MAX_CHANNELS)]
+        self.channels[0].role = channel_pb2.Channel.Role.PRIMARY
+        self.channels[0].settings.name = "Fleet"
+        self.silent_attempts = silent_attempts
+        self.writes: list[str] = []
+        self.lock = threading.Lock()
+
+
+class RemoteNode(Node):
+    """A remote node as getNode(requestChannels=False) returns it, backed by a Radio that answers over the mesh."""
+
+    def __init__(self, mesh: "Mesh", node_num: int, radio: Radio, answers: bool) -> None:
+        super().__init__(mesh, node_num)
+        self.radio = radio
+        self.answers = answers
+
+    def _sendAdmin(self, p, wantResponse=True, onResponse=None, adminIndex=0):  # noqa: N802, N803
+        with self.radio.lock:
+            self.iface.last_id += 1
+            packet_id = self.iface.last_id
+            reply = self._reply(p) if self.answers else None
+        if reply is not None and onResponse is not None:
+            onResponse({"decoded": {"admin": {"raw": reply}}})
+        elif self.answers and p.WhichOneof("payload_variant") != "get_config_request":
+            packet = {"decoded": {"requestId": packet_id, "routing": {}}}
+            pub.sendMessage("meshtastic.receive.routing", packet=packet, interface=self.iface)
+        return SimpleNamespace(id=packet_id)
+
+    def _reply(self, p: admin_pb2.AdminMessage) -> admin_pb2.AdminMessage | None:
+        reply = admin_pb2.AdminMessage()
+        variant = p.WhichOneof("payload_variant")
+        if variant == "get_config_request":
+            name = admin_pb2.AdminMessage.ConfigType.Name(p.get_config_request)[: -len("_CONFIG")].lower()
+            if name in self.radio.local_config.DESCRIPTOR.fields_by_name:
+                getattr(reply.get_config_response, name).CopyFrom(getattr(self.radio.local_config, name))
+            return reply
+        if variant == "get_module_config_request":
+            name = MODULE_SECTIONS[admin_pb2.AdminMessage.ModuleConfigType.Name(p.get_module_config_request)]
+            getattr(reply.get_module_config_response, name).CopyFrom(getattr(self.radio.module_config, name))
+            return reply
+        if variant == "get_channel_request":
+            reply.get_channel_response.CopyFrom(self.radio.channels[p.get_channel_request - 1])
+            return reply
+        if variant == "set_config":
+            section = p.set_config.WhichOneof("payload_variant")
+            getattr(self.radio.local_config, section).CopyFrom(getattr(p.set_config, section))
+        elif variant == "set_module_config":
+            section = p.set_module_config.WhichOneof("payload_variant")
+            getattr(self.radio.module_config, section).CopyFrom(getattr(p.set_module_config, section))
+        elif variant == "set_channel":
+            section = f"channel {p.set_channel.index}"
+            self.radio.channels[p.set_channel.index].CopyFrom(p.set_channel)
+        else:
+            section = variant
+        self.radio.writes.append(section)
+        return None
+
+
+class Mesh:
+    """The interface remote nodes are reached through."""
+
+    def __init__(self, radios: dict[int, Radio]) -> None:
+        self.radios = radios
+        self.localNode = None
+        self.nodesByNum = {num: {"num": num, "adminSessionPassKey": b"key"} for num in radios}
+        self.last_id = 0
+
+    def getNode(self, node_num: int, requestChannels: bool = True) -> RemoteNode:  # noqa: N802, N803
+        radio = self.radios[node_num]
+        with radio.lock:
+            answers = radio.silent_attempts == 0
+            radio.silent_attempts = max(0, radio.silent_attempts - 1)
+        return RemoteNode(self, node_num, radio, answers)
+
+    def _getOrCreateByNum(self, node_num: int) -> dict:  # noqa: N802
+        return self.nodesByNum.setdefault(node_num, {"num": node_num})
+
+
+@pytest.fixture(autouse=True)
+def quick(monkeypatch):
+    monkeypatch.setattr(fleet, "FLEET_REMOTE_TIMEOUT", 0.05)
+    monkeypatch.setattr(fleet, "FLEET_RETRY_BACKOFF", 0.0)
+
+
+def test_targets_are_parsed():
+    assert fleet.parse_node_target("!a1b2c3d4") == fleet.FleetTarget("!a1b2c3d4", node_num=0xA1B2C3D4)
+    assert fleet.parse_node_target(" 0xA1B2C3D4 ").node_num == 0xA1B2C3D4  # noqa: PLR2004
+    assert fleet.parse_node_target("2712847316").name == "!a1b2c3d4"
+    with pytest.raises(ValueError):
+        fleet.parse_node_target("base camp")
+
+    target = fleet.parse_interface_target("tcp:10.0.0.5")
+    assert target.name == "tcp:10.0.0.5" and target.node_num is None
+    assert target.connection.host == "10.0.0.5"
+    with pytest.raises(ValueError):
+        fleet.parse_interface_target("usb:0")
+
+
+def test_only_changed_settings_reach_each_node(tmp_path):
+    radios = {1: Radio(), 2: Radio()}
+    radios[2].module_config.external_notification.enabled = True  # Already as the file has it
+    mesh = Mesh(radios)
+    reference = RemoteNode(mesh, 1, radios[1], answers=False)
+    reference.localConfig.lora.CopyFrom(radios[1].local_config.lora)
+    reference.channels = radios[1].channels
+    configuration = {
+        "channel_url": reference.getURL(),  # Unchanged, once the channels are read back
+        "module_config": {"externalNotification": {"enabled": True}, "mqtt": {"enabled": False}},
+    }
+    targets = [fleet.FleetTarget("!00000001", 1), fleet.FleetTarget("!00000002", 2)]
+
+    results = fleet.push_config(configuration, targets, mesh)
+
+    assert [(result.ok, result.changes, result.attempts) for result in results] == [(True, 1, 1), (True, 0, 1)]
+    assert radios[1].writes == ["begin_edit_settings", "external_notification", "commit_edit_settings"]
+    assert radios[2].writes == []
+    assert radios[1].module_config.external_notification.enabled
+
+    report = fleet.format_fleet_report(results)
+    assert report.splitlines()[1].split()[:4] == ["!00000001", "OK", "1", "1"]
+    assert report.endswith("2/2 nodes configured")
+    fleet.save_fleet_report(results, str(tmp_path / "report.json"))
+    assert json.loads((tmp_path / "report.json").read_text())[1]["target"] == "!00000002"
+
+
+def test_silent_nodes_are_retried_then_reported(caplog):
+    radios = {1: Radio(silent_attempts=1), 2: Radio(silent_attempts=5)}
+    targets = [fleet.FleetTarget("!00000001", 1), fleet.FleetTarget("!00000002", 2)]
+
+    results = fleet.push_config({"config": {"lora": {"hopLimit": 4}}}, targets, Mesh(radios), retries=2)
+
+    assert (results[0].ok, results[0].attempts, results[0].error) == (True, 2, None)
+    assert (results[1].ok, results[1].attempts, results[1].error) == (False, 3, "No session key from node")
+    assert radios[1].local_config.lora.hop_limit == 4  # noqa: PLR2004
+    assert radios[2].writes == []
+    assert "!00000002 failed on attempt 3" in caplog.text
+    assert fleet.format_fleet_report(results).endswith("1/2 nodes configured")
+
+
+def test_a_meshtastic_exit_fails_one_node_and_closes_its_transaction():
+    radios = {1: Radio(), 2: Radio()}
+    configuration = {"channel_url": "https://meshtastic.org/e/"}  # setURL exits: no channel settings in it
+    targets = [fleet.FleetTarget("!00000001", 1), fleet.FleetTarget("!00000002", 2)]
+
+    results = fleet.push_config(configuration, targets, Mesh(radios), retries=1)
+
+    assert [(result.ok, result.failed, result.attempts) for result in results] == [(False, ["channel_url"], 2)] * 2
+    for radio in radios.values():
+        assert radio.writes == ["begin_edit_settings", "commit_edit_settings"] * 2
+
+    def exits(*args, **kwargs):
+        raise SystemExit(1)
+
+    mesh = Mesh({3: Radio()})
+    mesh.getNode = exits
+    [result] = fleet.push_config({}, [fleet.FleetTarget("!00000003", 3)], mesh, retries=0)
+    assert (result.ok, result.error) == (False, "meshtastic exited with status 1")
@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the contact package to path to import the translation catalogs
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+import contact.ui.default_config as config  # noqa: E402
+from contact.utilities import i18n, ini_utils  # noqa: E402
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    monkeypatch.setattr(ini_utils, "_catalogs", {})
+    ini_file = tmp_path / "xx.ini"
+    ini_file.write_text('[config.lora]\nhop_limit, "Hop limit", "How far messages travel"\n', encoding="utf-8")
+    return ini_file, str(tmp_path / "cache")
+
+
+def reparsed(monkeypatch) -> list[str]:
+    """Forget the in-memory catalogs and record each INI file parsed from now on."""
+    parsed = []
+    parse = ini_utils.parse_ini_file
+    monkeypatch.setattr(ini_utils, "_catalogs", {})
+    monkeypatch.setattr(ini_utils, "parse_ini_file", lambda path: parsed.append(path) or parse(path))
+    return parsed
+
+
+def test_a_later_launch_reads_the_pickled_catalog(catalog, monkeypatch):
+    ini_file, cache_dir = catalog
+    field_mapping, help_text = ini_utils.load_catalog(str(ini_file), cache_dir)
+    assert field_mapping["config.lora.hop_limit"] == "Hop limit"
+
+    parsed = reparsed(monkeypatch)
+    assert ini_utils.load_catalog(str(ini_file), cache_dir) == (field_mapping, help_text)
+    assert parsed == []
+
+
+def test_an_edited_ini_file_is_parsed_again(catalog, monkeypatch):
+    ini_file, cache_dir = catalog
+    ini_utils.load_catalog(str(ini_file), cache_dir)
+    ini_file.write_text('[config.lora]\nhop_limit, "Max hops", ""\n', encoding="utf-8")
+
+    parsed = reparsed(monkeypatch)
+    field_mapping, _ = ini_utils.load_catalog(str(ini_file), cache_dir)
+    assert field_mapping["config.lora.hop_limit"] == "Max hops"
+    assert parsed == [str(ini_file)]
+
+    parsed = reparsed(monkeypatch)
+    ini_utils.load_catalog(str(ini_file), cache_dir)
+    assert parsed == []  # The rebuilt catalog was cached
+
+
+def test_a_corrupt_cache_is_ignored_and_replaced(catalog, monkeypatch, caplog):
+    ini_file, cache_dir = catalog
+    ini_utils.load_catalog(str(ini_file), cache_dir)
+    [cache_file] = Path(cache_dir).iterdir()
+    cache_file.write_bytes(b"\x80\x05not a pickle")
+
+    parsed = reparsed(monkeypatch)
+    field_mapping, _ = ini_utils.load_catalog(str(ini_file), cache_dir)
+    assert field_mapping["config.lora.hop_limit"] == "Hop limit"
+    assert parsed == [str(ini_file)]
+    assert "Ignoring unreadable translation cache" in caplog.text
+
+    parsed = reparsed(monkeypatch)
+    ini_utils.load_catalog(str(ini_file), cache_dir)
+    assert parsed == []
+
+
+def test_an_unreadable_language_falls_back_to_english(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(config, "translations_cache_dir", str(tmp_path))
+    english = config.get_localisation_file("en")
+    monkeypatch.setattr(config, "get_localisation_file", lambda language: {"en": english}.get(language, "/gone.ini"))
+
+    field_mapping, _ = i18n.load_language_catalog("xx")
+    assert field_mapping["Main Menu"] == "Main Menu"
+    assert "Unable to load translations for 'xx'" in caplog.text
+
+    monkeypatch.setattr(config, "get_localisation_file", lambda language: "/gone.ini")
+    assert i18n.load_language_catalog("xx") == ({}, {})
@@ -0,0 +1,57 @@
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the contact package directory to path to import the logging setup
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+from contact.utilities import log_setup  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def restore_root_logger():
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    yield
+    log_setup.stop_logging()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    for handler in saved_handlers:
+        root.addHandler(handler)
+    root.setLevel(saved_level)
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_records_are_json_lines_with_subsystem_levels(tmp_path):
+    path = tmp_path / "client.log"
+    log_setup.setup_logging(str(path), level="WARNING", levels={"radio": "DEBUG"})
+    logging.info("dropped by the default level")
+    logging.warning("kept %s", "warning")
+    logging.getLogger("meshtastic.mesh_interface").debug("radio detail %d", 7)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logging.error("failed", exc_info=True)
+    log_setup.stop_logging()
+
+    records = _read(path)
+    assert [record["message"] for record in records] == ["kept warning", "radio detail 7", "failed"]
+    assert records[0]["subsystem"] == "app"
+    assert records[1]["subsystem"] == "radio"
+    assert "ValueError: boom" in records[2]["exception"]
+
+
+def test_log_file_rotates(tmp_path):
+    path = tmp_path / "client.log"
+    log_setup.setup_logging(str(path), max_bytes="500", backup_count="2")
+    for i in range(50):
+        logging.info("line %s", i)
+    log_setup.stop_logging()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["client.log", "client.log.1", "client.log.2"]
+    assert _read(path)[-1]["message"] == "line 49"
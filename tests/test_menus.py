@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("meshtastic")
+
+# Add the contact package to path to import the settings menu builder
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+from meshtastic.protobuf import channel_pb2, config_pb2, localonly_pb2, module_config_pb2  # noqa: E402
+
+from contact.ui import menus  # noqa: E402
+
+
+def eager_menu(message_instance, current_config) -> dict:
+    """The whole tree at once, as the menu was built before it was made lazy."""
+    if not hasattr(message_instance, "DESCRIPTOR"):
+        return {}
+    menu = {}
+    for field in message_instance.DESCRIPTOR.fields:
+        if any(skip_field in field.full_name for skip_field in menus.SKIP_FIELDS):
+            continue
+        current_value = getattr(current_config, field.name, "Not Set") if current_config else "Not Set"
+        if field.message_type:
+            nested_config = getattr(current_config, field.name, None) if current_config else None
+            menu[field.name] = eager_menu(getattr(message_instance, field.name), nested_config)
+        elif field.enum_type and isinstance(current_value, int):
+            enum_value = field.enum_type.values_by_number.get(current_value)
+            menu[field.name] = (field, enum_value.name if enum_value else f"Unknown ({current_value})")
+        elif field.enum_type:
+            menu[field.name] = (field, current_value)
+        else:
+            menu[field.name] = (field, menus.encode_if_bytes(current_value))
+    return menu
+
+
+def as_dict(menu) -> dict:
+    return {key: as_dict(value) if isinstance(value, dict) else value for key, value in menu.items()}
+
+
+def local_config() -> localonly_pb2.LocalConfig:
+    config = localonly_pb2.LocalConfig()
+    config.lora.hop_limit = 5
+    config.lora.region = config_pb2.Config.LoRaConfig.RegionCode.EU_868
+    config.lora.ignore_incoming.append(7)  # Skipped
+    config.device.role = config_pb2.Config.DeviceConfig.Role.ROUTER
+    config.display.screen_on_secs = 30
+    config.network.wifi_ssid = "mesh"
+    return config
+
+
+@pytest.mark.parametrize(
+    ("message", "current"),
+    [
+        (config_pb2.Config(), local_config()),
+        (config_pb2.Config(), None),
+        (module_config_pb2.ModuleConfig(), localonly_pb2.LocalModuleConfig(mqtt={"enabled": True, "address": "a"})),
+        (channel_pb2.ChannelSettings(), channel_pb2.ChannelSettings(name="Fleet", psk=b"\x01\x02", id=9)),
+    ],
+)
+def test_lazy_menu_matches_the_eager_tree(message, current):
+    assert as_dict(menus.extract_fields(message, current)) == eager_menu(message, current)
+
+
+def test_submenus_are_built_on_first_access():
+    config = local_config()
+    menu = menus.LazyMenu(config_pb2.Config.DESCRIPTOR, config)
+    assert all(isinstance(dict.__getitem__(menu, name), menus._Unbound) for name in ("lora", "device", "display"))
+
+    lora = menu["lora"]
+    assert isinstance(lora, menus.LazyMenu) and lora["hop_limit"][1] == 5  # noqa: PLR2004
+    assert menu["lora"] is lora  # Bound once
+    assert isinstance(dict.__getitem__(menu, "device"), menus._Unbound)  # Untouched siblings stay unread
+
+    menus.menu_skeleton.cache_clear()
+    menus.LazyMenu(config_pb2.Config.DESCRIPTOR, config)["lora"]
+    menus.LazyMenu(config_pb2.Config.DESCRIPTOR, None)["lora"]
+    assert menus.menu_skeleton.cache_info().misses == 2  # noqa: PLR2004 - Config and LoRaConfig, once each
@@ -0,0 +1,71 @@
+import sys
+import threading
+from pathlib import Path
+
+# Add the contact package to path to import the message windows
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+import contact.ui.default_config as config  # noqa: E402
+from contact.utilities import message_window  # noqa: E402
+from contact.utilities.db_handler import reload_channel_messages, save_message_to_db  # noqa: E402
+from contact.utilities.message_window import MessageWindows, find_sent_entry  # noqa: E402
+from contact.utilities.singleton import app_state, interface_state  # noqa: E402
+
+
+def lines(hour: str, *texts: str) -> list[tuple[str, str]]:
+    return [(f"-- {hour} --", ""), *((f"[{hour[-5:-3]}:00:00] bob: ", text) for text in texts)]
+
+
+def test_channels_are_bounded_and_the_least_recently_used_are_emptied(monkeypatch):
+    monkeypatch.setattr(message_window, "MESSAGE_WINDOW", 4)
+    monkeypatch.setattr(message_window, "RESIDENT_CHANNELS", 2)
+
+    windows = MessageWindows({"A": lines("10:00", "a1", "a2") + lines("11:00", "a3", "a4")})
+    windows.trim("A")
+    assert windows["A"] == lines("11:00", "a3", "a4")  # No empty 10:00 header left over
+    windows["A"].extend(lines("11:00", "a5", "a6")[1:])
+    windows.trim("A")
+    assert windows["A"] == lines("11:00", "a4", "a5", "a6")  # The header stays on top
+
+    shown = windows["A"]
+    windows["B"], windows["C"] = lines("11:00", "b"), lines("11:00", "c")
+    windows.touch("B")
+    windows.touch("C", keep="A")
+    assert windows.evicted == {"B"}  # A is shown, so B goes instead
+    windows.touch("A")
+    windows.touch("C")
+    windows.touch("B")  # A message for B, still emptied until it is shown
+    assert windows.evicted == {"A", "B"}
+    assert shown == [] and windows["A"] is shown  # Emptied in place: the merged view holds the same list
+
+
+def test_reload_keeps_lines_added_after_it_was_queued(monkeypatch):
+    windows = MessageWindows({"A": []})
+    windows.evicted.add("A")
+    windows["A"].extend(lines("11:00", "stored while emptied"))  # Its write was queued before the reload
+
+    assert windows.start_reload("A")
+    assert not windows.start_reload("A")
+    windows["A"].extend(lines("11:00", "after")[1:])  # Written after the reload reads the table
+    windows.refill("A", lines("10:00", "old") + lines("11:00", "stored while emptied"))
+    assert windows["A"] == lines("10:00", "old") + lines("11:00", "stored while emptied", "after")
+
+
+def test_emptied_channels_are_read_back_and_sent_lines_found_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "db_file_path", str(tmp_path / "client.db"))
+    monkeypatch.setattr(interface_state, "my_node_num", 1)
+    monkeypatch.setattr(app_state, "lock", threading.RLock())
+    for text in ("one", "two", "three"):
+        save_message_to_db("Main", "1", text)
+
+    windows = MessageWindows({"Main": []})
+    windows.evicted.add("Main")
+    assert windows.start_reload("Main")
+    reload_channel_messages("Main", windows)
+    assert [message for _, message in windows["Main"]] == ["", "one", "two", "three"]
+
+    sent = ("[12:00:00] " + config.sent_message_prefix + config.ack_unknown_str + ": ", "two")
+    read_back = windows["Main"][find_sent_entry(windows["Main"], sent)]
+    assert read_back[1] == "two" and read_back is not sent  # A line read back, not the one that was sent
+    assert find_sent_entry(windows["Main"], ("x", "gone")) is None
+    windows["Main"].append(sent)
+    assert find_sent_entry(windows["Main"], sent) == len(windows["Main"]) - 1
@@ -0,0 +1,103 @@
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the contact package to path to import the node query engine
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+from contact.utilities.node_query import NodeIndex, parse_node_query  # noqa: E402
+
+NOW = time.time()
+CHURN = 0.1  # chance per update that a node is removed, or becomes a favorite
+
+
+def make_node(num: int, name: str, **fields) -> dict:
+    user = {"id": f"!{num:08x}", "longName": name, "shortName": name[:4], "hwModel": fields.pop("hw", "TBEAM")}
+    user["role"] = fields.pop("role", "CLIENT")
+    if fields.pop("secure", False):
+        user["publicKey"] = "key"
+    return {"num": num, "user": user, **fields}
+
+
+@pytest.fixture
+def index():
+    index = NodeIndex()
+    index.rebuild(
+        [
+            make_node(1, "Me", lastHeard=int(NOW)),
+            make_node(2, "Alpha Router", role="ROUTER", hopsAway=0, lastHeard=int(NOW) - 60, snr=8.0, secure=True),
+            make_node(3, "Bravo", hw="HELTEC_V3", hopsAway=2, lastHeard=int(NOW) - 7200, position={"latitudeI": 1}),
+            make_node(4, "Charlie", hopsAway=1, lastHeard=int(NOW) - 30, isFavorite=True),
+            make_node(5, "Delta Repeater", role="REPEATER", hopsAway=3, lastHeard=int(NOW) - 10, isIgnored=True),
+            make_node(6, "Echo", hw="HELTEC_V3", lastHeard=int(NOW) - 5, snr=-3.0),
+        ]
+    )
+    return index
+
+
+def select(index: NodeIndex, text: str, default_sort: str = "heard") -> list[int]:
+    return index.select(parse_node_query(text), default_sort, pinned=1)
+
+
+def test_filters_compose_and_keep_our_node_first(index):
+    assert select(index, "") == [1, 4, 6, 2, 3, 5]  # favorites first, ignored last, then most recently heard
+    assert select(index, "role:router,repeater") == [1, 2, 5]
+    assert select(index, "hw:heltec hops:>=1") == [1, 3]
+    assert select(index, "hops:<=1 -fav") == [1, 2]
+    assert select(index, "heard:<1h") == [1, 4, 6, 2, 5]
+    assert select(index, "heard:>1h") == [1, 3]
+    assert select(index, "pos") == [1, 3]
+    assert select(index, "enc") == [1, 2]
+    assert select(index, "ech") == [1, 6]
+    assert select(index, "!00000003") == [1, 3]
+
+    with pytest.raises(ValueError, match="Unknown filter"):
+        parse_node_query("colour:red")
+    with pytest.raises(ValueError, match="Unknown sort key"):
+        parse_node_query("sort:age")
+
+
+def test_multi_key_sorts(index):
+    assert select(index, "sort:hops,name") == [1, 4, 2, 3, 6, 5]
+    assert select(index, "sort:-name") == [1, 4, 6, 3, 2, 5]
+    assert select(index, "sort:snr") == [1, 4, 2, 6, 3, 5]
+    assert select(index, "sort:hw,-heard") == [1, 4, 3, 6, 2, 5]
+    assert select(index, "", default_sort="name") == [1, 4, 2, 3, 6, 5]
+
+
+def test_updates_keep_every_order_as_a_full_sort_would(index):
+    rng = random.Random(4)
+    nodes = {num: make_node(num, f"Node {num}", lastHeard=int(NOW) - num) for num in range(10, 60)}
+    index.rebuild(nodes.values())
+    queries = ["", "sort:name", "sort:-hops,heard", "hops:<=2 sort:snr"]
+    for query in queries:
+        select(index, query)  # Builds each order before the updates
+
+    for _ in range(300):
+        num = rng.randrange(10, 65)
+        if num in nodes and rng.random() < CHURN:
+            del nodes[num]
+            assert index.update(None, num)
+            continue
+        node = nodes.setdefault(num, make_node(num, f"Node {num}"))
+        node["lastHeard"] = int(NOW) - rng.randrange(1000)
+        node["hopsAway"] = rng.randrange(4)
+        node["snr"] = rng.choice([None, rng.uniform(-20, 10)])
+        node["isFavorite"] = rng.random() < CHURN
+        index.update(node, num)
+
+    assert not index.update(nodes[next(iter(nodes))], next(iter(nodes)))  # Unchanged
+    fresh = NodeIndex()
+    fresh.rebuild(nodes.values())
+    for query in queries:
+        assert select(index, query) == select(fresh, query)
+
+
+def test_nodes_without_a_number_are_not_indexed(index):
+    assert not index.update({"user": {"id": "!00000007", "longName": "Foxtrot"}}, 7)
+    assert select(index, "") == [1, 4, 6, 2, 3, 5]
+
+    assert index.update({"user": {"longName": "Echo"}}, 6)  # Its number went missing: dropped, as rebuild() would
+    assert select(index, "") == [1, 4, 2, 3, 5]
@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+# Add the contact package directory to path to import the perf module
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+from contact.utilities.perf import HotPathMetrics, StartupProfiler  # noqa: E402
+
+
+def test_timers_are_free_until_enabled():
+    metrics = HotPathMetrics()
+
+    @metrics.timed("work")
+    def work(value):
+        return value * 2
+
+    assert work(2) == 4  # noqa: PLR2004
+    assert work.__name__ == "work"
+    assert metrics.summary()["timers"] == {}
+
+    metrics.enable()
+    work(2)
+    with metrics.track("block"):
+        pass
+    timers = metrics.summary()["timers"]
+    assert timers["work"]["count"] == 1
+    assert set(timers) == {"work", "block"}
+
+
+def test_ring_keeps_latest_samples_and_summary(tmp_path):
+    metrics = HotPathMetrics(ring_size=10)
+    metrics.enable()
+    for duration in range(1, 21):
+        metrics.record("rx", duration / 1000)
+    metrics.gauge("queue", lambda: 3)
+    metrics.gauge("broken", lambda: 1 / 0)
+
+    summary = metrics.summary()
+    timer = summary["timers"]["rx"]
+    assert len(metrics.samples["rx"]) == 10  # noqa: PLR2004
+    assert timer["count"] == 20  # noqa: PLR2004
+    assert timer["max_ms"] == 20.0  # noqa: PLR2004
+    assert timer["p50_ms"] <= timer["p99_ms"] <= timer["max_ms"]
+    assert summary["gauges"] == {"queue": 3}
+    assert all(len(line) <= 60 for line in metrics.format_lines(60))  # noqa: PLR2004
+
+    path = tmp_path / "perf.json"
+    metrics.dump_json(str(path))
+    assert '"rx"' in path.read_text()
+
+
+def test_startup_total_stops_at_first_paint(monkeypatch):
+    clock = iter([0.0, 1.0, 2.5, 3.0, 500.0])
+    monkeypatch.setattr("contact.utilities.perf.time.perf_counter", lambda: next(clock))
+    profiler = StartupProfiler()  # Starts at 0.0
+    profiler.enabled = True
+    with profiler.phase("imports"):  # 1.0 to 2.5
+        pass
+    profiler.ready()  # 3.0; the session runs until 500.0
+
+    report = profiler.format_report()
+    assert "imports" in report and "1500.0 ms" in report
+    assert report.endswith("3000.0 ms")
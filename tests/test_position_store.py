@@ -0,0 +1,67 @@
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+# Add the contact package to path to import the position store
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+import contact.ui.default_config as config  # noqa: E402
+from contact.utilities import position_store  # noqa: E402
+from contact.utilities.singleton import interface_state  # noqa: E402
+
+
+def position_packet(node_num: int, latitude: float, longitude: float, altitude: int = 100) -> dict:
+    position = {"latitudeI": round(latitude * 1e7), "longitudeI": round(longitude * 1e7), "altitude": altitude}
+    return {"from": node_num, "decoded": {"portnum": "POSITION_APP", "position": position}}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "db_file_path", str(tmp_path / "client.db"))
+    monkeypatch.setattr(interface_state, "my_node_num", 1)
+    return position_store
+
+
+def test_tracks_skip_unchanged_fixes_and_export(store):
+    store.record_position(position_packet(7, 45.5, -122.6), timestamp=1000)
+    store.record_position(position_packet(7, 45.5, -122.6), timestamp=1060)  # still there
+    store.record_position(position_packet(7, 45.51, -122.61), timestamp=1120)
+    store.record_position(position_packet(8, 0, 0), timestamp=1120)  # no fix
+    store.record_position(position_packet(9, 45.6, -122.7, altitude=50), timestamp=1200)
+
+    tracks = store.load_tracks()
+    assert [point.timestamp for point in tracks[7]] == [1000, 1120]
+    assert list(tracks) == [7, 9]
+    assert {point.node_num for point in store.positions_in_bbox(45.0, -123.0, 46.0, -122.0)} == {7, 9}
+
+    names = store.node_names([7, 9])
+    assert names == {7: "!00000007", 9: "!00000009"}
+    geojson = store.tracks_to_geojson(tracks, names)
+    assert [feature["geometry"]["type"] for feature in geojson["features"]] == ["LineString", "Point"]
+    assert geojson["features"][0]["geometry"]["coordinates"][0] == pytest.approx([-122.6, 45.5, 100])
+    assert geojson["features"][0]["properties"]["times"] == ["1970-01-01T00:16:40Z", "1970-01-01T00:18:40Z"]
+
+    gpx = ET.fromstring(store.tracks_to_gpx(tracks, names))
+    points = gpx.findall(".//{http://www.topografix.com/GPX/1/1}trkpt")
+    assert [(point.get("lat"), point.get("lon")) for point in points][:2] == [
+        ("45.5000000", "-122.6000000"),
+        ("45.5100000", "-122.6100000"),
+    ]
+
+
+def test_area_queries_use_last_known_positions(store):
+    for node_num, (latitude, longitude) in enumerate(
+        [(45.5, -122.6), (45.52, -122.6), (45.6, -122.6), (46.5, -122.6), (-45.5, -122.6), (10.0, 179.99)], start=1
+    ):
+        store.record_position(position_packet(node_num, latitude, longitude), timestamp=1000)
+    store.record_position(position_packet(4, 45.51, -122.61), timestamp=2000)  # node 4 moved into the area
+
+    nearby = store.nodes_within(45.5, -122.6, 12.0)
+    assert [point.node_num for _, point in nearby] == [1, 4, 2, 3]
+    assert nearby[0][0] == pytest.approx(0.0)
+    assert nearby[2][0] == pytest.approx(2.224, abs=0.01)
+
+    assert {point.node_num for point in store.positions_in_bbox(45.55, -123.0, 45.65, -122.0)} == {3}
+    assert {point.node_num for point in store.positions_in_bbox(9.0, 179.0, 11.0, -179.0)} == {6}  # across 180°
+    assert [point.node_num for _, point in store.nodes_within(10.0, -179.99, 5.0)] == [6]
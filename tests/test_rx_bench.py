@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("meshtastic")
+
+# Add the benchmarks directory to path to import the RX benchmark suite
+sys.path.append(str(Path(__file__).resolve().parents[1] / "benchmarks"))
+import rx_bench  # noqa: E402
+
+
+def test_packet_stream_is_deterministic():
+    assert rx_bench.make_packets(50, seed=7) == rx_bench.make_packets(50, seed=7)
+    portnums = {packet["decoded"]["portnum"] for packet in rx_bench.make_packets(200)}
+    assert portnums == {"TEXT_MESSAGE_APP", "NODEINFO_APP", "TELEMETRY_APP", "POSITION_APP"}
+
+
+def test_benchmarks_run_the_whole_rx_path():
+    results = rx_bench.run_benchmarks(packet_count=40, allocations=False)
+
+    assert set(results) == set(rx_bench.load_baseline()), "rx_baseline.json is missing or has extra benchmarks"
+    texts = sum(p["decoded"]["portnum"] == "TEXT_MESSAGE_APP" for p in rx_bench.make_packets(40))
+    assert results["on_receive"]["ops"] == 40  # noqa: PLR2004
+    assert results["on_receive"]["messages"] >= texts
+    for result in results.values():
+        assert result["ops_per_sec"] > 0
+        assert result["p50_us"] <= result["p99_us"]
+
+
+def test_compare_to_baseline_flags_slowdowns():
+    baseline = {"on_receive": {"ops_per_sec": 100.0, "p50_us": 1000.0}}
+
+    assert rx_bench.compare_to_baseline({"on_receive": {"ops_per_sec": 80.0, "p50_us": 1200.0}}, baseline) == []
+    regressions = rx_bench.compare_to_baseline({"on_receive": {"ops_per_sec": 50.0, "p50_us": 2000.0}}, baseline)
+    assert len(regressions) == 2  # noqa: PLR2004
+    assert rx_bench.compare_to_baseline({"new_benchmark": {"ops_per_sec": 1.0, "p50_us": 1.0}}, baseline) == []
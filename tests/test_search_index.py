@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the contact package to path to import the search index
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+import contact.ui.default_config as config  # noqa: E402
+from contact.utilities.db_handler import update_node_info_in_db  # noqa: E402
+from contact.utilities.search_index import NameSearch, SearchIndex, search_index  # noqa: E402
+from contact.utilities.singleton import interface_state  # noqa: E402
+
+
+@pytest.fixture
+def index(monkeypatch):
+    monkeypatch.setattr(interface_state, "my_node_num", 1)
+    index = SearchIndex()
+    for num, long_name, short_name in [
+        (0x10, "Hilltop Router", "HILL"),
+        (0x20, "Base Camp", "BASE"),
+        (0x30, "Trail Head", "TRLH"),
+        (0x40, "Lighthouse", "LITE"),
+    ]:
+        index.set_node(num, long_name, short_name)
+    return index
+
+
+def test_matches_rank_prefix_then_substring_then_fuzzy(index):
+    items = [0x10, 0x20, 0x30, 0x40, "LongFast"]
+    search = NameSearch(index, items, start=1)
+
+    assert search.matches("") == [0x20, 0x30, 0x40, "LongFast", 0x10]  # From the selected item on
+    assert search.matches("l") == [0x40, "LongFast", 0x30, 0x10]  # Prefixes, then the rest in order
+    assert search.matches("lt") == [0x10, 0x40, "LongFast"]  # hiLLTop, then LighThouse and LongfasT
+    assert search.matches("LiGH") == [0x40]
+    assert search.matches("!00000030") == [0x30]
+    assert search.matches("48") == [0x30]  # The decimal node number
+
+
+def test_typing_narrows_the_previous_matches(index, monkeypatch):
+    items = [0x10, 0x20, 0x30, 0x40]
+    search = NameSearch(index, items)
+    assert search.matches("h") == [0x10, 0x30, 0x40]
+
+    checked = []
+    terms = index.terms
+    monkeypatch.setattr(index, "terms", lambda item: checked.append(item) or terms(item))
+    assert search.matches("he") == [0x30, 0x10, 0x40]  # Trail HEad, then Hilltop routEr, LigHthousE
+    assert search.matches("hea") == [0x30]
+    assert checked == [0x10, 0x30, 0x40, 0x30, 0x10, 0x40]  # Only the previous matches are rechecked
+
+    checked.clear()
+    assert search.matches("h") == [0x10, 0x30, 0x40]  # Backspace
+    assert search.matches("hx") == []
+    assert checked == [0x10, 0x30, 0x40]
+
+
+def test_node_database_updates_keep_names_current(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "db_file_path", str(tmp_path / "client.db"))
+    monkeypatch.setattr(interface_state, "my_node_num", 1)
+
+    update_node_info_in_db(0x50, long_name="Ridge Repeater", short_name="RDG")
+    assert search_index.terms(0x50)[:2] == ("ridge repeater", "rdg")
+    update_node_info_in_db(0x50, long_name="Summit Repeater")
+    assert NameSearch(search_index, [0x50]).matches("summ") == [0x50]
+    assert search_index.terms(0x60)[0] == "!00000060"  # Unknown nodes go by their id, looked up once
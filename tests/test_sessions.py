@@ -0,0 +1,95 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add the contact package to path to import the session manager
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+from contact.utilities.sessions import SESSION_UI_FIELDS, SessionManager  # noqa: E402
+from contact.utilities.singleton import app_state, interface_state, ui_events, ui_state  # noqa: E402
+
+
+class FakeRadio:
+    def __init__(self, num: int, short_name: str) -> None:
+        self.num = num
+        self.short_name = short_name
+        self.nodesByNum = {7: {"user": {"longName": "Seven"}}}
+
+    def getMyNodeInfo(self) -> dict:  # noqa: N802
+        return {"num": self.num, "user": {"shortName": self.short_name, "id": f"!{self.num:08x}"}}
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(app_state, "lock", threading.RLock())
+    for name in SESSION_UI_FIELDS:
+        monkeypatch.setattr(ui_state, name, getattr(ui_state, name))
+    for name in ("interface", "my_node_num", "connected"):
+        monkeypatch.setattr(interface_state, name, getattr(interface_state, name))
+    ui_events.take()
+
+    manager = SessionManager()
+    sessions = []
+    for num, short_name, channels in ((1, "AAAA", ["LongFast"]), (2, "AAAA", ["LongFast", 7])):
+        session = manager.add(FakeRadio(num, short_name))
+        with manager.activated(session):
+            interface_state.my_node_num = num
+            ui_state.channel_list = list(channels)
+            ui_state.all_messages = {channel: [] for channel in channels}
+        sessions.append(session)
+    return manager, sessions
+
+
+def test_sessions_keep_their_own_state(manager):
+    manager, (first, second) = manager
+
+    assert [session.name for session in manager.sessions] == ["AAAA", "AAAA-2"]
+    assert manager.active is first
+    assert interface_state.my_node_num == 1
+    assert ui_state.channel_list == ["LongFast"]
+
+    received = []
+
+    def handler(packet, interface):
+        received.append((packet, interface_state.my_node_num))
+        ui_state.all_messages["LongFast"].append(("rx", packet))
+
+    listener = manager.receive_listener(handler)
+    assert manager.receive_listener(handler) is listener
+    listener("for first", first.interface_state.interface)
+    listener("for second", second.interface_state.interface)
+
+    # The inactive radio's packet waits for the UI thread, which handles it with that session swapped in.
+    assert received == [("for first", 1)]
+    calls, _ = ui_events.take()
+    for func, args in calls:
+        func(*args)
+    assert received == [("for first", 1), ("for second", 2)]
+    assert ui_state.all_messages["LongFast"] == [("rx", "for first")]
+    assert interface_state.my_node_num == 1
+
+    manager.cycle()
+    assert manager.active is second
+    assert interface_state.my_node_num == 2  # noqa: PLR2004
+    assert ui_state.channel_list == ["LongFast", 7]
+    assert ui_state.all_messages["LongFast"] == [("rx", "for second")]
+
+
+def test_merged_view_lists_every_radio_and_opens_one(manager):
+    manager, (first, second) = manager
+    manager.switch(second)
+
+    manager.toggle_merged()
+
+    assert manager.merged_active
+    assert ui_state.channel_list == ["AAAA: LongFast", "AAAA-2: LongFast", "AAAA-2: Seven"]
+    assert ui_state.node_list is second.ui["node_list"]
+
+    manager.open_merged_channel(2)
+    assert manager.active is second
+    assert ui_state.channel_list[ui_state.selected_channel] == 7  # noqa: PLR2004
+
+    manager.toggle_merged()
+    manager.toggle_merged()
+    assert manager.active is second
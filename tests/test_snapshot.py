@@ -0,0 +1,111 @@
+import json
+import sys
+import threading
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("meshtastic")
+
+# Add the contact package to path to import the warm-start snapshot
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+from meshtastic.protobuf import channel_pb2, config_pb2, localonly_pb2  # noqa: E402
+
+import contact.ui.default_config as config  # noqa: E402
+from contact.utilities import snapshot  # noqa: E402
+from contact.utilities.db_handler import save_message_to_db  # noqa: E402
+from contact.utilities.message_window import MessageWindows  # noqa: E402
+from contact.utilities.offline_interface import OfflineInterface, OfflineNode  # noqa: E402
+from contact.utilities.singleton import app_state, interface_state, ui_state  # noqa: E402
+
+MY_NODE = 0x1234
+REGION = config_pb2.Config.LoRaConfig.RegionCode.EU_868
+
+
+def make_radio(channel_names: list[str], long_name: str) -> OfflineInterface:
+    channels = []
+    for index, name in enumerate(channel_names):
+        channel = channel_pb2.Channel(index=index, role=channel_pb2.Channel.Role.SECONDARY)
+        channel.settings.name = name
+        channels.append(channel)
+    local_config = localonly_pb2.LocalConfig()
+    local_config.lora.region = REGION
+    me = {"num": MY_NODE, "user": {"id": f"!{MY_NODE:08x}", "longName": long_name, "shortName": "ME"}}
+    other = {"num": 7, "user": {"id": "!00000007", "longName": "Seven", "shortName": "SEV"}, "raw": object()}
+    nodes = {me["user"]["id"]: me, other["user"]["id"]: other}
+    return OfflineInterface(MY_NODE, nodes, OfflineNode(MY_NODE, channels, local_config))
+
+
+@pytest.fixture
+def state(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "db_file_path", str(tmp_path / "client.db"))
+    monkeypatch.setattr(config, "snapshot_file_path", str(tmp_path / "client.snapshot.json"))
+    monkeypatch.setattr(app_state, "lock", threading.RLock())
+    for name in ("interface", "my_node_num", "connected"):
+        monkeypatch.setattr(interface_state, name, getattr(interface_state, name))
+    for name in ("channel_list", "all_messages", "notifications", "node_list", "selected_channel"):
+        monkeypatch.setattr(ui_state, name, getattr(ui_state, name))
+    return Path(config.snapshot_file_path)
+
+
+def test_snapshot_round_trip(state):
+    interface_state.interface = make_radio(["Main", "Extra"], "Me")
+    interface_state.my_node_num = MY_NODE
+    ui_state.channel_list = ["Main", "Extra", 7]
+    lines = [(f"[10:00:{second:02}] bob: ", f"message {second}") for second in range(150)]
+    ui_state.all_messages = MessageWindows({"Main": lines, "Extra": [], 7: [("-- 2026-01-01 10:00 --", "")]})
+
+    snapshot.save_snapshot()
+    loaded = snapshot.load_snapshot()
+    assert loaded is not None
+    snapshot.apply_snapshot(loaded)
+
+    interface = interface_state.interface
+    assert isinstance(interface, OfflineInterface) and not interface_state.connected
+    assert [channel.settings.name for channel in interface.localNode.channels] == ["Main", "Extra"]
+    assert interface.localNode.localConfig.lora.region == REGION
+    assert interface.nodesByNum[7]["user"]["longName"] == "Seven"
+    assert "raw" not in interface.nodesByNum[7]  # Not JSON; dropped
+    assert ui_state.channel_list == ["Main", "Extra", 7]
+    assert ui_state.all_messages["Main"] == lines[-snapshot.SNAPSHOT_MESSAGES_PER_CHANNEL :]
+    assert ui_state.all_messages[7] == [("-- 2026-01-01 10:00 --", "")]
+
+
+def test_unusable_snapshots_are_ignored(state):
+    assert snapshot.load_snapshot() is None  # None saved yet
+
+    state.write_text('{"version": 1, "my_node_num": ')
+    assert snapshot.load_snapshot() is None
+
+    state.write_text(json.dumps({"version": snapshot.SNAPSHOT_VERSION - 1, "my_node_num": MY_NODE}))
+    assert snapshot.load_snapshot() is None
+
+    state.write_text(json.dumps({"version": snapshot.SNAPSHOT_VERSION, "my_node_num": 0}))
+    assert snapshot.load_snapshot() is None
+
+
+def test_live_radio_replaces_the_snapshot_state(state, monkeypatch):
+    import contact.__main__ as main  # noqa: PLC0415
+
+    interface_state.interface = make_radio(["Main", "Gone"], "Old name")
+    interface_state.my_node_num = MY_NODE
+    ui_state.channel_list = ["Main", "Gone"]
+    ui_state.all_messages = MessageWindows({"Main": [("[09:00:00] bob: ", "from the snapshot")], "Gone": []})
+    snapshot.save_snapshot()
+    snapshot.apply_snapshot(snapshot.load_snapshot())
+    ui_state.selected_channel = 0  # Main
+
+    save_message_to_db("Main", "7", "from the database")
+    live = make_radio(["Live", "Main"], "New name")
+    monkeypatch.setattr(main.supervisor, "connect_with_backoff", lambda connect, name: live)
+    main.connect_and_reconcile(Namespace(replay="capture"))  # A replay is not supervised
+
+    assert interface_state.interface is live and interface_state.connected
+    assert ui_state.channel_list == ["Live", "Main"]
+    assert ui_state.channel_list[ui_state.selected_channel] == "Main"  # The selection follows the channel
+    assert [message for _, message in ui_state.all_messages["Main"]] == ["", "from the database"]
+
+    saved = snapshot.load_snapshot()
+    assert [channel["settings"]["name"] for channel in saved["channels"]] == ["Live", "Main"]
+    assert saved["nodes"][f"!{MY_NODE:08x}"]["user"]["longName"] == "New name"
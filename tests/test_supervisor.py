@@ -0,0 +1,85 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the contact package to path to import the connection supervisor
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+from contact.utilities import supervisor as supervisor_module  # noqa: E402
+from contact.utilities.singleton import app_state, interface_state, ui_state  # noqa: E402
+
+MY_NODE = 0x1234
+
+
+def test_backoff_doubles_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(supervisor_module.random, "uniform", lambda low, high: high)
+
+    delays = [supervisor_module.backoff_delay(attempt, initial=2.0, maximum=60.0) for attempt in range(7)]
+
+    assert delays == [2.0, 4.0, 8.0, 16.0, 32.0, 60.0, 60.0]
+
+
+def test_reconnect_resyncs_and_sends_held_messages(tmp_path, monkeypatch):
+    pytest.importorskip("meshtastic")
+    from meshtastic.protobuf import channel_pb2  # noqa: PLC0415
+
+    import contact.ui.contact_ui  # noqa: F401, PLC0415 - loads tx_handler the way the app does
+    import contact.ui.default_config as config  # noqa: PLC0415
+    from contact.message_handlers import tx_handler  # noqa: PLC0415
+    from contact.utilities.offline_interface import OfflineInterface, OfflineNode  # noqa: PLC0415
+
+    class Radio(OfflineInterface):
+        def __init__(self, channel_names: list[str]) -> None:
+            channels = []
+            for index, name in enumerate(channel_names):
+                channel = channel_pb2.Channel(index=index, role=channel_pb2.Channel.Role.SECONDARY)
+                channel.settings.name = name
+                channels.append(channel)
+            me = {"num": MY_NODE, "user": {"id": f"!{MY_NODE:08x}", "longName": "Me", "shortName": "ME"}}
+            super().__init__(MY_NODE, {me["user"]["id"]: me}, OfflineNode(MY_NODE, channels))
+            self.sent = []
+
+        def sendData(self, data, **kwargs):  # noqa: N802
+            self.sent.append(data.decode())
+            return type("Packet", (), {"id": len(self.sent)})()
+
+    monkeypatch.setattr(config, "db_file_path", str(tmp_path / "client.db"))
+    monkeypatch.setattr(app_state, "lock", threading.RLock())
+    monkeypatch.setattr(tx_handler, "ack_naks", {})
+    monkeypatch.setattr(tx_handler, "outbox", [])
+    old, new = Radio(["Main"]), Radio(["Main", "Extra"])
+    for name, value in (("interface", old), ("my_node_num", MY_NODE), ("connected", True), ("reconnecting", False)):
+        monkeypatch.setattr(interface_state, name, value)
+    for name, value in (("channel_list", ["Main"]), ("all_messages", {"Main": []}), ("selected_channel", 0)):
+        monkeypatch.setattr(ui_state, name, value)
+    monkeypatch.setattr(ui_state, "node_list", [])
+    monkeypatch.setattr(ui_state, "notifications", [])
+
+    reachable = threading.Event()
+    supervisor = supervisor_module.ConnectionSupervisor()
+    link = supervisor.watch(old, lambda: new if reachable.wait(5) else None, "tcp:radio")
+    try:
+        supervisor.on_connection_lost(old)
+        assert interface_state.reconnecting
+        assert not interface_state.connected
+
+        tx_handler.send_message("held", channel=0)
+        assert [pending["message"] for pending in tx_handler.outbox] == ["held"]
+        assert old.sent == []
+
+        reachable.set()
+        deadline = time.monotonic() + 5
+        while link.reconnecting and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        supervisor.stop()
+
+    assert link.interface is new
+    assert interface_state.interface is new
+    assert interface_state.connected and not interface_state.reconnecting
+    assert ui_state.channel_list == ["Main", "Extra"]
+    assert new.sent == ["held"]
+    assert tx_handler.outbox == []
+    assert [acknak["entry"] for acknak in tx_handler.ack_naks.values()] == [ui_state.all_messages["Main"][1]]
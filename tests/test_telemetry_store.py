@@ -0,0 +1,87 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the contact package to path to import the telemetry store
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+import contact.ui.default_config as config  # noqa: E402
+from contact.utilities import telemetry_store  # noqa: E402
+from contact.utilities.singleton import interface_state  # noqa: E402
+
+START = 1_700_000_000 - 1_700_000_000 % telemetry_store.HOUR  # the top of an hour
+
+
+def telemetry_packet(node_num: int, battery: int, utilization: float) -> dict:
+    return {
+        "from": node_num,
+        "decoded": {
+            "portnum": "TELEMETRY_APP",
+            "telemetry": {
+                "time": 0,
+                "deviceMetrics": {"batteryLevel": battery, "channelUtilization": utilization},
+                "environmentMetrics": {"temperature": 21.5},
+            },
+        },
+    }
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "db_file_path", str(tmp_path / "client.db"))
+    monkeypatch.setattr(interface_state, "my_node_num", 1)
+    monkeypatch.setattr(telemetry_store, "_last_pruned", {})
+    return telemetry_store
+
+
+def test_samples_roll_up_into_minutes_and_hours(store):
+    for offset, battery in ((0, 90), (20, 80), (70, 70), (3700, 60)):
+        store.record_telemetry(telemetry_packet(7, battery, 10.0 + offset), timestamp=START + offset)
+    store.record_telemetry(telemetry_packet(8, 40, 30.0), timestamp=START + 10)
+
+    raw = store.query_telemetry(7, "device.batteryLevel", START, START + 4000, resolution=store.RAW)
+    assert [(sample.timestamp, sample.mean) for sample in raw] == [
+        (START, 90),
+        (START + 20, 80),
+        (START + 70, 70),
+        (START + 3700, 60),
+    ]
+
+    minutes = store.query_telemetry(7, "device.batteryLevel", START, START + 4000, resolution=store.MINUTE)
+    assert [(sample.timestamp, sample.count, sample.mean) for sample in minutes] == [
+        (START, 2, 85),
+        (START + 60, 1, 70),
+        (START + 3660, 1, 60),
+    ]
+
+    hours = store.query_telemetry(7, "device.batteryLevel", START, START + 4000, resolution=store.HOUR)
+    assert [(sample.count, sample.minimum, sample.maximum) for sample in hours] == [(3, 70, 90), (1, 60, 60)]
+
+    summary = store.summarize_telemetry("device.batteryLevel", START, START + 4000)
+    assert {num: (sample.count, sample.mean) for num, sample in summary.items()} == {7: (4, 75), 8: (1, 40)}
+    assert store.telemetry_metrics(7) == ["device.batteryLevel", "device.channelUtilization", "environment.temperature"]
+
+
+def test_expired_resolutions_are_pruned(store):
+    store.record_telemetry(telemetry_packet(7, 90, 10.0), timestamp=START)
+    later = START + store.RETENTION[store.RAW] + store.HOUR
+    store.record_telemetry(telemetry_packet(7, 50, 10.0), timestamp=later)
+
+    assert [s.mean for s in store.query_telemetry(7, "device.batteryLevel", START, later, store.RAW)] == [50]
+    assert [s.mean for s in store.query_telemetry(7, "device.batteryLevel", START, later, store.MINUTE)] == [90, 50]
+    assert store.pick_resolution(START, now=later) == store.MINUTE
+    assert store.query_telemetry(9, "device.batteryLevel", START) == []
+
+
+def test_hourly_series_feeds_a_sparkline(store):
+    from contact.utilities.utils import sparkline  # noqa: PLC0415
+
+    for hour, battery in ((0, 100), (1, 80), (3, 20)):
+        for minute in range(0, 60, 15):  # several samples per hour, read back as one bucket
+            store.record_telemetry(telemetry_packet(7, battery, 5.0), timestamp=START + hour * store.HOUR + minute * 60)
+
+    values = store.hourly_series(7, "device.batteryLevel", 5, now=START + 4 * store.HOUR + 30)
+    assert values == [100, 80, None, 20, None]
+    assert sparkline(values) == "█▆ ▁ "
+    assert sparkline([3.0, 3.0]) == "▄▄"
+    assert sparkline([None]) == ""
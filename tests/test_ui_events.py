@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the contact package directory to path to import the UI event queue
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+from contact.ui.ui_events import MESSAGES, NODES, UIEvents  # noqa: E402
+
+
+def test_redraws_are_coalesced_and_calls_kept_in_order():
+    events = UIEvents()
+    events.request_redraw(NODES)
+    events.post(print, "first")
+    events.request_redraw(NODES, MESSAGES)
+    events.post(print, "second")
+
+    calls, dirty = events.take()
+    assert [args for _, args in calls] == [("first",), ("second",)]
+    assert dirty == {NODES, MESSAGES}
+    assert events.take() == ([], set())
+
+
+def test_unconfirmed_messages_expire_as_naks(tmp_path, monkeypatch):
+    pytest.importorskip("meshtastic")
+    import contact.ui.contact_ui  # noqa: F401, PLC0415 - loads tx_handler the way the app does
+    import contact.ui.default_config as config  # noqa: PLC0415
+    from contact.message_handlers import tx_handler  # noqa: PLC0415
+    from contact.utilities.singleton import interface_state, ui_events, ui_state  # noqa: PLC0415
+
+    monkeypatch.setattr(config, "db_file_path", str(tmp_path / "client.db"))
+    monkeypatch.setattr(interface_state, "my_node_num", 1234)
+    monkeypatch.setattr(ui_state, "channel_list", ["Main"])
+    monkeypatch.setattr(ui_state, "selected_channel", 0)
+    first, second = ("pending", "hi"), ("pending", "there")
+    monkeypatch.setattr(ui_state, "all_messages", {"Main": [first, second]})
+    monkeypatch.setattr(
+        tx_handler,
+        "ack_naks",
+        {
+            1: {"node": 1234, "channel": "Main", "entry": first, "timestamp": 1, "sent_at": 0.0},
+            2: {"node": 1234, "channel": "Main", "entry": second, "timestamp": 2, "sent_at": 250.0},
+        },
+    )
+    ui_events.take()
+
+    assert tx_handler.expire_ack_naks(now=tx_handler.ACK_TIMEOUT_SECONDS + 1) == 1
+    assert list(tx_handler.ack_naks) == [2]
+    assert config.nak_str in ui_state.all_messages["Main"][0][0]
+    assert ui_state.all_messages["Main"][1] == ("pending", "there")
+    assert ui_events.take()[1] == {MESSAGES}
@@ -0,0 +1,164 @@
+import re
+import sys
+from pathlib import Path
+from unicodedata import east_asian_width
+
+import pytest
+
+# Add the contact package directory to path to import the wrapping engine
+sys.path.append(str(Path(__file__).resolve().parents[1] / "contact"))
+from contact.utilities import text_wrap  # noqa: E402
+
+LOCALISATIONS = Path(__file__).resolve().parents[1] / "contact" / "contact" / "localisations"
+
+
+# Reference implementations: the wrapping code as it was in ui/nav_utils.py before the engine.
+def reference_text_width(text):
+    return sum(2 if east_asian_width(c) in "FW" else 1 for c in text)
+
+
+def reference_wrap_text(text, wrap_width):
+    whitespace = "\t\n\x0b\x0c\r "
+    whitespace_trans = dict.fromkeys(map(ord, whitespace), ord(" "))
+    text = text.translate(whitespace_trans)
+
+    words = re.findall(r"\S+|\s+", text)
+    wrapped_lines = []
+    line_buffer = ""
+    line_length = 0
+    margin = 2
+    wrap_width -= margin
+
+    for word in words:
+        word_length = reference_text_width(word)
+
+        if word_length > wrap_width:
+            if line_buffer:
+                wrapped_lines.append(line_buffer.strip())
+                line_buffer = ""
+                line_length = 0
+            for i in range(0, word_length, wrap_width):
+                wrapped_lines.append(word[i : i + wrap_width])
+            continue
+
+        if line_length + word_length > wrap_width and word.strip():
+            wrapped_lines.append(line_buffer.strip())
+            line_buffer = ""
+            line_length = 0
+
+        line_buffer += word
+        line_length += word_length
+
+    if line_buffer:
+        wrapped_lines.append(line_buffer.strip())
+
+    return wrapped_lines
+
+
+def reference_wrap_help(help_content, wrap_width):
+    color_mappings = {
+        r"\[warning\](.*?)\[/warning\]": ("settings_warning", True, False),
+        r"\[note\](.*?)\[/note\]": ("settings_note", True, False),
+        r"\[underline\](.*?)\[/underline\]": ("settings_default", False, True),
+        r"\\033\[31m(.*?)\\033\[0m": ("settings_warning", True, False),
+        r"\\033\[32m(.*?)\\033\[0m": ("settings_note", True, False),
+        r"\\033\[4m(.*?)\\033\[0m": ("settings_default", False, True),
+    }
+
+    def extract_ansi_segments(text):
+        matches = []
+        last_pos = 0
+        pattern_matches = []
+        for pattern, (color, bold, underline) in color_mappings.items():
+            for match in re.finditer(pattern, text):
+                pattern_matches.append((match.start(), match.end(), match.group(1), color, bold, underline))
+        pattern_matches.sort(key=lambda x: x[0])
+        for start, end, content, color, bold, underline in pattern_matches:
+            if last_pos < start:
+                matches.append((text[last_pos:start], "settings_default", False, False))
+            matches.append((content, color, bold, underline))
+            last_pos = end
+        if last_pos < len(text):
+            matches.append((text[last_pos:], "settings_default", False, False))
+        return matches
+
+    def wrap_ansi_text(segments, wrap_width):
+        wrapped_lines = []
+        line_buffer = []
+        line_length = 0
+        for text, color, bold, underline in segments:
+            for word in re.findall(r"\S+|\s+", text):
+                word_length = len(word)
+                if line_length + word_length > wrap_width and word.strip():
+                    wrapped_lines.append(line_buffer)
+                    line_buffer = []
+                    line_length = 0
+                line_buffer.append((word, color, bold, underline))
+                line_length += word_length
+        if line_buffer:
+            wrapped_lines.append(line_buffer)
+        return wrapped_lines
+
+    wrapped_help = []
+    for raw_line in help_content.split("\\n"):
+        wrapped_help.extend(wrap_ansi_text(extract_ansi_segments(raw_line), wrap_width))
+    return wrapped_help
+
+
+MESSAGES = [
+    "",
+    " ",
+    "hello",
+    "Hello mesh, anyone copy on LongFast?",
+    "  leading and trailing spaces  ",
+    "tabs\tand\nnewlines\r\nand\x0bvertical\x0cfeeds",
+    "multiple     spaces    between     words",
+    "averyveryverylongwordthatdoesnotfitonasinglelineatallnomatterwhat and then some",
+    "👋 Hi from the trailhead 🏔️🌲🌲 battery 🔋 at 42% 📡📡📡",
+    "🔥" * 40,
+    "日本語のメッセージです。メッシュネットワークでこんにちは",
+    "混合 mixed テキスト with ＦＵＬＬＷＩＤＴＨ letters and emoji 😀😃😄",
+    "Привет, как слышно? Приём!",
+    "https://meshtastic.org/e/#CgMSAQESCAgBOAFAA0gBGAEgAQ",
+    "[07:42:13] >> !a1b2c3d4: Traceroute to:\nA --> B (6.25dB) --> C (?dB)",
+    "a b c d e f g h i j k l m n o p q r s t u v w x y z " * 3,
+]
+
+
+@pytest.mark.parametrize("width", [5, 8, 10, 17, 24, 40, 80, 132])
+@pytest.mark.parametrize("message", MESSAGES)
+def test_wrap_text_matches_reference(message, width):
+    assert text_wrap.wrap_text(message, width) == reference_wrap_text(message, width)
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_text_width_matches_reference(message):
+    assert text_wrap.text_width(message) == reference_text_width(message)
+
+
+def test_wrap_text_returns_fresh_list():
+    first = text_wrap.wrap_text("cached message text", 12)
+    first.append("mutated")
+    assert text_wrap.wrap_text("cached message text", 12) == reference_wrap_text("cached message text", 12)
+
+
+def _help_texts():
+    texts = [
+        "Plain help.",
+        "[warning]Careful:[/warning] this resets the node.\\n[note]Tip:[/note] use [underline]sparingly[/underline].",
+        "\\033[31mred\\033[0m then \\033[32mgreen\\033[0m then \\033[4munderlined\\033[0m text",
+        "",
+    ]
+    for ini in sorted(LOCALISATIONS.glob("*.ini")):
+        for line in ini.read_text(encoding="utf-8").splitlines():
+            parts = [p.strip().strip('"') for p in line.split(",", 2)]
+            if len(parts) == 3 and parts[2]:  # noqa: PLR2004
+                texts.append(parts[2])
+    return texts
+
+
+@pytest.mark.parametrize("width", [10, 30, 54, 74])
+def test_wrap_help_text_matches_reference(width):
+    for help_content in _help_texts():
+        wrapped = [list(line) for line in text_wrap.wrap_help_text(help_content, width)]
+        assert wrapped == reference_wrap_help(help_content, width), help_content